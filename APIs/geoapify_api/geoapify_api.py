@@ -54,7 +54,8 @@ async def find_static_maps_geoapify(coordinates, size):
                        "color:%23ff0000;type:material;" \
                        "size:small;iconsize:small"
 
-    path_str = "polyline:" + ",".join(f"{lng},{lat}" for lat, lng in coordinates) + ";linecolor:%23ff0000"
+    # 6 decimal places are precise to about 0.1 m, and keep the URL short
+    path_str = "polyline:" + ",".join(f"{lng:.6f},{lat:.6f}" for lat, lng in coordinates) + ";linecolor:%23ff0000"
 
     url = f"{base_url}?apiKey={api_key}&width={size[0]}&height={size[1]}&marker={markers_str}&geometry={path_str}"
 
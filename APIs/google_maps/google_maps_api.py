@@ -13,6 +13,7 @@ from googlemaps.maps import StaticMapPath, StaticMapMarker
 from PIL import Image
 import base_keys
 from APIs.maps.direction_data import DirectionData
+from APIs.maps.direction_step import DirectionStep
 from APIs.maps.location_data import LocationData
 from APIs.maps.map_style import google_map_style
 from APIs.maps.maps_util import calculate_bearing_after, calculate_turn_angle
@@ -23,6 +24,9 @@ GOOGLE_MAPS_CREDENTIAL_FILE = get_credentials_file_path(base_keys.GOOGLE_MAPS_CR
 KEY_MAP_API = 'map_api_key'
 GOOGLE_MAP_BASE_STATIC_MAP_URL = "https://maps.googleapis.com/maps/api/staticmap"
 
+# regex to remove html tags, from https://stackoverflow.com/a/12982689/18753727
+_HTML_TAGS_PATTERN = re.compile('<.*?>|&([a-z0-9]+|#[0-9]{1,6}|#x[0-9a-f]{1,6});')
+
 _logger = logging_utility.setup_logger(__name__)
 
 
@@ -245,10 +249,15 @@ async def find_directions_google(start_time, coordinates, bearing):
     num_steps = 0
     dest_dist = 0
     dest_duration = 0
-    for leg in route['legs']:
+    steps = []
+    for leg_index, leg in enumerate(route['legs']):
         num_steps += len(leg['steps'])
         dest_dist += leg['distance']['value']
         dest_duration += leg['duration']['value']
+        steps.extend(DirectionStep(instruction=_HTML_TAGS_PATTERN.sub('', step['html_instructions']),
+                                   distance=step['distance']['value'], duration=step['duration']['value'],
+                                   leg_index=leg_index)
+                     for step in leg['steps'])
     dest_dist_str = f"{dest_dist} m"
     dest_duration_str = f"{math.ceil(dest_duration / 60)} min"
 
@@ -279,16 +288,15 @@ async def find_directions_google(start_time, coordinates, bearing):
         curr_dist_str=curr_dist_str,
         curr_duration=curr_duration,
         curr_duration_str=curr_duration_str,
-        # regex to remove html tags, from https://stackoverflow.com/a/12982689/18753727
-        curr_instr=re.sub(re.compile(
-            '<.*?>|&([a-z0-9]+|#[0-9]{1,6}|#x[0-9a-f]{1,6});'), '', curr_instr),
+        curr_instr=_HTML_TAGS_PATTERN.sub('', curr_instr),
         curr_direction=curr_direction,
         num_steps=str(num_steps),
         waypoint_dist=waypoint_dist,
         waypoint_dist_str=waypoint_dist_str,
         waypoint_duration=waypoint_duration,
         waypoint_duration_str=waypoint_duration_str,
-        polyline=formatted_polyline
+        polyline=formatted_polyline,
+        steps=steps
     )
 
 
@@ -320,7 +328,8 @@ async def find_static_maps_google(coordinates, size):
     api_key = get_google_maps_credential(KEY_MAP_API)
     size_str = f"&size={size[0]}x{size[1]}"
 
-    path = "&path=color:0xff0000ff|weight:3|" + "|".join([f"{lat},{lng}" for lat, lng in coordinates])
+    # encoded polyline, which is much shorter than the list of coordinates in the URL
+    path = "&path=color:0xff0000ff|weight:3|enc:" + googlemaps.convert.encode_polyline(coordinates)
     # arrow_icon = "https://maps.google.com/mapfiles/dir_0.png"  # Replace with your custom arrow icon URL
     # # Add arrows every 15 coordinates
     # for i, (lat, lng) in enumerate(coordinates):
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import List, Tuple
 
+from APIs.maps.direction_step import DirectionStep
+
 
 @dataclass
 class DirectionData:
@@ -43,4 +45,6 @@ class DirectionData:
     waypoint_duration_str: str = ""
     # suggested route by maps api
     polyline: List[Tuple[float, float]] = None
+    # all steps from the origin to the destination, to follow the route without requesting the directions again
+    steps: List[DirectionStep] = None
     error_message: str = ""
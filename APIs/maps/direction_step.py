@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class DirectionStep:
+    """
+    Direction Step, i.e., one instruction of the route
+    """
+    # Text instruction of the step, for example "Turn left onto Kent Ridge Road".
+    instruction: str = ""
+    # Distance of the step, from its maneuver to the next one. Stored in meters.
+    distance: float = 0.0
+    # Estimated time to walk the step. Stored in seconds.
+    duration: float = 0.0
+    # Index of the route leg (between two consecutive waypoints) the step belongs to.
+    leg_index: int = 0
@@ -0,0 +1,203 @@
+import dataclasses
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from APIs.maps import maps_util
+from APIs.maps.direction_data import DirectionData
+from APIs.maps.projected_polyline import ProjectedPolyline
+from Utilities import metrics_utility
+
+METRIC_HITS = "directions_cache.hits"  # same origin cell and waypoints
+METRIC_TRIMMED_HITS = "directions_cache.trimmed_hits"  # runner is still on the cached route
+METRIC_MISSES = "directions_cache.misses"
+METRIC_HIT_RATE = "directions_cache.hit_rate"
+
+
+@dataclasses.dataclass
+class _CacheEntry:
+    """
+    The cached directions of a request, with the origin to check if the runner is still on the route
+    """
+    # time when the directions were requested, in `time.monotonic()` seconds
+    created_time: float
+    origin_cell: tuple
+    origin: list
+    direction_data: DirectionData
+    # polyline projected around the origin, None if there is no polyline
+    projected_polyline: ProjectedPolyline = None
+
+
+class DirectionsCache:
+    """
+    A cache of the directions to the same waypoints, as consecutive direction requests during a run usually differ only
+    by a few metres of the runner's position.
+
+    The coordinates are quantized to grid cells of about `cell_size_m`, and entries are evicted after `ttl_seconds` or
+    when the cache is full (least recently used first). For a request from a different origin cell, the cached
+    directions are reused if the runner is still on the cached route and has not passed the next step, with the
+    distances trimmed by the distance run along the route.
+    """
+
+    def __init__(self, max_entries=32, ttl_seconds=60, cell_size_m=15, on_route_threshold_m=20):
+        '''
+        :param max_entries: maximum number of cached routes
+        :param ttl_seconds: maximum age of the cached directions
+        :param cell_size_m: size of the grid cells to quantize the coordinates
+        :param on_route_threshold_m: maximum distance from the cached route to reuse it from another origin
+        '''
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cell_size_m = cell_size_m
+        self.on_route_threshold_m = on_route_threshold_m
+
+        self.hits = 0
+        self.trimmed_hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, coordinates, option):
+        '''
+        :param coordinates: [origin, waypoint, ..., destination] as [lat, lng]
+        :param option: directions option (the directions API)
+        :return: DirectionData from the origin, None if not cached
+        '''
+        key = self._get_key(coordinates, option)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.created_time > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+
+            direction_data = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.origin_cell == self._get_cell(coordinates[0]):
+                    direction_data = dataclasses.replace(entry.direction_data, update_time=_get_current_millis())
+                    self.hits += 1
+                    metrics_utility.increment_counter(METRIC_HITS)
+                else:
+                    direction_data = self._get_trimmed_direction_data(entry, coordinates[0])
+                    if direction_data is not None:
+                        self.trimmed_hits += 1
+                        metrics_utility.increment_counter(METRIC_TRIMMED_HITS)
+
+            if direction_data is None:
+                self.misses += 1
+                metrics_utility.increment_counter(METRIC_MISSES)
+
+            metrics_utility.set_gauge(METRIC_HIT_RATE, self.get_hit_rate())
+
+        return direction_data
+
+    def put(self, coordinates, option, direction_data):
+        '''
+        Cache the directions (without an error) from the origin, i.e., coordinates[0]
+        '''
+        if direction_data.error_message:
+            return
+
+        entry = _CacheEntry(created_time=time.monotonic(), origin_cell=self._get_cell(coordinates[0]),
+                            origin=list(coordinates[0]), direction_data=direction_data)
+        if direction_data.polyline and len(direction_data.polyline) > 1:
+            entry.projected_polyline = ProjectedPolyline(direction_data.polyline)
+
+        key = self._get_key(coordinates, option)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_hit_rate(self):
+        '''
+        :return: ratio of the requests served from the cache (including trimmed routes)
+        '''
+        total = self.hits + self.trimmed_hits + self.misses
+        return (self.hits + self.trimmed_hits) / total if total else 0.0
+
+    def get_stats(self):
+        return {
+            "hits": self.hits,
+            "trimmed_hits": self.trimmed_hits,
+            "misses": self.misses,
+            "hit_rate": self.get_hit_rate(),
+            "size": len(self._entries),
+        }
+
+    def _get_cell(self, coordinate):
+        lat, lng = coordinate[0], coordinate[1]
+        row = math.floor(lat * maps_util.METERS_PER_DEGREE_LAT / self.cell_size_m)
+        # a degree of longitude is shorter away from the equator, the cells of a row use the latitude of its centre so
+        # they are about `cell_size_m` wide
+        row_lat = (row + 0.5) * self.cell_size_m / maps_util.METERS_PER_DEGREE_LAT
+        meters_per_degree_lng = maps_util.METERS_PER_DEGREE_LNG * max(math.cos(math.radians(row_lat)), 1e-6)
+        return row, math.floor(lng * meters_per_degree_lng / self.cell_size_m)
+
+    def _get_key(self, coordinates, option):
+        # the origin is not part of the key, so the route to the same waypoints can be reused from another origin
+        return option, tuple(self._get_cell(coordinate) for coordinate in coordinates[1:])
+
+    def _get_trimmed_direction_data(self, entry, location):
+        if entry.projected_polyline is None:
+            return None
+
+        distance_from_route, runner_dist = entry.projected_polyline.get_nearest(location)
+        if distance_from_route > self.on_route_threshold_m:
+            return None
+
+        _, origin_dist = entry.projected_polyline.get_nearest(entry.origin)
+        run_dist = runner_dist - origin_dist
+        direction_data = entry.direction_data
+        # the runner went back, or passed the next step (the instruction would be outdated)
+        if run_dist < 0 or run_dist >= direction_data.curr_dist:
+            return None
+
+        dest_dist = max(direction_data.dest_dist - run_dist, 0)
+        curr_dist = direction_data.curr_dist - run_dist
+        waypoint_dist = max(direction_data.waypoint_dist - run_dist, 0)
+        dest_duration = _scale(direction_data.dest_duration, dest_dist, direction_data.dest_dist)
+        curr_duration = _scale(direction_data.curr_duration, curr_dist, direction_data.curr_dist)
+        waypoint_duration = _scale(direction_data.waypoint_duration, waypoint_dist, direction_data.waypoint_dist)
+
+        return dataclasses.replace(
+            direction_data,
+            update_time=_get_current_millis(),
+            dest_dist=math.ceil(dest_dist),
+            dest_dist_str=f"{math.ceil(dest_dist)} m",
+            dest_duration=dest_duration,
+            dest_duration_str=f"{math.ceil(dest_duration / 60)} min",
+            curr_dist=math.ceil(curr_dist),
+            curr_dist_str=f"{math.ceil(curr_dist)} m",
+            curr_duration=curr_duration,
+            curr_duration_str=f"{math.ceil(curr_duration / 60)} min",
+            waypoint_dist=math.ceil(waypoint_dist),
+            waypoint_dist_str=f"{math.ceil(waypoint_dist)} m",
+            waypoint_duration=waypoint_duration,
+            waypoint_duration_str=f"{math.ceil(waypoint_duration / 60)} min",
+            polyline=_trim_polyline(direction_data.polyline, entry.projected_polyline.cumulative_dists, runner_dist,
+                                    location),
+            # the steps are from the cached origin
+            steps=None,
+        )
+
+
+def _get_current_millis():
+    return int(time.time() * 1000)
+
+
+def _scale(duration, dist, original_dist):
+    return math.ceil(duration * dist / original_dist) if original_dist else duration
+
+
+def _trim_polyline(polyline, polyline_dists, dist, location):
+    # start the polyline at the runner's location, followed by the points ahead on the route
+    return [list(location)] + [list(point) for point, point_dist in zip(polyline, polyline_dists) if point_dist > dist]
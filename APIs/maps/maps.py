@@ -1,15 +1,22 @@
+import asyncio
 import math
+import os
 import random
 import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from googlemaps.exceptions import ApiError
-from Utilities import logging_utility
+from Utilities import file_utility, logging_utility
+from Utilities.event_loop import BackgroundEventLoop
 
 from APIs.geoapify_api import geoapify_api
-from APIs.maps import maps_util
+from APIs.maps import maps_util, track_compression
 from APIs.maps.direction_data import DirectionData
+from APIs.maps.map_style import google_map_style
 from APIs.maps.route_data import RouteData
-from APIs.maps.maps_config import MapsConfig
+from APIs.maps.maps_config import MapsConfig, RouteGenerationState
+from APIs.maps.static_map_cache import StaticMapCache
 from APIs.ors_api import ors_api
 from APIs.osm_api import osm_api
 from APIs.google_maps import google_maps_api
@@ -19,18 +26,67 @@ from base_keys import DIRECTIONS_OPTION_GOOGLE, DIRECTIONS_OPTION_ORS, PLACES_OP
 
 _logger = logging_utility.setup_logger(__name__)
 
+# The map clients (e.g., googlemaps, openrouteservice) are blocking, so their requests are run in threads to not
+# block the event loop, and to let the requests overlap
+_request_executor = ThreadPoolExecutor(max_workers=MapsConfig.max_concurrent_requests,
+                                       thread_name_prefix="maps_request")
+# an event loop for each thread of the executor, to run the (blocking) coroutines of the map clients
+_thread_local = threading.local()
+
+# long-lived event loop for the map requests of synchronous callers (e.g., the threads of the running service)
+_maps_event_loop = BackgroundEventLoop("maps_event_loop")
+
+# static map images by provider, size, style and path, shared by all the sessions and kept across restarts
+_static_map_cache = StaticMapCache(os.path.join(file_utility.get_project_root(), *MapsConfig.static_map_cache_folders),
+                                   MapsConfig.static_map_cache_max_bytes)
+
+
+def submit_map_request(coroutine):
+    '''
+    Run the coroutine (e.g., `get_walking_directions(...)`) in the shared maps event loop, without waiting for it
+
+    :return: concurrent.futures.Future of the result, which can be cancelled
+    '''
+    return _maps_event_loop.submit(coroutine)
+
+
+def run_map_request(coroutine, timeout=None):
+    '''
+    Run the coroutine in the shared maps event loop, and wait for the result
+
+    :param timeout: seconds to wait for the result, None to wait until it is done
+    :raises TimeoutError: if the result is not available within the timeout (the coroutine is cancelled)
+    '''
+    return _maps_event_loop.run(coroutine, timeout)
+
+
+def _run_in_thread_loop(coroutine_func, *args):
+    loop = getattr(_thread_local, "loop", None)
+    if loop is None:
+        loop = _thread_local.loop = asyncio.new_event_loop()
+
+    return loop.run_until_complete(coroutine_func(*args))
+
+
+async def _run_blocking(coroutine_func, *args):
+    '''
+    Run a coroutine function of a blocking map client in a thread of the executor
+    '''
+    return await asyncio.get_running_loop().run_in_executor(_request_executor, _run_in_thread_loop, coroutine_func,
+                                                            *args)
+
 
 async def get_walking_directions(start_time, coordinates, bearing, option, ors_option=0):
     direction_data = DirectionData()
     try:
         if option == DIRECTIONS_OPTION_ORS:
             # Use OpenRouteService API
-            direction_data = await ors_api.find_directions_ors(start_time, coordinates, bearing,
-                                                               ors_option)
+            direction_data = await _run_blocking(ors_api.find_directions_ors, start_time, coordinates, bearing,
+                                                 ors_option)
         elif option == DIRECTIONS_OPTION_GOOGLE:
             # Use Google Maps Directions API
-            direction_data = await google_maps_api.find_directions_google(start_time, coordinates,
-                                                                          bearing)
+            direction_data = await _run_blocking(google_maps_api.find_directions_google, start_time, coordinates,
+                                                 bearing)
     except Exception as e:
         error_message = str(e)
         if isinstance(e, ApiError):
@@ -49,32 +105,53 @@ async def get_walking_directions(start_time, coordinates, bearing, option, ors_o
     return direction_data
 
 
-async def generate_random_routes(start_time, bearing, target_dist, origin, option, ors_option=0):
+async def generate_random_routes(start_time, bearing, target_dist, origin, option, ors_option=0, route_state=None):
+    """
+    Request the directions of the candidate routes (one for each angle) concurrently, with at most
+    {MapsConfig.max_concurrent_directions} requests in flight. The candidates are evaluated as they complete, and the
+    circle radius of the next candidates is adjusted with the completed candidates. It stops once
+    {MapsConfig.num_routes} possible routes are found.
+
+    The circle radius is kept in {route_state} (RouteGenerationState) for the next calls, e.g., of the same runner.
+    """
+    if route_state is None:
+        route_state = RouteGenerationState()
+
     try:
-        for i in range(0, 360, MapsConfig.angle_increment):
+        angles = iter(range(0, 360, MapsConfig.angle_increment))
+        pending = {}  # {task: waypoints}
+        possible_routes = []
+
+        def request_next_candidate():
+            angle = next(angles, None)
+            if angle is None:
+                return False
+
             # returns a set of points as part of a circle with radius {target_distance / dist_factor} and {
             # angle_increment} degrees
-            waypoints = maps_util.pick_random_points(origin, target_dist / MapsConfig.dist_factor, MapsConfig.sectors,
-                                                     i * math.pi / 180)
-            direction_data = await get_walking_directions(start_time, waypoints, bearing, option,
-                                                          ors_option)
-            dest_dist = direction_data.dest_dist / 1000
-            dist_diff = abs(dest_dist - target_dist)
-            if dist_diff <= MapsConfig.dist_threshold * target_dist:
-                route_data = RouteData(waypoints=waypoints, direction_data=direction_data,
-                                       toilets=random.randint(0, 5),
-                                       water_points=random.randint(0, 5))
-                MapsConfig.possible_routes.append(route_data)
-                if len(MapsConfig.possible_routes) == 3:
-                    break
-            else:
-                if dest_dist < target_dist:
-                    MapsConfig.dist_factor *= 1 - MapsConfig.dist_factor_growth  # increase circle radius
-                else:
-                    MapsConfig.dist_factor *= 1 + MapsConfig.dist_factor_growth  # decrease circle radius
+            waypoints = maps_util.pick_random_points(origin, target_dist / route_state.dist_factor, MapsConfig.sectors,
+                                                     angle * math.pi / 180)
+            task = asyncio.ensure_future(get_walking_directions(start_time, waypoints, bearing, option, ors_option))
+            pending[task] = waypoints
+            return True
+
+        while len(possible_routes) < MapsConfig.num_routes:
+            while len(pending) < MapsConfig.max_concurrent_directions and request_next_candidate():
+                pass
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                _evaluate_candidate_route(possible_routes, route_state, pending.pop(task), task.result(),
+                                          target_dist)
+
+        # the remaining requests are not needed
+        for task in pending:
+            task.cancel()
 
         # Order possible_routes based on how close dest_dist is to target_distance
-        ordered_routes = sorted(MapsConfig.possible_routes,
+        ordered_routes = sorted(possible_routes,
                                 key=lambda x: abs(x.direction_data.dest_dist - target_dist))
         for i, route in enumerate(ordered_routes):
             route.difficulty = RUNNING_DIFFICULTY_LEVELS[i]
@@ -86,17 +163,33 @@ async def generate_random_routes(start_time, bearing, target_dist, origin, optio
     except Exception as e:
         error_message = str(e)
         _logger.error("generate_random_routes: {err_msg}", err_msg=error_message)
-        return [], DirectionData(error_message=error_message)
+        return []
+
+
+def _evaluate_candidate_route(possible_routes, route_state, waypoints, direction_data, target_dist):
+    dest_dist = direction_data.dest_dist / 1000
+    dist_diff = abs(dest_dist - target_dist)
+    if dist_diff <= MapsConfig.dist_threshold * target_dist:
+        if len(possible_routes) < MapsConfig.num_routes:
+            route_data = RouteData(waypoints=waypoints, direction_data=direction_data,
+                                   toilets=random.randint(0, 5),
+                                   water_points=random.randint(0, 5))
+            possible_routes.append(route_data)
+    else:
+        if dest_dist < target_dist:
+            route_state.dist_factor *= 1 - MapsConfig.dist_factor_growth  # increase circle radius
+        else:
+            route_state.dist_factor *= 1 + MapsConfig.dist_factor_growth  # decrease circle radius
 
 
 async def get_locations(search_text, option, location=None):
     try:
         if option == PLACES_OPTION_OSM:
             # Use Nominatim OpenStreetMap API
-            return await osm_api.find_locations_osm(search_text)
+            return await _run_blocking(osm_api.find_locations_osm, search_text)
         if option == PLACES_OPTION_GOOGLE:
             # Use Google Maps Places API
-            return await google_maps_api.find_locations_google(search_text, location)
+            return await _run_blocking(google_maps_api.find_locations_google, search_text, location)
     except Exception as e:
         error_message = str(e)
         if isinstance(e, ApiError):
@@ -112,11 +205,15 @@ async def get_locations(search_text, option, location=None):
 
 
 async def get_static_maps(coordinates, size, option):
+    if coordinates is not None:
+        coordinates = track_compression.simplify_for_static_map(coordinates, MapsConfig.static_map_max_points,
+                                                                MapsConfig.static_map_tolerance)
     try:
         if option == STATIC_MAPS_OPTION_GEOAPIFY:
-            return await geoapify_api.find_static_maps_geoapify(coordinates, size)
+            return await _get_static_map(geoapify_api.find_static_maps_geoapify, coordinates, size, option, "")
         if option == STATIC_MAPS_OPTION_GOOGLE:
-            return await google_maps_api.find_static_maps_google(coordinates, size)
+            return await _get_static_map(google_maps_api.find_static_maps_google, coordinates, size, option,
+                                         google_map_style)
     except Exception as e:
         error_message = str(e)
         if isinstance(e, ApiError):
@@ -128,3 +225,16 @@ async def get_static_maps(coordinates, size, option):
         elif isinstance(e, socket.error):
             error_message = "Failed to connect to the server. Please check your internet connection."
         _logger.error("get_static_maps: {err_msg}", err_msg=error_message)
+
+
+async def _get_static_map(find_static_maps, coordinates, size, option, style):
+    '''
+    :param find_static_maps: static maps function of the provider
+    :param style: style of the map of the provider, part of the cache key
+    :return: image bytes, from the cache if the same map was requested before
+    '''
+    if coordinates is None:
+        return await _run_blocking(find_static_maps, coordinates, size)
+
+    key = StaticMapCache.get_key(option, size, style, coordinates)
+    return await _static_map_cache.get_or_fetch(key, lambda: _run_blocking(find_static_maps, coordinates, size))
@@ -1,4 +1,5 @@
 import random
+from dataclasses import dataclass, field
 
 
 class MapsConfig:
@@ -12,8 +13,31 @@ class MapsConfig:
     sectors = 3
     # if |dest_dist-target_dist| is within {dist_threshold}*target_distance, consider it a possible route
     dist_threshold = 0.2
-    # controls how big or small the radius should be, smaller value = bigger radius
-    dist_factor = random.randint(4, 8)
     # controls how fast the radius should grow/shrink, smaller value = smaller growth
     dist_factor_growth = 0.2
-    possible_routes = []
+    # stop generating routes once {num_routes} possible routes are found
+    num_routes = 3
+    # maximum number of directions requests in flight, the next angle is requested when a request completes
+    max_concurrent_directions = 4
+    # number of threads for the (blocking) requests of the map clients, shared by all the map requests
+    max_concurrent_requests = 8
+
+    # get_static_maps()
+    # the path of a static map is simplified to at most {static_map_max_points} points, so the URL stays within the
+    # limits of the providers (Geoapify lists the coordinates, Google encodes them)
+    static_map_max_points = 300
+    # max distance of the removed points from the simplified path
+    static_map_tolerance = 2  # m
+    # static map images are cached in {static_map_cache_folders} from the project root
+    static_map_cache_folders = ["tmp", "static_map_cache"]
+    # the least recently used images are removed when the cache is larger
+    static_map_cache_max_bytes = 50 * 1024 * 1024
+
+
+@dataclass(slots=True)
+class RouteGenerationState:
+    """
+    The state of generate_random_routes() kept between the calls, e.g., of the running session of one runner
+    """
+    # controls how big or small the radius should be, smaller value = bigger radius, adjusted by each candidate route
+    dist_factor: float = field(default_factory=lambda: random.randint(4, 8))
@@ -1,12 +1,24 @@
 # source: https://geographiclib.sourceforge.io/html/python/code.html
 import math
 import random
+
+import numpy as np
 from geographiclib.geodesic import Geodesic
 from Utilities import logging_utility
 
 _logger = logging_utility.setup_logger(__name__)
 
 KILOMETERS_TO_DEGREES = 1 / 111
+METERS_PER_DEGREE_LAT = 110540
+METERS_PER_DEGREE_LNG = 111320
+# mean radius of the earth, for the haversine distances
+EARTH_RADIUS = 6371008.8  # m
+# WGS84 ellipsoid, for the accurate distances
+_WGS84_A = Geodesic.WGS84.a
+_WGS84_F = Geodesic.WGS84.f
+_WGS84_B = (1 - _WGS84_F) * _WGS84_A
+_VINCENTY_MAX_ITERATIONS = 200
+_VINCENTY_TOLERANCE = 1e-12
 
 
 def calculate_turn_angle(bearing_before, bearing_after):
@@ -59,3 +71,165 @@ def pick_random_points(center, radius, sectors, start_angle):
         points.append([lat, lng])
     points.append(center)
     return points
+
+
+def to_local_meters(coordinates, origin):
+    '''
+    Project the coordinates to a plane around the origin (equirectangular, accurate for a few kilometres)
+
+    :param coordinates: list of [lat, lng]
+    :param origin: [lat, lng]
+    :return: numpy array of [x, y] in metres from the origin
+    '''
+    coordinates = np.asarray(coordinates, dtype=float)
+    x = (coordinates[:, 1] - origin[1]) * METERS_PER_DEGREE_LNG * math.cos(math.radians(origin[0]))
+    y = (coordinates[:, 0] - origin[0]) * METERS_PER_DEGREE_LAT
+    return np.column_stack((x, y))
+
+
+def calculate_distances(lats1, lngs1, lats2, lngs2, accurate=False):
+    '''
+    Vectorized version of calculate_distance
+
+    :param lats1, lngs1, lats2, lngs2: arrays of the coordinates of the pairs of points
+    :param accurate: True to calculate the distances on the WGS84 ellipsoid (Vincenty's formulae, same as
+        calculate_distance to less than a millimetre), False to use the haversine formula on a sphere (error up to
+        0.5%)
+    :return: numpy array of the distances in metres
+    '''
+    if accurate:
+        return _calculate_vincenty(lats1, lngs1, lats2, lngs2)[0]
+
+    lats1, lngs1, lats2, lngs2 = (np.radians(np.asarray(values, dtype=float))
+                                  for values in (lats1, lngs1, lats2, lngs2))
+    haversine = (np.sin((lats2 - lats1) / 2) ** 2 +
+                 np.cos(lats1) * np.cos(lats2) * np.sin((lngs2 - lngs1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(haversine, 0, 1)))
+
+
+def calculate_bearings(lats1, lngs1, lats2, lngs2, accurate=False):
+    '''
+    Vectorized version of calculate_bearing_after
+
+    :param lats1, lngs1, lats2, lngs2: arrays of the coordinates of the pairs of points
+    :param accurate: True to calculate the bearings on the WGS84 ellipsoid, False on a sphere
+    :return: numpy array of the initial bearings from the first to the second points, in degrees from -180 to 180
+    '''
+    if accurate:
+        return _calculate_vincenty(lats1, lngs1, lats2, lngs2)[1]
+
+    lats1, lngs1, lats2, lngs2 = (np.radians(np.asarray(values, dtype=float))
+                                  for values in (lats1, lngs1, lats2, lngs2))
+    delta_lngs = lngs2 - lngs1
+    return np.degrees(np.arctan2(np.sin(delta_lngs) * np.cos(lats2),
+                                 np.cos(lats1) * np.sin(lats2) - np.sin(lats1) * np.cos(lats2) * np.cos(delta_lngs)))
+
+
+def calculate_track_distances(coordinates, accurate=False):
+    '''
+    :param coordinates: list or numpy array of [lat, lng]
+    :param accurate: see calculate_distances
+    :return: numpy array of the distances between consecutive points in metres (one less than the points)
+    '''
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    return calculate_distances(coordinates[:-1, 0], coordinates[:-1, 1], coordinates[1:, 0], coordinates[1:, 1],
+                               accurate)
+
+
+def calculate_track_bearings(coordinates, accurate=False):
+    '''
+    :param coordinates: list or numpy array of [lat, lng]
+    :param accurate: see calculate_bearings
+    :return: numpy array of the bearings between consecutive points in degrees (one less than the points)
+    '''
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    return calculate_bearings(coordinates[:-1, 0], coordinates[:-1, 1], coordinates[1:, 0], coordinates[1:, 1],
+                              accurate)
+
+
+def calculate_cumulative_distances(coordinates, accurate=False):
+    '''
+    :param coordinates: list or numpy array of [lat, lng]
+    :param accurate: see calculate_distances
+    :return: numpy array of the distance along the track of each point in metres, starting at 0
+    '''
+    return np.concatenate(([0.0], np.cumsum(calculate_track_distances(coordinates, accurate))))
+
+
+def resample_track(coordinates, spacing, accurate=False):
+    '''
+    Resample the track to points at a fixed distance along it (interpolated linearly between the original points)
+
+    :param coordinates: list or numpy array of [lat, lng]
+    :param spacing: distance between the resampled points in metres
+    :param accurate: see calculate_distances
+    :return: numpy array of [lat, lng], from the first to the last point of the track
+    '''
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    if len(coordinates) < 2:
+        return coordinates.copy()
+
+    cumulative_distances = calculate_cumulative_distances(coordinates, accurate)
+    track_distance = cumulative_distances[-1]
+    if track_distance == 0:
+        # all the points are the same
+        return coordinates[[0, -1]]
+
+    sample_distances = np.arange(0, track_distance, spacing)
+    if track_distance - sample_distances[-1] > 0 or len(sample_distances) == 1:
+        sample_distances = np.append(sample_distances, track_distance)
+
+    return np.column_stack((np.interp(sample_distances, cumulative_distances, coordinates[:, 0]),
+                            np.interp(sample_distances, cumulative_distances, coordinates[:, 1])))
+
+
+def _calculate_vincenty(lats1, lngs1, lats2, lngs2):
+    '''
+    Vincenty's inverse formulae on the WGS84 ellipsoid, vectorized with numpy. The (nearly antipodal) pairs which do not
+    converge fall back to geographiclib.
+
+    :return: (numpy array of the distances in metres, numpy array of the initial bearings in degrees)
+    '''
+    lats1, lngs1, lats2, lngs2 = np.broadcast_arrays(*(np.atleast_1d(np.asarray(values, dtype=float))
+                                                       for values in (lats1, lngs1, lats2, lngs2)))
+    reduced_lats1 = np.arctan((1 - _WGS84_F) * np.tan(np.radians(lats1)))
+    reduced_lats2 = np.arctan((1 - _WGS84_F) * np.tan(np.radians(lats2)))
+    sin_u1, cos_u1 = np.sin(reduced_lats1), np.cos(reduced_lats1)
+    sin_u2, cos_u2 = np.sin(reduced_lats2), np.cos(reduced_lats2)
+    delta_lngs = np.radians((lngs2 - lngs1 + 180) % 360 - 180)
+
+    lambdas = delta_lngs
+    converged = np.zeros(lambdas.shape, dtype=bool)
+    for _ in range(_VINCENTY_MAX_ITERATIONS):
+        sin_lambdas, cos_lambdas = np.sin(lambdas), np.cos(lambdas)
+        sin_sigmas = np.hypot(cos_u2 * sin_lambdas, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lambdas)
+        cos_sigmas = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lambdas
+        sigmas = np.arctan2(sin_sigmas, cos_sigmas)
+        sin_alphas = cos_u1 * cos_u2 * sin_lambdas / np.where(sin_sigmas == 0, 1, sin_sigmas)
+        cos2_alphas = 1 - sin_alphas ** 2
+        # on the equator, cos2_alphas is 0
+        cos_2sigma_ms = np.where(cos2_alphas == 0, 0,
+                                 cos_sigmas - 2 * sin_u1 * sin_u2 / np.where(cos2_alphas == 0, 1, cos2_alphas))
+        c = _WGS84_F / 16 * cos2_alphas * (4 + _WGS84_F * (4 - 3 * cos2_alphas))
+        previous_lambdas = lambdas
+        lambdas = delta_lngs + (1 - c) * _WGS84_F * sin_alphas * (
+            sigmas + c * sin_sigmas * (cos_2sigma_ms + c * cos_sigmas * (-1 + 2 * cos_2sigma_ms ** 2)))
+        converged = np.abs(lambdas - previous_lambdas) < _VINCENTY_TOLERANCE
+        if converged.all():
+            break
+
+    u2 = cos2_alphas * (_WGS84_A ** 2 - _WGS84_B ** 2) / _WGS84_B ** 2
+    a = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    b = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    delta_sigmas = b * sin_sigmas * (cos_2sigma_ms + b / 4 * (
+        cos_sigmas * (-1 + 2 * cos_2sigma_ms ** 2) -
+        b / 6 * cos_2sigma_ms * (-3 + 4 * sin_sigmas ** 2) * (-3 + 4 * cos_2sigma_ms ** 2)))
+    distances = _WGS84_B * a * (sigmas - delta_sigmas)
+    bearings = np.degrees(np.arctan2(cos_u2 * np.sin(lambdas), cos_u1 * sin_u2 - sin_u1 * cos_u2 * np.cos(lambdas)))
+
+    for index in map(tuple, np.argwhere(~converged)):
+        result = Geodesic.WGS84.Inverse(lats1[index], lngs1[index], lats2[index], lngs2[index])
+        distances[index] = result['s12']
+        bearings[index] = result['azi1']
+
+    return distances, bearings
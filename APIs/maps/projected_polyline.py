@@ -0,0 +1,101 @@
+import numpy as np
+
+from APIs.maps import maps_util
+
+# number of locations projected at once in the batch queries, to bound the memory of the locations x segments arrays
+_BATCH_SIZE = 256
+
+
+class ProjectedPolyline:
+    """
+    A polyline projected once to a local plane in metres around its first point, so the distance of a location from
+    the polyline is calculated with vectorized operations on all segments, instead of on the raw lat/lng degrees
+    (which are distorted away from the equator).
+
+    The equirectangular projection is accurate to a fraction of a metre for routes of a few kilometres.
+    """
+
+    def __init__(self, polyline):
+        '''
+        :param polyline: list of [lat, lng], with at least 1 point
+        '''
+        self.polyline = polyline
+        self.origin = list(polyline[0])
+
+        # a single point is a polyline with a zero length segment
+        points_xy = maps_util.to_local_meters(polyline if len(polyline) > 1 else [polyline[0]] * 2, self.origin)
+        self.points_xy = points_xy
+        self._starts = points_xy[:-1]
+        self._segments = points_xy[1:] - self._starts
+        self._segment_lengths = np.hypot(self._segments[:, 0], self._segments[:, 1])
+        self._squared_lengths = np.where(self._segment_lengths > 0, self._segment_lengths ** 2, 1)
+        # distance along the polyline of each point
+        self.cumulative_dists = np.concatenate(([0.0], np.cumsum(self._segment_lengths)))
+
+    @property
+    def length(self):
+        return float(self.cumulative_dists[-1])
+
+    def to_local_meters(self, coordinates):
+        '''
+        :param coordinates: list of [lat, lng]
+        :return: numpy array of [x, y] in metres on the plane of the polyline
+        '''
+        return maps_util.to_local_meters(coordinates, self.origin)
+
+    def project(self, location):
+        '''
+        Project the location on each segment of the polyline
+
+        :param location: [lat, lng]
+        :return: (numpy array of the distance from each segment, numpy array of the distance along the polyline of
+            the nearest point on each segment), in metres
+        '''
+        return self.project_xy(self.to_local_meters([location])[0])
+
+    def project_xy(self, point_xy):
+        '''
+        Same as project, with the location already on the plane of the polyline
+
+        :param point_xy: [x, y] in metres
+        '''
+        ratios = np.clip(((point_xy[0] - self._starts[:, 0]) * self._segments[:, 0] +
+                          (point_xy[1] - self._starts[:, 1]) * self._segments[:, 1]) / self._squared_lengths, 0, 1)
+        distances = np.hypot(self._starts[:, 0] + self._segments[:, 0] * ratios - point_xy[0],
+                             self._starts[:, 1] + self._segments[:, 1] * ratios - point_xy[1])
+        return distances, self.cumulative_dists[:-1] + ratios * self._segment_lengths
+
+    def get_distance(self, location):
+        '''
+        :param location: [lat, lng]
+        :return: perpendicular distance in metres from the location to the nearest segment
+        '''
+        distances, _ = self.project(location)
+        return float(distances.min())
+
+    def get_nearest(self, location):
+        '''
+        :param location: [lat, lng]
+        :return: (distance in metres from the location to the nearest segment, distance along the polyline of the
+            nearest point)
+        '''
+        distances, along_dists = self.project(location)
+        nearest = int(np.argmin(distances))
+        return float(distances[nearest]), float(along_dists[nearest])
+
+    def get_distances(self, coordinates):
+        '''
+        Batch version of get_distance, e.g., to replay a GPS trace
+
+        :param coordinates: list of [lat, lng]
+        :return: numpy array of the distance in metres from each location to the nearest segment
+        '''
+        points_xy = self.to_local_meters(coordinates)
+        distances = np.empty(len(points_xy))
+        for start in range(0, len(points_xy), _BATCH_SIZE):
+            batch_xy = points_xy[start:start + _BATCH_SIZE, None, :]
+            offsets = batch_xy - self._starts
+            ratios = np.clip(np.einsum("ijk,jk->ij", offsets, self._segments) / self._squared_lengths, 0, 1)
+            deltas = offsets - ratios[:, :, None] * self._segments
+            distances[start:start + _BATCH_SIZE] = np.sqrt(np.einsum("ijk,ijk->ij", deltas, deltas).min(axis=1))
+        return distances
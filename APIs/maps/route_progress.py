@@ -0,0 +1,150 @@
+import math
+import time
+
+import numpy as np
+
+from APIs.maps import maps_util
+from APIs.maps.direction_data import DirectionData
+from APIs.maps.projected_polyline import ProjectedPolyline
+
+# distance ahead on the route to calculate the direction, so it is not too sensitive to the GPS noise near a maneuver
+_MIN_BEARING_DISTANCE = 10  # m
+
+
+class RouteProgress:
+    """
+    Follows the runner along a route from the directions API, so the direction updates (distance to the next
+    maneuver, current instruction, distance to the destination) are calculated locally from the GPS location instead
+    of requesting the directions again.
+
+    The polyline, the steps and their cumulative distances are precomputed once per route. The runner is located on
+    the route by projecting the location on the polyline segments near the previous progress, so loops and routes
+    crossing themselves are followed in order.
+    """
+
+    def __init__(self, direction_data, on_route_threshold_m=30, max_backtrack_m=50):
+        '''
+        :param direction_data: DirectionData with the polyline and the steps of the route
+        :param on_route_threshold_m: maximum distance from the route to be considered on route
+        :param max_backtrack_m: maximum distance the runner can go back along the route
+        '''
+        self.start_time = direction_data.start_time
+        self.on_route_threshold_m = on_route_threshold_m
+        self.max_backtrack_m = max_backtrack_m
+
+        self._polyline = [list(point) for point in direction_data.polyline]
+        self._projected_polyline = ProjectedPolyline(self._polyline)
+        self._polyline_xy = self._projected_polyline.points_xy
+        self._polyline_dists = self._projected_polyline.cumulative_dists
+
+        # the step distances are from the directions API, which can differ slightly from the polyline length
+        steps = direction_data.steps
+        self._instructions = [step.instruction for step in steps]
+        self._step_ends = np.cumsum([step.distance for step in steps], dtype=float)
+        self._route_dist = float(self._step_ends[-1])
+        self._polyline_scale = self._polyline_dists[-1] / self._route_dist if self._route_dist > 0 else 0.0
+        # estimated time to reach each distance along the route, interpolated between the steps
+        self._time_dists = np.concatenate(([0.0], self._step_ends))
+        self._times = np.concatenate(([0.0], np.cumsum([step.duration for step in steps], dtype=float)))
+        # distance along the route of each waypoint, i.e., end of each leg (a leg without steps, e.g., to a waypoint at
+        # the previous waypoint, ends where the previous leg ends)
+        last_step_indices = {step.leg_index: i for i, step in enumerate(steps)}
+        self._leg_ends = []
+        leg_end = 0.0
+        for leg_index in range(steps[-1].leg_index + 1):
+            if leg_index in last_step_indices:
+                leg_end = float(self._step_ends[last_step_indices[leg_index]])
+            self._leg_ends.append(leg_end)
+
+        # distance along the polyline of the runner
+        self._progress = 0.0
+
+    @staticmethod
+    def is_supported(direction_data):
+        '''
+        :return: True if the directions have the steps and the polyline to follow the route locally
+        '''
+        return bool(direction_data.steps) and direction_data.polyline is not None and len(direction_data.polyline) > 1
+
+    def get_direction_data(self, coordinates, bearing):
+        '''
+        :param coordinates: [current location, remaining waypoints..., destination] as [lat, lng], same as the
+            coordinates of a directions request
+        :param bearing: bearing of the runner
+        :return: DirectionData from the current location, None if the runner is not on the route (the directions
+            should be requested again)
+        '''
+        leg_index = len(self._leg_ends) - (len(coordinates) - 1)
+        if leg_index < 0:
+            return None
+
+        location = coordinates[0]
+        location_xy = self._projected_polyline.to_local_meters([location])[0]
+        progress = self._locate(location_xy)
+        if progress is None:
+            return None
+        self._progress = progress
+
+        route_progress = progress / self._polyline_scale if self._polyline_scale > 0 else 0.0
+        step_index = min(int(np.searchsorted(self._step_ends, route_progress, side="right")),
+                         len(self._instructions) - 1)
+        step_end = float(self._step_ends[step_index])
+        waypoint_end = self._leg_ends[min(leg_index, len(self._leg_ends) - 1)]
+
+        dest_dist = max(self._route_dist - route_progress, 0)
+        curr_dist = max(step_end - route_progress, 0)
+        waypoint_dist = max(waypoint_end - route_progress, 0)
+        dest_duration = self._get_duration(route_progress, self._route_dist)
+        curr_duration = self._get_duration(route_progress, step_end)
+        waypoint_duration = self._get_duration(route_progress, waypoint_end)
+
+        return DirectionData(
+            start_time=self.start_time,
+            update_time=int(time.time() * 1000),
+            dest_dist=math.ceil(dest_dist),
+            dest_dist_str=f"{math.ceil(dest_dist)} m",
+            dest_duration=dest_duration,
+            dest_duration_str=f"{math.ceil(dest_duration / 60)} min",
+            curr_dist=math.ceil(curr_dist),
+            curr_dist_str=f"{math.ceil(curr_dist)} m",
+            curr_duration=curr_duration,
+            curr_duration_str=f"{math.ceil(curr_duration / 60)} min",
+            curr_instr=self._instructions[step_index],
+            curr_direction=self._get_direction(location_xy, bearing, step_end * self._polyline_scale),
+            num_steps=str(len(self._instructions) - step_index),
+            waypoint_dist=math.ceil(waypoint_dist),
+            waypoint_dist_str=f"{math.ceil(waypoint_dist)} m",
+            waypoint_duration=waypoint_duration,
+            waypoint_duration_str=f"{math.ceil(waypoint_duration / 60)} min",
+            polyline=[list(location)] + self._polyline[int(np.searchsorted(self._polyline_dists, progress,
+                                                                            side="right")):],
+        )
+
+    def _locate(self, location_xy):
+        '''
+        :return: distance along the polyline of the location, None if it is not on the route
+        '''
+        distances, along_dists = self._projected_polyline.project_xy(location_xy)
+        candidates = np.flatnonzero((distances <= self.on_route_threshold_m) &
+                                    (along_dists >= self._progress - self.max_backtrack_m))
+        if len(candidates) == 0:
+            return None
+
+        # the first consecutive segments near the location, the route may pass the location again later on
+        gaps = np.flatnonzero(np.diff(candidates) > 1)
+        if len(gaps) > 0:
+            candidates = candidates[:gaps[0] + 1]
+        nearest = candidates[np.argmin(distances[candidates])]
+        return float(along_dists[nearest])
+
+    def _get_duration(self, from_dist, to_dist):
+        times = np.interp((from_dist, to_dist), self._time_dists, self._times)
+        return max(math.ceil(times[1] - times[0]), 0)
+
+    def _get_direction(self, location_xy, bearing, maneuver_dist):
+        target_dist = min(max(maneuver_dist, self._progress + _MIN_BEARING_DISTANCE), self._polyline_dists[-1])
+        target_x = np.interp(target_dist, self._polyline_dists, self._polyline_xy[:, 0])
+        target_y = np.interp(target_dist, self._polyline_dists, self._polyline_xy[:, 1])
+        # bearing on the local plane, which is accurate enough at a few hundred metres
+        bearing_after = int(math.degrees(math.atan2(target_x - location_xy[0], target_y - location_xy[1]))) % 360
+        return maps_util.calculate_turn_angle(bearing, bearing_after)
@@ -0,0 +1,183 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from Utilities import logging_utility, metrics_utility
+
+METRIC_HITS = "static_map_cache.hits"
+METRIC_MISSES = "static_map_cache.misses"
+METRIC_SHARED_FETCHES = "static_map_cache.shared_fetches"  # requests waiting for the same in-flight fetch
+METRIC_EVICTIONS = "static_map_cache.evictions"
+
+_FILE_EXTENSION = ".img"
+# decimal places of the coordinates in the key, about 0.1 m
+_COORDINATE_DECIMALS = 6
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+class StaticMapCache:
+    """
+    A content-addressed cache of the static map images on disk, so the same map (provider, size, style and path) is
+    downloaded only once, including across restarts.
+
+    The least recently used images are evicted when the cache is larger than `max_bytes`. Images are written to a
+    temporary file and renamed, so concurrent readers (threads or processes) never see a partial image. Concurrent
+    requests of the same map share one fetch.
+    """
+
+    def __init__(self, directory, max_bytes):
+        '''
+        :param directory: directory of the cached images, created on the first image
+        :param max_bytes: maximum total size of the cached images
+        '''
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        # key -> concurrent.futures.Future of the image being fetched
+        self._in_flight = {}
+        # total size of the cached images, None until the directory is scanned
+        self._size_bytes = None
+
+    @staticmethod
+    def get_key(provider, size, style, coordinates):
+        '''
+        :param provider: static maps option
+        :param size: (width, height)
+        :param style: style of the map, e.g., the style parameters of the URL
+        :param coordinates: list of [lat, lng] of the path
+        :return: hash of the parameters of the map
+        '''
+        rounded_coordinates = [[round(lat, _COORDINATE_DECIMALS), round(lng, _COORDINATE_DECIMALS)]
+                               for lat, lng in coordinates]
+        parameters = json.dumps([provider, list(size), style, rounded_coordinates], separators=(",", ":"))
+        return hashlib.sha256(parameters.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        '''
+        :return: cached image bytes, None if not cached
+        '''
+        file_path = self._get_file_path(key)
+        try:
+            with open(file_path, "rb") as file:
+                data = file.read()
+            # the modification time is the last access time for the eviction
+            os.utime(file_path)
+        except FileNotFoundError:
+            metrics_utility.increment_counter(METRIC_MISSES)
+            return None
+
+        metrics_utility.increment_counter(METRIC_HITS)
+        return data
+
+    def put(self, key, data):
+        os.makedirs(self.directory, exist_ok=True)
+        file_path = self._get_file_path(key)
+        previous_size = _get_file_size(file_path)
+
+        file_descriptor, temp_file_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temp_file_path, file_path)
+        except OSError:
+            _logger.exception("Failed to cache the static map {key}", key=key)
+            _remove_file(temp_file_path)
+            return
+
+        with self._lock:
+            if self._size_bytes is not None:
+                self._size_bytes += len(data) - previous_size
+        self._evict_if_full()
+
+    async def get_or_fetch(self, key, fetch):
+        '''
+        :param key: see get_key
+        :param fetch: coroutine function without parameters, which returns the image bytes (None is not cached)
+        :return: image bytes
+        '''
+        data = self.get(key)
+        if data is not None:
+            return data
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_fetching = future is None
+            if is_fetching:
+                future = self._in_flight[key] = concurrent.futures.Future()
+
+        if not is_fetching:
+            metrics_utility.increment_counter(METRIC_SHARED_FETCHES)
+            # the future may be completed in another event loop
+            return await asyncio.wrap_future(future)
+
+        try:
+            data = await fetch()
+            if data:
+                self.put(key, data)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def clear(self):
+        for file_path in self._get_file_paths():
+            _remove_file(file_path)
+        with self._lock:
+            self._size_bytes = 0
+
+    def _get_file_path(self, key):
+        return os.path.join(self.directory, key + _FILE_EXTENSION)
+
+    def _get_file_paths(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [entry.path for entry in os.scandir(self.directory) if entry.name.endswith(_FILE_EXTENSION)]
+
+    def _evict_if_full(self):
+        with self._lock:
+            if self._size_bytes is None:
+                self._size_bytes = sum(_get_file_size(file_path) for file_path in self._get_file_paths())
+            if self._size_bytes <= self.max_bytes:
+                return
+
+            files = []
+            for file_path in self._get_file_paths():
+                try:
+                    stat = os.stat(file_path)
+                    files.append((stat.st_mtime, stat.st_size, file_path))
+                except FileNotFoundError:
+                    # evicted by another process
+                    continue
+
+            # least recently used first
+            self._size_bytes = sum(file_size for _, file_size, _ in files)
+            for _, file_size, file_path in sorted(files):
+                if self._size_bytes <= self.max_bytes:
+                    break
+                _remove_file(file_path)
+                self._size_bytes -= file_size
+                metrics_utility.increment_counter(METRIC_EVICTIONS)
+
+
+def _get_file_size(file_path):
+    try:
+        return os.path.getsize(file_path)
+    except FileNotFoundError:
+        return 0
+
+
+def _remove_file(file_path):
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
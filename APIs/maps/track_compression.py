@@ -0,0 +1,151 @@
+from array import array
+from collections.abc import Sequence
+
+import numpy as np
+
+from APIs.maps import maps_util
+
+
+class TrackBuffer(Sequence):
+    """
+    A growing track of [lat, lng] stored in a flat array of doubles (16 bytes per point), instead of a list of lists
+    (about 140 bytes per point). It is a sequence of (lat, lng) tuples, so it can be used in place of the list.
+    """
+
+    def __init__(self, coordinates=()):
+        self._values = array("d")
+        self.extend(coordinates)
+
+    def append(self, coordinate):
+        self._values.append(coordinate[0])
+        self._values.append(coordinate[1])
+
+    def extend(self, coordinates):
+        for coordinate in coordinates:
+            self.append(coordinate)
+
+    def to_numpy(self):
+        '''
+        :return: numpy array of [lat, lng] (a copy)
+        '''
+        return np.frombuffer(self._values, dtype=float).reshape(-1, 2).copy()
+
+    def simplify(self, tolerance, max_points=None):
+        '''
+        Simplify the track in place, see simplify_track
+
+        :param tolerance: initial tolerance in metres
+        :param max_points: maximum number of points of the simplified track, the tolerance is doubled until the track
+        has at most max_points (None to simplify once)
+        '''
+        if max_points is None:
+            simplified_track = simplify_track(self.to_numpy(), tolerance)
+        else:
+            simplified_track = _simplify_to_max_points(self.to_numpy(), max_points, tolerance)
+        self._values = array("d", simplified_track.ravel().tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TrackBuffer index out of range")
+        return self._values[2 * index], self._values[2 * index + 1]
+
+    def __len__(self):
+        return len(self._values) // 2
+
+    def __eq__(self, other):
+        if isinstance(other, TrackBuffer):
+            return self._values == other._values
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(tuple(point) == tuple(coordinate)
+                                                   for point, coordinate in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TrackBuffer({len(self)} points)"
+
+
+def simplify_track(coordinates, tolerance):
+    '''
+    Simplify the track with the Douglas-Peucker algorithm, i.e., keep the points which are further than the tolerance
+    from the simplified track. The first and the last points are always kept.
+
+    :param coordinates: list or numpy array of [lat, lng]
+    :param tolerance: maximum distance in metres of the removed points from the simplified track
+    :return: numpy array of [lat, lng]
+    '''
+    if isinstance(coordinates, TrackBuffer):
+        coordinates = coordinates.to_numpy()
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    if len(coordinates) < 3:
+        return coordinates.copy()
+
+    points_xy = maps_util.to_local_meters(coordinates, coordinates[0])
+    keep = np.zeros(len(coordinates), dtype=bool)
+    keep[[0, -1]] = True
+
+    # all the ranges of the same depth are split at once, so there are O(log n) numpy passes for most tracks
+    starts = np.array([0])
+    ends = np.array([len(coordinates) - 1])
+    while len(starts) > 0:
+        lengths = ends - starts - 1
+        has_points = lengths > 0
+        starts, ends, lengths = starts[has_points], ends[has_points], lengths[has_points]
+        if len(starts) == 0:
+            break
+
+        range_ids = np.repeat(np.arange(len(starts)), lengths)
+        range_offsets = np.cumsum(lengths) - lengths
+        indices = starts[range_ids] + 1 + np.arange(len(range_ids)) - range_offsets[range_ids]
+        distances = _get_distances_to_segments(points_xy[indices], points_xy[starts[range_ids]],
+                                               points_xy[ends[range_ids]])
+
+        max_distances = np.maximum.reduceat(distances, range_offsets)
+        max_positions = np.flatnonzero(distances == max_distances[range_ids])
+        # first farthest point of each range
+        _, first_positions = np.unique(range_ids[max_positions], return_index=True)
+        farthest = indices[max_positions[first_positions]]
+
+        is_split = max_distances > tolerance
+        keep[farthest[is_split]] = True
+        starts, ends = (np.concatenate((starts[is_split], farthest[is_split])),
+                        np.concatenate((farthest[is_split], ends[is_split])))
+
+    return coordinates[keep]
+
+
+def simplify_for_static_map(coordinates, max_points, tolerance):
+    '''
+    Simplify the track so the URL of a static map stays within the limits of the providers. The track is simplified
+    again with a doubled tolerance until it has at most max_points.
+
+    :param coordinates: list or numpy array of [lat, lng]
+    :param max_points: maximum number of points of the simplified track
+    :param tolerance: initial tolerance in metres, see simplify_track
+    :return: list of [lat, lng]
+    '''
+    return _simplify_to_max_points(coordinates, max_points, tolerance).tolist()
+
+
+def _simplify_to_max_points(coordinates, max_points, tolerance):
+    simplified_track = simplify_track(coordinates, tolerance)
+    while len(simplified_track) > max(max_points, 2):
+        # simplifying the simplified track is much faster, and the error is at most the sum of the tolerances (i.e.,
+        # twice the last tolerance)
+        tolerance *= 2
+        simplified_track = simplify_track(simplified_track, tolerance)
+
+    return simplified_track
+
+
+def _get_distances_to_segments(points_xy, starts_xy, ends_xy):
+    segments = ends_xy - starts_xy
+    offsets = points_xy - starts_xy
+    squared_lengths = np.einsum("ij,ij->i", segments, segments)
+    # the segment of a closed loop (i.e., the start is the end) is a point
+    ratios = np.clip(np.einsum("ij,ij->i", offsets, segments) / np.where(squared_lengths > 0, squared_lengths, 1), 0, 1)
+    deltas = offsets - ratios[:, None] * segments
+    return np.hypot(deltas[:, 0], deltas[:, 1])
@@ -7,6 +7,7 @@ import openrouteservice
 import base_keys
 from APIs.maps import maps_util
 from APIs.maps.direction_data import DirectionData
+from APIs.maps.direction_step import DirectionStep
 from Utilities import file_utility, logging_utility
 from Utilities.file_utility import get_credentials_file_path
 
@@ -155,6 +156,9 @@ async def find_directions_ors(start_time, coordinates, bearing, option):
     num_steps = 0
     for segment in segments:
         num_steps += len(segment["steps"])
+    all_steps = [DirectionStep(instruction=step["instruction"], distance=step["distance"], duration=step["duration"],
+                               leg_index=leg_index)
+                 for leg_index, segment in enumerate(segments) for step in segment["steps"]]
 
     return DirectionData(
         start_time=start_time,
@@ -174,5 +178,6 @@ async def find_directions_ors(start_time, coordinates, bearing, option):
         waypoint_dist_str=waypoint_dist_str,
         waypoint_duration=waypoint_duration,
         waypoint_duration_str=waypoint_duration_str,
-        polyline=polyline
+        polyline=polyline,
+        steps=all_steps
     )
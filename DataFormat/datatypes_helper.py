@@ -1,8 +1,9 @@
 import importlib
 import os
+from collections.abc import Mapping
 
 from google.protobuf import json_format
-from google.protobuf.message import DecodeError
+from google.protobuf.message import DecodeError, Message
 
 from DataFormat.ProtoFiles.Common import socket_data_pb2
 from Utilities import file_utility, logging_utility
@@ -96,9 +97,100 @@ def _get_proto_file_to_data_type_mapping():
     return proto_file_data_type_map
 
 
+def _validate_data_type_json():
+    """
+    Raise ValueError if an entry misses a required value or if a key is used by multiple datatypes
+    """
+    datatype_by_key = {}
+
+    for name, val in DATATYPE_JSON.items():
+        if DATA_TYPE_JSON_VAL_KEY not in val or DATA_TYPE_JSON_VAL_PROTO_FILE not in val:
+            raise ValueError(f"DataTypes.json: {name} must have '{DATA_TYPE_JSON_VAL_KEY}' and "
+                             f"'{DATA_TYPE_JSON_VAL_PROTO_FILE}'")
+
+        key = val[DATA_TYPE_JSON_VAL_KEY]
+        if key in datatype_by_key:
+            raise ValueError(f"DataTypes.json: key {key} is used by both {datatype_by_key[key]} and {name}")
+        datatype_by_key[key] = name
+
+
+def _import_proto_class(proto_file):
+    """
+    :param proto_file: e.g., "Common/exercise_wear_os_data_pb2.py"
+    :return: the protobuf message class defined in the proto file, None if the proto file does not exist
+    """
+    # remove last 3 characters, that is, .py
+    submod_name = proto_file[:-3]
+    # change the directory format for import (i.e., replace "/" with ".")
+    submod_name = submod_name.replace("/", ".")
+    submod_name = f"{_PROTO_FILE_IMPORT_PATH}.{submod_name}"
+
+    try:
+        submod = importlib.import_module(submod_name)
+    except ModuleNotFoundError:
+        return None
+
+    message_names = list(submod.DESCRIPTOR.message_types_by_name)
+    if len(message_names) != 1:
+        raise ValueError(f"DataTypes.json: {proto_file} must define exactly one message, found {message_names}")
+
+    proto_class = getattr(submod, message_names[0])
+    if not issubclass(proto_class, Message):
+        raise ValueError(f"DataTypes.json: {proto_file} does not define a protobuf message")
+
+    return proto_class
+
+
+def _get_key_to_proto_class_mapping():
+    """
+    :return: the map with { 51: ExerciseWearOsData, ... }, where ExerciseWearOsData is the protobuf message class
+    """
+    key_proto_class_map = {}
+    missing_proto_files = []
+
+    for key, val in DATATYPE_JSON.items():
+        proto_class = _import_proto_class(val[DATA_TYPE_JSON_VAL_PROTO_FILE])
+
+        if proto_class is None:
+            missing_proto_files.append(f"{key}: {val[DATA_TYPE_JSON_VAL_PROTO_FILE]}")
+            continue
+
+        key_proto_class_map[val[DATA_TYPE_JSON_VAL_KEY]] = proto_class
+
+    if missing_proto_files:
+        _logger.error("Proto files not found, these datatypes cannot be decoded: {missing}",
+                      missing=", ".join(missing_proto_files))
+
+    return key_proto_class_map
+
+
+def _get_proto_class_to_key_mapping():
+    """
+    :return: the map with { ExerciseWearOsData: 51, ... }
+        (the first key in DataTypes.json, if the same protobuf message class is used by multiple datatypes)
+    """
+    proto_class_key_map = {}
+
+    for key, proto_class in KEY_TO_PROTO_CLASS_MAP.items():
+        if proto_class not in proto_class_key_map:
+            proto_class_key_map[proto_class] = key
+
+    return proto_class_key_map
+
+
+def _get_shared_proto_classes():
+    """
+    :return: set of protobuf message classes, which are used by multiple datatypes (e.g., RequestData)
+    """
+    proto_classes = list(KEY_TO_PROTO_CLASS_MAP.values())
+
+    return {proto_class for proto_class in proto_classes if proto_classes.count(proto_class) > 1}
+
+
 ########################################################
 
 DATATYPE_JSON = _get_data_type_json()
+_validate_data_type_json()
 
 DATATYPE_TO_KEY_MAP = _get_data_type_to_key_mapping()
 KEY_TO_DATATYPE_MAP = _get_key_to_data_type_mapping()
@@ -106,6 +198,11 @@ KEY_TO_DATATYPE_MAP = _get_key_to_data_type_mapping()
 DATATYPE_TO_PROTO_MAP = _get_data_type_to_proto_file_mapping()
 PROTO_TO_DATATYPE_MAP = _get_proto_file_to_data_type_mapping()
 
+# Built once at startup, so encoding and decoding do not need to import modules or parse type names
+KEY_TO_PROTO_CLASS_MAP = _get_key_to_proto_class_mapping()
+PROTO_CLASS_TO_KEY_MAP = _get_proto_class_to_key_mapping()
+SHARED_PROTO_CLASSES = _get_shared_proto_classes()
+
 
 ########################################################
 ################# Helper Functions #####################
@@ -123,17 +220,14 @@ def get_key_by_instance(proto):
         get_key_by_instance(running_data_proto)  # Returns the key number, 1001
     """
 
-    _type = str(type(proto)).split("'")[1]
-    _type = _type.split(".")[0]
-
-    proto_file = _type + ".py"
-    datatype_names = PROTO_TO_DATATYPE_MAP.get(proto_file)
+    proto_class = type(proto)
 
-    if datatype_names is None or len(datatype_names) != 1:
-        _logger.warn("Cannot find ONE datatype name for proto file {proto_file}", proto_file=proto_file)
-    datatype_name = datatype_names[0]  # get the first datatype name
+    if proto_class not in PROTO_CLASS_TO_KEY_MAP:
+        raise KeyError(f"Cannot find a datatype for {proto_class.__name__}")
+    if proto_class in SHARED_PROTO_CLASSES:
+        _logger.warn("Cannot find ONE datatype name for {proto_class}", proto_class=proto_class.__name__)
 
-    return get_key_by_name(datatype_name)
+    return PROTO_CLASS_TO_KEY_MAP[proto_class]
 
 
 def get_key_by_name(data_type_name):
@@ -145,17 +239,10 @@ def get_name_by_key(data_type_key):
 
 
 def get_proto_func_by_key(data_type_key):
-    datatype_name = get_name_by_key(data_type_key)
-    proto_file = DATATYPE_TO_PROTO_MAP[datatype_name]
-
-    # remove last 3 characters, that is, .py
-    submod_name = proto_file[:-3]
-    # change the directory format for import (i.e., replace "/" with ".")
-    submod_name = submod_name.replace("/", ".")
-    submod_name = f"{_PROTO_FILE_IMPORT_PATH}.{submod_name}"
-    submod = importlib.import_module(submod_name)
-
-    return getattr(submod, dir(submod)[1])
+    """
+    :return: the protobuf message class of the datatype key, None if unknown
+    """
+    return KEY_TO_PROTO_CLASS_MAP.get(data_type_key)
 
 
 def wrap_socket_message_with_metadata(data, data_type=None):
@@ -201,10 +288,122 @@ def decode_websocket_data(raw_data):
         return None, None
 
 
-# NOTE: Data is pickled when added to the shared memory (See: WebsocketWidget)
-# Protobuf cannot be pickled -> Protobuf data is converted to dictionary in widget
-# -> Use this function to convert back to Protobuf
+class WebsocketMessage(Mapping):
+    """
+    A message received through the websocket server. It keeps the serialized protobuf payload and decodes it only
+    when a subscriber needs it (once, shared by all the subscribers in the process).
+
+    Use `get_protobuf_message` to get the protobuf message, which MUST be treated as read-only. For components which
+    still expect a dictionary, the message also behaves as a read-only dictionary with the same content as
+    `MessageToDict(proto, preserving_proto_field_name=True)`.
+    """
+
+    def __init__(self, data_type, payload):
+        '''
+        :param data_type: datatype key of the payload
+        :param payload: serialized protobuf message (bytes)
+        '''
+        self.data_type = data_type
+        self.payload = payload
+        self._proto = None
+        self._dict = None
+
+    def get_proto(self):
+        '''
+        :return: the decoded protobuf message, None if the payload cannot be decoded
+        '''
+        if self._proto is None:
+            proto_func = get_proto_func_by_key(self.data_type)
+            if not proto_func:
+                _logger.error("Unknown {data_type} protobuf message received", data_type=self.data_type)
+                return None
+
+            try:
+                proto = proto_func()
+                proto.ParseFromString(self.payload)
+            except DecodeError as e:
+                _logger.error("Error decoding protobuf type {data_type} : {e}", data_type=self.data_type, e=str(e))
+                return None
+
+            self._proto = proto
+
+        return self._proto
+
+    def to_dict(self):
+        '''
+        :return: the message in dictionary format, empty if the payload cannot be decoded
+        '''
+        if self._dict is None:
+            proto = self.get_proto()
+            self._dict = {} if proto is None else json_format.MessageToDict(proto, preserving_proto_field_name=True)
+
+        return self._dict
+
+    def __getitem__(self, key):
+        return self.to_dict()[key]
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def __repr__(self):
+        return f"WebsocketMessage(data_type={self.data_type}, payload={len(self.payload)} bytes)"
+
+    def __getstate__(self):
+        # only the serialized payload is pickled, as protobuf messages cannot be pickled
+        return {"data_type": self.data_type, "payload": self.payload}
+
+    def __setstate__(self, state):
+        self.__init__(state["data_type"], state["payload"])
+
+
+def decode_websocket_message(raw_data):
+    """
+    Decode only the SocketData envelope, the payload is decoded lazily (See: WebsocketMessage)
+
+    :param raw_data: serialized SocketData received through the websocket server
+    :return: WebsocketMessage, None if the data is not a valid SocketData of a known datatype
+    """
+    if not raw_data or isinstance(raw_data, str):
+        _logger.warn("Received data is not a valid socket_data instance")
+        return None
+
+    try:
+        msg = socket_data_pb2.SocketData()
+        msg.ParseFromString(raw_data)
+    except DecodeError as e:
+        _logger.warn("Error decoding protobuf message : {exc}", exc=str(e))
+        return None
+
+    if msg.data_type not in KEY_TO_PROTO_CLASS_MAP:
+        _logger.error("Unknown {socket_data_type} protobuf message received", socket_data_type=msg.data_type)
+        return None
+
+    return WebsocketMessage(msg.data_type, msg.data)
+
+
+def get_protobuf_message(data_type, data):
+    """
+    :param data_type: datatype key of the data
+    :param data: WebsocketMessage (decoded once), protobuf message, or dictionary (e.g., mock data)
+    :return: the protobuf message, None if the data cannot be decoded
+    """
+    if isinstance(data, WebsocketMessage):
+        return data.get_proto()
+    if isinstance(data, Message):
+        return data
+
+    return convert_json_to_protobuf(data_type, data)
+
+
+# NOTE: Websocket messages are passed to the services as WebsocketMessage (See: WebsocketWidget), which are
+# decoded with get_protobuf_message. Use this function to convert dictionaries (e.g., mock data) to Protobuf
 def convert_json_to_protobuf(data_type, json_data):
+    if isinstance(json_data, WebsocketMessage):
+        return json_data.get_proto()
+
     try:
         proto_func = get_proto_func_by_key(data_type)
 
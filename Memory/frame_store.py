@@ -0,0 +1,188 @@
+import struct
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Utilities import logging_utility
+
+_logger = logging_utility.setup_logger(__name__)
+
+# frame store config
+_FRAME_STORE_NAME = 'TOM_FRAME_STORE'
+_FRAME_STORE_NUM_SLOTS = 3
+_FRAME_STORE_MAX_FRAME_BYTES = 1920 * 1080 * 4  # enough for a 1080p frame with 4 channels
+
+# Layout of the shared memory segment:
+#   [store header][slot header 0][slot data 0][slot header 1][slot data 1]...
+# store header: latest sequence number, number of slots, max frame bytes
+_STORE_HEADER_FORMAT = "<QII"
+_STORE_HEADER_SIZE = 64
+# slot header: sequence number, timestamp, width, height, channels, dtype (numpy dtype.str), number of bytes
+_SLOT_HEADER_FORMAT = "<QdIII8sQ"
+_SLOT_HEADER_SIZE = 64
+
+_MAX_READ_ATTEMPTS = 3
+
+# Global _frame_store instance
+_frame_store = None
+
+
+@dataclass
+class FrameMetadata:
+    """
+    Metadata of a frame in the frame store
+    """
+    # Incremented for every published frame, starting from 1
+    sequence: int = 0
+    # Time when the frame is published, in seconds since epoch
+    timestamp: float = 0.0
+    width: int = 0
+    height: int = 0
+    channels: int = 0
+    dtype: str = ""
+
+
+class FrameStore:
+    """
+    A fixed-slot ring buffer of raw frames in shared memory (`multiprocessing.shared_memory`), so camera frames can be
+    shared across processes without pickling.
+
+    A writer copies the raw bytes of a frame into the next slot and then publishes its sequence number. Readers get a
+    numpy view of the latest slot without copying. A view stays valid until its slot is reused, i.e., after
+    `num_slots - 1` more frames are published, so use `copy=True` to keep a frame for longer.
+    """
+
+    def __init__(self, name=_FRAME_STORE_NAME, num_slots=_FRAME_STORE_NUM_SLOTS,
+                 max_frame_bytes=_FRAME_STORE_MAX_FRAME_BYTES):
+        self.slot_size = _SLOT_HEADER_SIZE + max_frame_bytes
+        size = _STORE_HEADER_SIZE + num_slots * self.slot_size
+
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            struct.pack_into(_STORE_HEADER_FORMAT, self.shm.buf, 0, 0, num_slots, max_frame_bytes)
+        except FileExistsError:
+            # attach to the frame store created by another process, and use its layout
+            self.shm = shared_memory.SharedMemory(name=name, create=False)
+            _, num_slots, max_frame_bytes = struct.unpack_from(_STORE_HEADER_FORMAT, self.shm.buf, 0)
+            self.slot_size = _SLOT_HEADER_SIZE + max_frame_bytes
+
+        self.num_slots = num_slots
+        self.max_frame_bytes = max_frame_bytes
+
+    def publish_frame(self, frame, timestamp=None):
+        '''
+        Copy the frame into the next slot and publish it as the latest frame
+
+        :param frame: numpy array with the shape (height, width) or (height, width, channels)
+        :param timestamp: time of the frame in seconds since epoch, default to now
+        :return: sequence number of the published frame
+        '''
+        if frame.nbytes > self.max_frame_bytes:
+            raise ValueError(f"Frame of {frame.nbytes} bytes exceeds the frame store slot of "
+                             f"{self.max_frame_bytes} bytes")
+
+        sequence = self._get_latest_sequence() + 1
+        offset = self._get_slot_offset(sequence)
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim > 2 else 1
+
+        # invalidate the slot first, so readers of the old frame in this slot can detect the overwrite
+        struct.pack_into("<Q", self.shm.buf, offset, 0)
+        slot_data = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self.shm.buf,
+                               offset=offset + _SLOT_HEADER_SIZE)
+        np.copyto(slot_data, frame)
+        struct.pack_into(_SLOT_HEADER_FORMAT, self.shm.buf, offset, sequence,
+                         time.time() if timestamp is None else timestamp, width, height, channels,
+                         frame.dtype.str.encode(), frame.nbytes)
+        struct.pack_into("<Q", self.shm.buf, 0, sequence)
+
+        return sequence
+
+    def get_latest_frame(self, copy=False):
+        '''
+        :param copy: return a copy of the frame instead of a view of the shared memory
+        :return: (frame, FrameMetadata) of the latest frame, (None, None) if no frame is published
+        '''
+        for _ in range(_MAX_READ_ATTEMPTS):
+            sequence = self._get_latest_sequence()
+            if sequence == 0:
+                return None, None
+
+            offset = self._get_slot_offset(sequence)
+            metadata = self._read_slot_metadata(offset)
+            if metadata.sequence != sequence:
+                continue  # the slot is being overwritten
+
+            shape = (metadata.height, metadata.width) if metadata.channels == 1 else \
+                (metadata.height, metadata.width, metadata.channels)
+            frame = np.ndarray(shape, dtype=np.dtype(metadata.dtype), buffer=self.shm.buf,
+                               offset=offset + _SLOT_HEADER_SIZE)
+            if copy:
+                frame = frame.copy()
+
+            # make sure that the frame was not overwritten while reading
+            if struct.unpack_from("<Q", self.shm.buf, offset)[0] == sequence:
+                return frame, metadata
+
+        _logger.warning("Unable to read the latest frame, the writer is too fast")
+        return None, None
+
+    def close(self, unlink=False):
+        try:
+            self.shm.close()
+        except BufferError:
+            _logger.warning("Frame store is closed while frame views are still in use")
+        if unlink:
+            self.shm.unlink()
+
+    def _get_latest_sequence(self):
+        return struct.unpack_from("<Q", self.shm.buf, 0)[0]
+
+    def _get_slot_offset(self, sequence):
+        return _STORE_HEADER_SIZE + ((sequence - 1) % self.num_slots) * self.slot_size
+
+    def _read_slot_metadata(self, offset):
+        sequence, timestamp, width, height, channels, dtype, _ = struct.unpack_from(_SLOT_HEADER_FORMAT,
+                                                                                    self.shm.buf, offset)
+        return FrameMetadata(sequence=sequence, timestamp=timestamp, width=width, height=height,
+                             channels=channels, dtype=dtype.rstrip(b"\0").decode())
+
+
+def init():
+    """Initializes the frame store (or attaches to the frame store created by another process)."""
+    global _frame_store
+    _frame_store = FrameStore()
+
+
+def close():
+    """Close and release the frame store."""
+    global _frame_store
+    if _frame_store:
+        _frame_store.close(unlink=True)
+        _frame_store = None
+
+
+def get_frame_store():
+    """Returns the frame store object if available, or initializes it."""
+    global _frame_store
+    if not _frame_store:
+        init()
+    return _frame_store
+
+
+def publish_frame(frame, timestamp=None):
+    """Publishes a frame as the latest frame, returns its sequence number."""
+    return get_frame_store().publish_frame(frame, timestamp)
+
+
+def get_latest_frame(copy=False):
+    """Returns the latest frame (a view of the shared memory unless copy=True), or None if not available."""
+    frame, _ = get_frame_store().get_latest_frame(copy)
+    return frame
+
+
+def get_latest_frame_with_metadata(copy=False):
+    """Returns (frame, FrameMetadata) of the latest frame, or (None, None) if not available."""
+    return get_frame_store().get_latest_frame(copy)
@@ -0,0 +1,42 @@
+import base_keys
+from base_component import BaseComponent
+from Utilities import audio_utility, config_utility
+
+# Options of the component in the configuration file, e.g.,
+#   options:
+#     sample_rate: 16000  # rate of the decoded samples, the rate of the processors avoids resampling them again
+CONFIG_SAMPLE_RATE_KEY = "sample_rate"
+
+# rate of Whisper and YAMNet
+_DEFAULT_SAMPLE_RATE = 16000
+
+
+class AudioFrontend(BaseComponent):
+    """
+    Receives audio_pcm (or audio_data) from audio_widget, decodes it once and sends the samples to the audio processors
+    (e.g., whisper and backgroundAudioClassifier), so they do not decode and resample the same utterance each.
+
+    Sends 3 key-value data pairs to the next component:
+    1. audio_samples: float32 mono samples in [-1, 1] in a numpy array, shared by the processors (read only)
+    2. audio_sample_rate: sample rate of audio_samples
+    3. base_data: the data sent by audio_widget
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        super().set_component_status(base_keys.COMPONENT_NOT_STARTED_STATUS)
+
+        options = config_utility.get_channel_options(name)
+        self.sample_rate = int(options.get(CONFIG_SAMPLE_RATE_KEY, _DEFAULT_SAMPLE_RATE))
+
+    def preprocess(self, raw_data):
+        if super().get_component_status() != base_keys.COMPONENT_IS_RUNNING_STATUS:
+            super().set_component_status(base_keys.COMPONENT_IS_RUNNING_STATUS)
+
+        # a new array for each utterance (no preallocated buffer), as the processors may still use the previous one
+        samples = audio_utility.get_audio_samples(raw_data, self.sample_rate)
+
+        # a copy of the data, as the other subscribers of the audio widget may get the same message
+        super().send_to_component(audio_samples=samples,
+                                  audio_sample_rate=self.sample_rate,
+                                  base_data=dict(raw_data))
@@ -4,8 +4,7 @@ import scipy
 import tensorflow as tf
 import tensorflow_hub as hub
 
-from Utilities.audio_utility import to_wav
-from Utilities import environment_utility
+from Utilities import audio_utility, environment_utility
 from base_component import BaseComponent
 import base_keys
 
@@ -15,9 +14,12 @@ _DEFAULT_SAMPLE_RATE = environment_utility.get_env_int("WHISPER_SAMPLE_RATE")
 
 class BackgroundAudioClassifier(BaseComponent):
     """
-    Receives audio_data from audio_widget and sends the audio context labels to the next component
+    Receives audio_pcm from audio_widget (or audio_samples from audio_frontend) and sends the audio context labels to
+    the next component
 
-    audio_data: Audio Data in BytesIO format
+    audio_pcm: Raw PCM audio data in bytes, with its format (audio_pcm_sample_rate, audio_pcm_sample_width and
+        audio_pcm_channels)
+    audio_samples: Audio samples decoded by audio_frontend, in a float32 numpy array
     audio_context: Audio Context labels in numpy array (e.g. ["Speech", "Music", "Silence", "Small Room"])
     """
 
@@ -74,12 +76,8 @@ class BackgroundAudioClassifier(BaseComponent):
         if super().get_component_status() != base_keys.COMPONENT_IS_RUNNING_STATUS:
             super().set_component_status(base_keys.COMPONENT_IS_RUNNING_STATUS)
 
-        # seek(0) is needed because transcribe.py writes the BytesIO audio data to temp file which sets the internal file pointer to the end of the file.
-        # This helps to reset the file pointer back to the beginning
-        raw_data[base_keys.AUDIO_DATA].seek(0)
-        wav_data = to_wav(raw_data[base_keys.AUDIO_DATA], _DEFAULT_SAMPLE_RATE)
-
-        waveform = wav_data / tf.int16.max
+        # YAMNet expects mono samples in [-1, 1]
+        waveform = audio_utility.get_audio_samples(raw_data, _DEFAULT_SAMPLE_RATE)
 
         # run model
         scores, _, _ = self.clf(waveform)
@@ -1,27 +1,71 @@
-from transformers import pipeline
-from Utilities import environment_utility, logging_utility
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+from Processors.EmotionClassifier.emotion_score_cache import EmotionScoreCache
+from Utilities import config_utility, environment_utility, logging_utility
+from Utilities.batcher import Batcher
 from base_component import BaseComponent
 import base_keys
 
 _EMOTION_MODEL_FROM_TEXT = environment_utility.get_env_string("EMOTION_MODEL_FROM_TEXT")
 
+# Options of the component in the configuration file, e.g.,
+#   options:
+#     batch_size: 8  # set 1 to disable batching
+#     batch_timeout_ms: 20
+#     cache_size: 256  # set 0 to disable the cache
+#     backend: "int8"  # "pipeline" (default), "int8" (dynamically quantized) or "onnx" (requires optimum[onnxruntime])
+#     model_path: "models/emotion-onnx-int8"  # [Optional] exported model, e.g., a quantized ONNX export
+CONFIG_BATCH_SIZE_KEY = "batch_size"
+CONFIG_BATCH_TIMEOUT_MS_KEY = "batch_timeout_ms"
+CONFIG_CACHE_SIZE_KEY = "cache_size"
+CONFIG_BACKEND_KEY = "backend"
+CONFIG_MODEL_PATH_KEY = "model_path"
+
+BACKEND_PIPELINE = "pipeline"
+BACKEND_INT8 = "int8"
+BACKEND_ONNX = "onnx"
+
+_DEFAULT_BATCH_SIZE = 1
+_DEFAULT_BATCH_TIMEOUT_MS = 20
+_DEFAULT_CACHE_SIZE = 256
+# transcripts are not dropped when the classifier cannot keep up (unlike camera frames), the transcription is blocked
+# until there is room instead
+_MAX_PENDING_TRANSCRIPTS = 1000
+
 _logger = logging_utility.setup_logger(__name__)
 
 
 class EmotionClassifier(BaseComponent):
     """
     Receives audio_transcription from transcribe.py and sends emotion scores (if any) to the next component
-    emotion_scores: Emotion scores of the transcribed text in dictionary format 
+    emotion_scores: Emotion scores of the transcribed text in dictionary format
     (e.g. {'joy': 0.99, 'surprise': 0.01}), can be None if no emotion detected
+
+    The scores of recent transcripts are cached. If `batch_size` > 1 is configured, the transcripts arriving within
+    `batch_timeout_ms` are classified in one batch, and the scores are sent in the order of the transcripts.
     """
 
     def __init__(self, name):
         super().__init__(name)
         super().set_component_status(base_keys.COMPONENT_NOT_STARTED_STATUS)
         self.emotion_model = _EMOTION_MODEL_FROM_TEXT
-        self.emotion_classifier = pipeline("text-classification", model=self.emotion_model, top_k=None)
         self.emotion_scores = None
 
+        options = config_utility.get_channel_options(name)
+        self.emotion_classifier = load_emotion_pipeline(options.get(CONFIG_MODEL_PATH_KEY, self.emotion_model),
+                                                        options.get(CONFIG_BACKEND_KEY, BACKEND_PIPELINE))
+        self.score_cache = EmotionScoreCache(int(options.get(CONFIG_CACHE_SIZE_KEY, _DEFAULT_CACHE_SIZE)))
+
+        batch_size = int(options.get(CONFIG_BATCH_SIZE_KEY, _DEFAULT_BATCH_SIZE))
+        batch_timeout_ms = float(options.get(CONFIG_BATCH_TIMEOUT_MS_KEY, _DEFAULT_BATCH_TIMEOUT_MS))
+
+        self.transcript_batcher = None
+        if batch_size > 1:
+            self.transcript_batcher = Batcher(self._analyse_batch, max_batch_size=batch_size,
+                                              max_wait_ms=batch_timeout_ms, max_pending=_MAX_PENDING_TRANSCRIPTS,
+                                              drop_oldest=False, name="emotion_classifier").start()
+
     def analyse_emotion(self, raw_data):
         '''
         Receives raw_data from transcribe.py which contains the transcribed text from the audio data in string format
@@ -30,28 +74,85 @@ class EmotionClassifier(BaseComponent):
         1. emotion_scores: The emotion scores of the transcribed text (if any) in dictionary format
             (e.g. {'joy': 0.99, 'surprise': 0.01}), can be empty dict if no emotion detected
         '''
-        text = raw_data[base_keys.AUDIO_TRANSCRIPTION_DATA]
-        if text != "":
-            # Flattening the data
-            data = self.emotion_classifier(text)[0]
-
-            # Create a dictionary to store scores
-            score_dict = {}
-
-            # Iterating over the data and storing scores in dictionary
-            for d in data:
-                score_dict[d['label']] = d['score']
-
-            self.emotion_scores = score_dict
-            _logger.info(
-                "\nSentence: {text}\nJoy score: {joy_score} Surprise score: {surprise_score}",
-                text=text,
-                joy_score=self.emotion_scores.get('joy', 0),
-                surprise_score=self.emotion_scores.get('surprise', 0)
-            )
-
-        else:
-            self.emotion_scores = {}
-            _logger.info("\nSentence: {text}\nNo emotion detected", text=text)
-
-        super().send_to_component(emotion_scores=self.emotion_scores)
+        if base_keys.AUDIO_TRANSCRIPTION_DATA not in raw_data:
+            # partial hypothesis of the streaming transcription, the words are classified once they are final
+            return
+
+        if self.transcript_batcher:
+            self.transcript_batcher.add(raw_data)
+            return
+
+        self._analyse_batch([raw_data])
+
+    def classify(self, texts):
+        '''
+        :param texts: list of non-empty transcripts
+        :return: list of dict of the emotion scores of the transcripts, from the cache if possible
+        '''
+        # each transcript is looked up and classified once, even if it is repeated in the batch
+        scores = {}
+        for text in texts:
+            key = self.score_cache.get_key(text)
+            if key not in scores:
+                scores[key] = self.score_cache.get(key)
+
+        uncached_texts = [key for key, key_scores in scores.items() if key_scores is None]
+        if uncached_texts:
+            results = self.emotion_classifier(uncached_texts, batch_size=len(uncached_texts))
+            for text, result in zip(uncached_texts, results):
+                scores[text] = {d['label']: d['score'] for d in result}
+                self.score_cache.put(text, scores[text])
+
+        # a copy for each transcript, as the consumers may update the scores
+        return [dict(scores[self.score_cache.get_key(text)]) for text in texts]
+
+    def _analyse_batch(self, batch):
+        texts = [raw_data[base_keys.AUDIO_TRANSCRIPTION_DATA] for raw_data in batch]
+        scores = iter(self.classify([text for text in texts if text != ""]))
+
+        for text in texts:
+            if text != "":
+                self.emotion_scores = next(scores)
+                _logger.info(
+                    "\nSentence: {text}\nJoy score: {joy_score} Surprise score: {surprise_score}",
+                    text=text,
+                    joy_score=self.emotion_scores.get('joy', 0),
+                    surprise_score=self.emotion_scores.get('surprise', 0)
+                )
+
+            else:
+                self.emotion_scores = {}
+                _logger.info("\nSentence: {text}\nNo emotion detected", text=text)
+
+            super().send_to_component(emotion_scores=self.emotion_scores)
+
+
+def load_emotion_pipeline(model, backend=BACKEND_PIPELINE):
+    '''
+    :param model: name of the HuggingFace model, or path of an exported model
+    :param backend: BACKEND_PIPELINE (the model as is), BACKEND_INT8 (the linear layers quantized to int8 for a lower
+        latency on CPUs) or BACKEND_ONNX (exported to ONNX if needed, run with onnxruntime)
+    :return: text classification pipeline which returns the scores of all the labels
+    '''
+    if backend == BACKEND_PIPELINE:
+        return pipeline("text-classification", model=model, top_k=None)
+
+    if backend == BACKEND_INT8:
+        classification_model = torch.quantization.quantize_dynamic(
+            AutoModelForSequenceClassification.from_pretrained(model), {torch.nn.Linear}, dtype=torch.qint8)
+    elif backend == BACKEND_ONNX:
+        # optional dependency, only needed for the ONNX backend
+        from optimum.onnxruntime import ORTModelForSequenceClassification  # pylint: disable=import-outside-toplevel
+
+        try:
+            classification_model = ORTModelForSequenceClassification.from_pretrained(model)
+        except (OSError, ValueError):
+            # not exported yet, e.g., the name of the HuggingFace model
+            _logger.info("Exporting {model} to ONNX", model=model)
+            classification_model = ORTModelForSequenceClassification.from_pretrained(model, export=True)
+    else:
+        raise ValueError(f"Unsupported emotion classifier backend: {backend}, must be one of "
+                         f"{[BACKEND_PIPELINE, BACKEND_INT8, BACKEND_ONNX]}")
+
+    return pipeline("text-classification", model=classification_model, tokenizer=AutoTokenizer.from_pretrained(model),
+                    top_k=None)
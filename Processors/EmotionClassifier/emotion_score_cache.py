@@ -0,0 +1,56 @@
+import threading
+from collections import OrderedDict
+
+from Utilities import metrics_utility
+
+METRIC_HITS = "emotion_classifier.cache_hits"
+METRIC_MISSES = "emotion_classifier.cache_misses"
+
+
+class EmotionScoreCache:
+    """
+    An LRU cache of the emotion scores by transcript, as short utterances (e.g., "Yes.", "Okay.") are repeated often.
+
+    The model is sensitive to the case and the punctuation, so only the whitespace of the transcripts is normalized.
+    """
+
+    def __init__(self, max_entries=256):
+        '''
+        :param max_entries: maximum number of cached transcripts, 0 to disable the cache
+        '''
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(text):
+        return " ".join(text.split())
+
+    def get(self, text):
+        '''
+        :return: dict of the emotion scores, None if not cached
+        '''
+        key = self.get_key(text)
+        with self._lock:
+            scores = self._entries.get(key)
+            if scores is not None:
+                self._entries.move_to_end(key)
+
+        metrics_utility.increment_counter(METRIC_HITS if scores is not None else METRIC_MISSES)
+        # a copy, as the consumers may update the scores
+        return dict(scores) if scores is not None else None
+
+    def put(self, text, scores):
+        if self.max_entries <= 0:
+            return
+
+        key = self.get_key(text)
+        with self._lock:
+            self._entries[key] = dict(scores)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
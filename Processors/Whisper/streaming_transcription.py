@@ -0,0 +1,217 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from Utilities import metrics_utility
+
+METRIC_FIRST_WORD = "whisper.streaming.first_word"  # time from the start of a segment to its first committed word
+METRIC_PARTIAL_TRANSCRIPTION = "whisper.streaming.partial_transcription"
+
+_SAMPLE_RATE = 16000
+# length of the frames of the voice activity detection
+_VAD_FRAME_MS = 30
+
+
+@dataclass
+class TranscriptionUpdate:
+    """
+    The transcription of a segment (i.e., speech between pauses) after new audio has arrived
+    """
+    # hypothesis of the whole segment so far, the words after the committed ones may still change
+    partial_text: str = ""
+    # words committed by this update, which will not change anymore
+    committed_text: str = ""
+    # True if the segment has ended, all its words are committed
+    is_final: bool = False
+
+
+@dataclass
+class EndedSegment:
+    """
+    A segment which has ended but is not transcribed yet, see StreamingTranscription.end_if_idle
+    """
+    audio: np.ndarray
+    # words committed before the segment ended
+    committed_words: list
+    start_time: float
+
+
+class StreamingTranscription:
+    """
+    Transcribes audio incrementally as it arrives, instead of once per phrase.
+
+    The audio is segmented by an energy based voice activity detection: a segment starts at the first speech frame and
+    ends after `min_silence_ms` of silence (or at `max_segment_seconds`). As the audio source may stop sending audio
+    when the speaker pauses (instead of sending the silence), `flush_if_idle` also ends the segment when no audio has
+    arrived for `min_silence_ms` after the end of the last audio. The segment is transcribed again whenever
+    new audio arrives, and the words are committed once two consecutive hypotheses agree on them (the longest common
+    prefix), so the beginning of a sentence is final well before the speaker pauses.
+    """
+
+    def __init__(self, transcribe, vad_energy_threshold=0.01, min_silence_ms=600, max_segment_seconds=20,
+                 sample_rate=_SAMPLE_RATE):
+        '''
+        :param transcribe: function which returns the text of a numpy float32 array of audio samples
+        :param vad_energy_threshold: minimum RMS of a speech frame, for samples in [-1, 1]
+        :param min_silence_ms: silence which ends a segment
+        :param max_segment_seconds: maximum length of a segment, it is ended even without a pause
+        :param sample_rate: sample rate of the audio
+        '''
+        self.transcribe = transcribe
+        self.vad_energy_threshold = vad_energy_threshold
+        self.sample_rate = sample_rate
+        self.frame_length = sample_rate * _VAD_FRAME_MS // 1000
+        self.min_silence_samples = sample_rate * min_silence_ms // 1000
+        self.min_silence_seconds = min_silence_ms / 1000
+        self.max_segment_samples = int(sample_rate * max_segment_seconds)
+
+        # audio of the current segment, preallocated for the longest segment
+        self._segment = np.empty(self.max_segment_samples, dtype=np.float32)
+        self._segment_length = 0
+        self._silence_samples = 0
+        self._segment_start_time = None
+        # wall-clock time after which the segment is ended if no audio arrives
+        self._idle_deadline = None
+        self._committed_words = []
+        self._previous_words = []
+
+    def add_audio(self, samples):
+        '''
+        :param samples: numpy float32 array of the new audio samples
+        :return: TranscriptionUpdate, None if there is no segment (i.e., only silence)
+        '''
+        # the next audio is expected when the new audio has been recorded, i.e., its duration after its arrival
+        self._idle_deadline = time.perf_counter() + len(samples) / self.sample_rate + self.min_silence_seconds
+        is_speech = self._detect_speech(samples)
+        if self._segment_length == 0:
+            if not is_speech.any():
+                return None
+            # start the segment at the first speech frame
+            first_speech = int(np.argmax(is_speech)) * self.frame_length
+            samples = samples[first_speech:]
+            is_speech = is_speech[int(np.argmax(is_speech)):]
+            self._segment_start_time = time.perf_counter()
+
+        # the silence at the end of the segment, including the previous audio if there is no speech in the new audio
+        if is_speech.any():
+            last_speech = len(is_speech) - 1 - int(np.argmax(is_speech[::-1]))
+            self._silence_samples = max(len(samples) - (last_speech + 1) * self.frame_length, 0)
+        else:
+            self._silence_samples += len(samples)
+
+        num_samples = min(len(samples), self.max_segment_samples - self._segment_length)
+        self._segment[self._segment_length:self._segment_length + num_samples] = samples[:num_samples]
+        self._segment_length += num_samples
+
+        if self._silence_samples >= self.min_silence_samples or self._segment_length >= self.max_segment_samples:
+            update = self._finalize()
+            # the speech continues in the next segment
+            rest = samples[num_samples:num_samples + self.max_segment_samples]
+            if len(rest) > 0:
+                self._segment[:len(rest)] = rest
+                self._segment_length = len(rest)
+                self._segment_start_time = time.perf_counter()
+            return update
+
+        with metrics_utility.measure_latency(METRIC_PARTIAL_TRANSCRIPTION):
+            words = self.transcribe(self._segment[:self._segment_length]).split()
+
+        # words agreed by the previous and the current hypotheses are stable
+        num_stable_words = 0
+        for previous_word, word in zip(self._previous_words, words):
+            if previous_word != word:
+                break
+            num_stable_words += 1
+        self._previous_words = words
+
+        committed_words = self._commit(words[len(self._committed_words):num_stable_words])
+
+        return TranscriptionUpdate(partial_text=" ".join(self._committed_words + words[len(self._committed_words):]),
+                                   committed_text=" ".join(committed_words))
+
+    def flush(self):
+        '''
+        End the current segment, e.g., when the audio stream stops
+
+        :return: TranscriptionUpdate, None if there is no segment
+        '''
+        if self._segment_length == 0:
+            return None
+        return self._finalize()
+
+    def flush_if_idle(self, now=None):
+        '''
+        End the current segment if no audio has arrived for `min_silence_ms` after the end of the last audio, e.g., when
+        the audio source stops sending audio at the end of a phrase
+
+        :param now: time.perf_counter() time, default to the current time
+        :return: TranscriptionUpdate, None if there is no segment or it is not idle
+        '''
+        segment = self.end_if_idle(now)
+        if segment is None:
+            return None
+        return self.transcribe_segment(segment)
+
+    def end_if_idle(self, now=None):
+        '''
+        Same as flush_if_idle, but the ended segment is returned without transcribing it, so it can be transcribed by
+        transcribe_segment while new audio is added (e.g., outside of a lock shared with add_audio)
+
+        :param now: time.perf_counter() time, default to the current time
+        :return: EndedSegment (with a copy of the audio), None if there is no segment or it is not idle
+        '''
+        if self._segment_length == 0:
+            return None
+        if (time.perf_counter() if now is None else now) < self._idle_deadline:
+            return None
+        return self._end_segment(self._segment[:self._segment_length].copy())
+
+    def transcribe_segment(self, segment):
+        '''
+        :param segment: EndedSegment
+        :return: final TranscriptionUpdate of the segment
+        '''
+        words = self.transcribe(segment.audio).split()
+        # the committed words are kept, even if the final hypothesis differs
+        committed_words = words[len(segment.committed_words):]
+        if committed_words and not segment.committed_words:
+            _record_first_word(segment.start_time)
+
+        return TranscriptionUpdate(partial_text=" ".join(segment.committed_words + committed_words),
+                                   committed_text=" ".join(committed_words), is_final=True)
+
+    def _finalize(self):
+        # the audio is transcribed before the next segment is written to the buffer
+        return self.transcribe_segment(self._end_segment(self._segment[:self._segment_length]))
+
+    def _end_segment(self, audio):
+        segment = EndedSegment(audio=audio, committed_words=self._committed_words,
+                               start_time=self._segment_start_time)
+
+        self._segment_length = 0
+        self._silence_samples = 0
+        self._committed_words = []
+        self._previous_words = []
+
+        return segment
+
+    def _commit(self, words):
+        if words and not self._committed_words:
+            _record_first_word(self._segment_start_time)
+        self._committed_words.extend(words)
+        return words
+
+    def _detect_speech(self, samples):
+        '''
+        :return: numpy bool array, True for the frames with speech (the last frame may be shorter)
+        '''
+        num_frames = -(-len(samples) // self.frame_length)
+        padded = np.zeros(num_frames * self.frame_length, dtype=np.float32)
+        padded[:len(samples)] = samples
+        frames = padded.reshape(num_frames, self.frame_length)
+        return np.sqrt(np.mean(frames * frames, axis=1)) > self.vad_energy_threshold
+
+
+def _record_first_word(segment_start_time):
+    metrics_utility.record_latency_ms(METRIC_FIRST_WORD, metrics_utility.get_elapsed_ms(segment_start_time))
@@ -1,50 +1,145 @@
 # reference: https://github.com/Synteraction-Lab/PANDALens/blob/main/src/Module/Audio/live_transcriber.py
-from tempfile import NamedTemporaryFile
+import threading
+import time
 
+import numpy as np
 import torch
 import whisper
 import base_keys
 from base_component import BaseComponent
+from Processors.Whisper.streaming_transcription import StreamingTranscription
 
-from Utilities import environment_utility, logging_utility
+from Utilities import audio_utility, config_utility, environment_utility, logging_utility
 
 _WHISPER_TRANSCRIPTION_MODEL = environment_utility.get_env_string("WHISPER_TRANSCRIPTION_MODEL")
 
+# Options of the component in the configuration file, e.g.,
+#   options:
+#     streaming: true  # transcribe the audio incrementally, see StreamingTranscription
+#     vad_energy_threshold: 0.01  # minimum RMS of speech, for samples in [-1, 1]
+#     min_silence_ms: 600  # silence (or no audio) which ends a segment
+#     max_segment_seconds: 20
+CONFIG_STREAMING_KEY = "streaming"
+CONFIG_VAD_ENERGY_THRESHOLD_KEY = "vad_energy_threshold"
+CONFIG_MIN_SILENCE_MS_KEY = "min_silence_ms"
+CONFIG_MAX_SEGMENT_SECONDS_KEY = "max_segment_seconds"
+
+_DEFAULT_VAD_ENERGY_THRESHOLD = 0.01
+_DEFAULT_MIN_SILENCE_MS = 600
+_DEFAULT_MAX_SEGMENT_SECONDS = 20
+
+# interval of the checks for the end of a segment when no audio arrives
+_IDLE_CHECK_SECONDS = 0.1
+
+# initial size of the decoded audio buffer, which grows to the longest utterance
+_AUDIO_BUFFER_SECONDS = 30
+
 _logger = logging_utility.setup_logger(__name__)
 
 
 class Transcriber(BaseComponent):
     """
     This component transcribes audio data into text using a Whisper model.
+
+    If `streaming` is configured, the audio is transcribed incrementally as it arrives (use a short `chunk_seconds` for
+    the audio widget): the partial hypotheses are sent as audio_transcript_partial, and the words are sent as
+    audio_transcript once they are stable, instead of the whole phrase after the speaker pauses.
     """
 
     def __init__(self, name):
         super().__init__(name)
         super().set_component_status(base_keys.COMPONENT_NOT_STARTED_STATUS)
-        with NamedTemporaryFile(delete=False) as temp_file:
-            self.temp_file = temp_file.name
+        # the audio is decoded in memory to Whisper's sample rate (16 kHz), reusing the buffer for each utterance
+        self.audio_buffer = np.empty(_AUDIO_BUFFER_SECONDS * whisper.audio.SAMPLE_RATE, dtype=np.float32)
         self.transcription_model = _WHISPER_TRANSCRIPTION_MODEL
         self.audio_model = whisper.load_model(self.transcription_model)
+        # the model is used by the received audio and by the idle check thread, one transcription at a time
+        self.audio_model_lock = threading.Lock()
+
+        options = config_utility.get_channel_options(name)
+        self.streaming_transcription = None
+        # the streaming transcription is updated by the received audio and by the idle check thread (which transcribes
+        # the ended segments outside of the lock)
+        self.streaming_lock = threading.Lock()
+        if options.get(CONFIG_STREAMING_KEY, False):
+            self.streaming_transcription = StreamingTranscription(
+                self.transcribe,
+                vad_energy_threshold=float(options.get(CONFIG_VAD_ENERGY_THRESHOLD_KEY, _DEFAULT_VAD_ENERGY_THRESHOLD)),
+                min_silence_ms=int(options.get(CONFIG_MIN_SILENCE_MS_KEY, _DEFAULT_MIN_SILENCE_MS)),
+                max_segment_seconds=float(options.get(CONFIG_MAX_SEGMENT_SECONDS_KEY, _DEFAULT_MAX_SEGMENT_SECONDS)),
+                sample_rate=whisper.audio.SAMPLE_RATE)
 
     def to_text(self, raw_data):
         '''
         Sends one key-value data pair to the next component:
         1. audio_transcript: The transcribed text from the audio data in string format
+
+        In the streaming mode, it sends the newly committed words (if any) as audio_transcript, then the hypothesis
+        of the current segment as audio_transcript_partial (in a separate message).
         '''
         if super().get_component_status() != base_keys.COMPONENT_IS_RUNNING_STATUS:
             super().set_component_status(base_keys.COMPONENT_IS_RUNNING_STATUS)
+            if self.streaming_transcription:
+                # the audio widget does not send the silence after a phrase, so the segment is ended by the wall-clock
+                # gap, until the component stops
+                threading.Thread(target=self._flush_idle_segments, daemon=True).start()
 
-        wav_data = raw_data[base_keys.AUDIO_DATA]
-        wav_data.seek(0)  # reset the pointer back to the beginning
-        with open(self.temp_file, "w+b") as f:
-            f.write(wav_data.read())
+        audio = self.decode_audio(raw_data)
 
-        # no_speech_threshold: The threshold for the probability of the presence of no speech in the audio. If no speech is detected, the model will return an empty string.
-        # logprob_threshold: "if the average log probability over sampled tokens is below this value, treat as failed" from source code
-        result = self.audio_model.transcribe(self.temp_file, fp16=torch.cuda.is_available(),
-                                             no_speech_threshold=0.2,
-                                             logprob_threshold=None, )
-        text = result['text'].strip()
+        if self.streaming_transcription:
+            with self.streaming_lock:
+                self._send_update(self.streaming_transcription.add_audio(audio))
+            return
+
+        text = self.transcribe(audio)
         _logger.info("\nTranscribed sentence: {text}", text=text)
 
         super().send_to_component(audio_transcript=text)
+
+    def transcribe(self, audio):
+        '''
+        :param audio: numpy float32 array of the mono samples at 16 kHz
+        :return: transcribed text
+        '''
+        # no_speech_threshold: The threshold for the probability of the presence of no speech in the audio. If no speech is detected, the model will return an empty string.
+        # logprob_threshold: "if the average log probability over sampled tokens is below this value, treat as failed" from source code
+        with self.audio_model_lock:
+            result = self.audio_model.transcribe(audio, fp16=torch.cuda.is_available(),
+                                                 no_speech_threshold=0.2,
+                                                 logprob_threshold=None, )
+        return result['text'].strip()
+
+    def decode_audio(self, raw_data):
+        '''
+        :param raw_data: message of the audio frontend (audio_samples) or of the audio widget (audio_pcm or audio_data)
+        :return: numpy float32 array of the mono samples at 16 kHz, valid until the next call (it may be a view of the
+            audio buffer)
+        '''
+        if base_keys.AUDIO_SAMPLES_DATA in raw_data:
+            # already decoded by the audio frontend, shared with the other processors
+            return audio_utility.get_audio_samples(raw_data, whisper.audio.SAMPLE_RATE)
+
+        samples, sample_rate = audio_utility.decode_audio_data(raw_data, out=self.audio_buffer)
+        if len(samples) > len(self.audio_buffer):
+            self.audio_buffer = samples
+
+        return audio_utility.resample(samples, sample_rate, whisper.audio.SAMPLE_RATE)
+
+    def _flush_idle_segments(self):
+        while super().get_component_status() == base_keys.COMPONENT_IS_RUNNING_STATUS:
+            time.sleep(_IDLE_CHECK_SECONDS)
+            with self.streaming_lock:
+                segment = self.streaming_transcription.end_if_idle()
+            # the final transcription does not block the new audio (which starts the next segment)
+            if segment is not None:
+                self._send_update(self.streaming_transcription.transcribe_segment(segment))
+
+    def _send_update(self, update):
+        if update is None:
+            return
+
+        # the committed words first, so the consumers of the final text (e.g., memory assistance) get them early
+        if update.committed_text:
+            _logger.info("\nTranscribed words: {text}", text=update.committed_text)
+            super().send_to_component(audio_transcript=update.committed_text)
+        super().send_to_component(audio_transcript_partial=update.partial_text)
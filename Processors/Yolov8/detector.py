@@ -1,6 +1,18 @@
 import base_keys
 from base_component import BaseComponent
 from Processors.Yolov8.video_detection import VideoDetection as video_detector
+from Utilities import config_utility
+from Utilities.batcher import Batcher
+
+# Options of the component in the configuration file, e.g.,
+#   options:
+#     batch_size: 4  # set 1 to disable batching
+#     batch_timeout_ms: 30
+CONFIG_BATCH_SIZE_KEY = "batch_size"
+CONFIG_BATCH_TIMEOUT_MS_KEY = "batch_timeout_ms"
+
+_DEFAULT_BATCH_SIZE = 1
+_DEFAULT_BATCH_TIMEOUT_MS = 30
 
 
 class Yolov8Detector(BaseComponent):
@@ -11,6 +23,9 @@ class Yolov8Detector(BaseComponent):
     3. class_labels : The class labels of detected objects in the raw camera frame
     4. base_data : The data sent through by the previous component (camera_widget) to this component, includes the raw
         camera frame as well as frame details
+
+    If `batch_size` > 1 is configured, frames (from one or more camera widgets) are collected and run as a single
+    batched inference, then the results are sent for each frame with its original base_data.
     """
     writer = None
 
@@ -19,9 +34,22 @@ class Yolov8Detector(BaseComponent):
 
         self.detector = video_detector()
 
+        options = config_utility.get_channel_options(name)
+        batch_size = int(options.get(CONFIG_BATCH_SIZE_KEY, _DEFAULT_BATCH_SIZE))
+        batch_timeout_ms = float(options.get(CONFIG_BATCH_TIMEOUT_MS_KEY, _DEFAULT_BATCH_TIMEOUT_MS))
+
+        self.frame_batcher = None
+        if batch_size > 1:
+            self.frame_batcher = Batcher(self._run_batch, max_batch_size=batch_size, max_wait_ms=batch_timeout_ms,
+                                         name="yolov8").start()
+
     def run(self, raw_data):
         super().set_component_status(base_keys.COMPONENT_IS_RUNNING_STATUS)
 
+        if self.frame_batcher:
+            self.frame_batcher.add(raw_data)
+            return
+
         frame = raw_data[base_keys.CAMERA_FRAME]
         yolo_frame = self.detector.run(frame)
 
@@ -29,3 +57,13 @@ class Yolov8Detector(BaseComponent):
                                   yolo_frame=yolo_frame,
                                   class_labels=self.detector.get_class_labels(),
                                   base_data=raw_data)
+
+    def _run_batch(self, batch):
+        frames = [raw_data[base_keys.CAMERA_FRAME] for raw_data in batch]
+        outputs = self.detector.run_batch(frames)
+
+        for raw_data, (yolo_frame, last_detection) in zip(batch, outputs):
+            super().send_to_component(last_detection=last_detection,
+                                      yolo_frame=yolo_frame,
+                                      class_labels=self.detector.get_class_labels(),
+                                      base_data=raw_data)
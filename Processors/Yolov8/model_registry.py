@@ -0,0 +1,71 @@
+import threading
+import time
+
+import numpy as np
+from ultralytics import YOLO
+
+from Utilities import logging_utility, metrics_utility
+
+METRIC_MODEL_LOAD = "yolov8.model_load"
+METRIC_MODEL_WARMUP = "yolov8.model_warmup"
+
+_WARMUP_FRAME_SIZE = 640
+
+_logger = logging_utility.setup_logger(__name__)
+
+# Process-wide registry of loaded models, {model_path: YOLO}
+_models = {}
+# the predictor of a YOLO model is not thread-safe, {model_path: lock serializing the inferences of the model}
+_inference_locks = {}
+_models_lock = threading.Lock()
+
+
+def get_model(model_path, warmup=True):
+    '''
+    Get the YOLO model of the given weight file, the model is loaded (and warmed up) only once per process and shared
+    by all the components (e.g., each Yolov8Detector) using the same weight file. The inferences of the shared model
+    must hold its lock, see get_inference_lock
+
+    :param model_path: path of the YOLO weight file (e.g., "./Processors/Yolov8/weights/model.pt")
+    :param warmup: run one inference on a blank frame after loading, so the first camera frame is not delayed
+    :return: YOLO model
+    '''
+    with _models_lock:
+        if model_path not in _models:
+            _models[model_path] = _load_model(model_path, warmup)
+            _inference_locks.setdefault(model_path, threading.Lock())
+
+        return _models[model_path]
+
+
+def get_inference_lock(model_path):
+    '''
+    :return: lock to hold while running an inference of the model of the weight file, as the model is shared by the
+        detector threads and its predictor is not thread-safe
+    '''
+    with _models_lock:
+        return _inference_locks.setdefault(model_path, threading.Lock())
+
+
+def clear_models():
+    with _models_lock:
+        _models.clear()
+        _inference_locks.clear()
+
+
+def _load_model(model_path, warmup):
+    start_time = time.perf_counter()
+    model = YOLO(model_path)
+    load_ms = metrics_utility.get_elapsed_ms(start_time)
+    metrics_utility.record_latency_ms(METRIC_MODEL_LOAD, load_ms)
+    _logger.info("Loaded YOLO model: {model_path}, {load_ms:.1f} ms", model_path=model_path, load_ms=load_ms)
+
+    if warmup:
+        start_time = time.perf_counter()
+        model(np.zeros((_WARMUP_FRAME_SIZE, _WARMUP_FRAME_SIZE, 3), dtype=np.uint8), verbose=False)
+        warmup_ms = metrics_utility.get_elapsed_ms(start_time)
+        metrics_utility.record_latency_ms(METRIC_MODEL_WARMUP, warmup_ms)
+        _logger.info("Warmed up YOLO model: {model_path}, {warmup_ms:.1f} ms", model_path=model_path,
+                     warmup_ms=warmup_ms)
+
+    return model
@@ -1,8 +1,8 @@
 import supervision as sv
-from ultralytics import YOLO
 import numpy as np
 
-from Utilities import environment_utility
+from Utilities import environment_utility, metrics_utility
+from . import model_registry
 from .object_detection_counter import ObjectDetectionCounter
 
 _YOLO_MODEL = environment_utility.get_env_string("YOLO_MODEL")
@@ -13,6 +13,9 @@ _YOLO_VERBOSE = environment_utility.get_env_bool("YOLO_VERBOSE")
 
 _YOLO_OBJECT_DETECTION_COUNTER_DURATION = 0
 
+METRIC_FRAME_LATENCY = "yolov8.frame"
+METRIC_BATCH_LATENCY = "yolov8.batch"
+
 
 class VideoDetection:
     """
@@ -41,8 +44,19 @@ class VideoDetection:
         else:
             self.object_detection_counter = None
 
+        # the model is loaded and warmed up once per process, and shared by all instances using the same weights
+        self.yolo_model = model_registry.get_model(self.model)
+        self.inference_lock = model_registry.get_inference_lock(self.model)
+
+        # customize the bounding box
+        self.box_annotator = sv.BoxAnnotator(
+            thickness=2,
+            text_thickness=2,
+            text_scale=1
+        )
+
         self.last_detection = None
-        self.class_labels = None
+        self.class_labels = self.yolo_model.model.names
 
     def get_detect_object_percentage(self):
         if self.object_detection_counter:
@@ -51,24 +65,36 @@ class VideoDetection:
         return None
 
     def run(self, frame):
-        # specify the model
-        model = YOLO(self.model)
+        with metrics_utility.measure_latency(METRIC_FRAME_LATENCY):
+            #  iou=0.45, max_det=50, verbose=False
+            with self.inference_lock:
+                result = self.yolo_model(frame, agnostic_nms=True, conf=self.confidenceLevel,
+                                         verbose=self.verbose)[0]
 
-        # customize the bounding box
-        box_annotator = sv.BoxAnnotator(
-            thickness=2,
-            text_thickness=2,
-            text_scale=1
-        )
+            return self.process_result(frame, result)
 
-        #  iou=0.45, max_det=50, verbose=False
-        result = model(frame, agnostic_nms=True, conf=self.confidenceLevel, verbose=self.verbose)[0]
+    def run_batch(self, frames):
+        '''
+        Run a single (batched) inference on multiple frames
 
+        :param frames: list of frames, which may come from different sources
+        :return: list of (annotated frame, last detection) in the same order as the frames
+        '''
+        with metrics_utility.measure_latency(METRIC_BATCH_LATENCY):
+            with self.inference_lock:
+                results = self.yolo_model(frames, agnostic_nms=True, conf=self.confidenceLevel, verbose=self.verbose)
+
+            outputs = []
+            for frame, result in zip(frames, results):
+                yolo_frame = self.process_result(frame, result)
+                outputs.append((yolo_frame, self.get_last_detection()))
+
+            return outputs
+
+    def process_result(self, frame, result):
         # [[bounding_boxes, mask, confidence, class_id, tracker_id]
         detections = sv.Detections.from_yolov8(result)
 
-        self.class_labels = model.model.names
-
         if self.detection_region is not None:
             detections = self.get_detection_in_region(detections, self.detection_region)
 
@@ -76,7 +102,7 @@ class VideoDetection:
             labels = [f'{self.class_labels[class_id]} {confidence:0.2f}' for _, _, confidence, class_id, _ in
                       detections]
 
-            frame = box_annotator.annotate(scene=frame, detections=detections, labels=labels)
+            frame = self.box_annotator.annotate(scene=frame, detections=detections, labels=labels)
 
         if self.object_detection_counter:
             self.object_detection_counter.infer_counting(detections, self.class_labels)
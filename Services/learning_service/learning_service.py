@@ -57,8 +57,7 @@ class LearningService(BaseComponent):
         if origin == base_keys.WEBSOCKET_WIDGET:
             datatype = raw_data[base_keys.WEBSOCKET_DATATYPE]
             data = raw_data[base_keys.WEBSOCKET_MESSAGE]
-            # FIXME: remove this conversion once all components are using protobuf and use object values
-            data = datatypes_helper.convert_json_to_protobuf(datatype, data)
+            data = datatypes_helper.get_protobuf_message(datatype, data)
             _logger.debug("Learning Service: {datatype}", datatype=datatype)
             self._handle_websocket_data(datatype, data)
 
@@ -75,7 +74,7 @@ class LearningService(BaseComponent):
         super().send_to_component(websocket_message=websocket_highlight_point_data)
 
     def _handle_camera_data(self, raw_data):
-        super().set_memory_data(base_keys.CAMERA_FRAME, raw_data[base_keys.CAMERA_FRAME])
+        super().set_latest_frame(raw_data[base_keys.CAMERA_FRAME])
         super().set_memory_data(base_keys.CAMERA_FRAME_WIDTH, raw_data[base_keys.CAMERA_FRAME_WIDTH])
         super().set_memory_data(base_keys.CAMERA_FRAME_HEIGHT, raw_data[base_keys.CAMERA_FRAME_HEIGHT])
 
@@ -178,7 +177,7 @@ class LearningService(BaseComponent):
 
     # gaze/gesture interaction
     def _handle_point_select(self, point_data):
-        frame = super().get_memory_data(base_keys.CAMERA_FRAME)
+        frame = super().get_latest_frame(copy=True)
 
         # notify the selection
         self._send_websocket_highlight_point_data(point_data.world_x, point_data.world_y, point_data.world_z)
@@ -198,7 +197,7 @@ class LearningService(BaseComponent):
             frame = None
             # add the image frame if the voice contains reference words
             if self._contains_reference_words(voice):
-                frame = super().get_memory_data(base_keys.CAMERA_FRAME)
+                frame = super().get_latest_frame(copy=True)
 
             self._send_learning_data(voice, False, frame)
 
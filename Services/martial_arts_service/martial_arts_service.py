@@ -64,8 +64,7 @@ class MartialArtsService(BaseComponent):
             datatype = raw_data[WEBSOCKET_DATATYPE]
             data = raw_data[WEBSOCKET_MESSAGE]
 
-            # FIXME: remove this conversion once all components are using protobuf and use object values?
-            data = datatypes_helper.convert_json_to_protobuf(datatype, data)
+            data = datatypes_helper.get_protobuf_message(datatype, data)
             self._handle_websocket_data(datatype, data)
 
     def _handle_websocket_data(self, socket_data_type, decoded_data) -> None:
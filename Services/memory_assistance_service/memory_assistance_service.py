@@ -64,7 +64,8 @@ class MemoryAssistanceService(BaseComponent):
         if origin == base_keys.CAMERA_WIDGET:  # image memory upload
             self._handle_camera_data(raw_data)
 
-        if origin == base_keys.WHISPER_PROCESSOR:  # assume audio transcription is received
+        # assume audio transcription is received, the partial hypotheses of the streaming transcription are skipped
+        if origin == base_keys.WHISPER_PROCESSOR and base_keys.AUDIO_TRANSCRIPTION_DATA in raw_data:
             self._handle_speech_data(raw_data[base_keys.AUDIO_TRANSCRIPTION_DATA])
 
         if origin == base_keys.WEBSOCKET_WIDGET:  # assume text is received
@@ -141,7 +142,7 @@ class MemoryAssistanceService(BaseComponent):
     def _handle_websocket_data(self, datatype, data) -> None:
         # Decode and process WebSocket data
         _logger.debug("Memory Service: {datatype}", datatype=datatype)
-        decoded_data = datatypes_helper.convert_json_to_protobuf(datatype, data)
+        decoded_data = datatypes_helper.get_protobuf_message(datatype, data)
         if datatype == memory_keys.SPEECH_INPUT_DATA:
             voice = decoded_data.voice
             self._handle_speech_data(voice)
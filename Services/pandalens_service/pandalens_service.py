@@ -51,11 +51,11 @@ class PandaLensService(BaseComponent):
         if origin == base_keys.WEBSOCKET_WIDGET:
             datatype = raw_data[base_keys.WEBSOCKET_DATATYPE]
             data = raw_data[base_keys.WEBSOCKET_MESSAGE]
-            data = datatypes_helper.convert_json_to_protobuf(datatype, data)
+            data = datatypes_helper.get_protobuf_message(datatype, data)
             self._handle_websocket_data(datatype, data)
 
     def _store_camera_data_in_memory(self, raw_data):
-        super().set_memory_data(base_keys.CAMERA_FRAME, raw_data[base_keys.CAMERA_FRAME])
+        super().set_latest_frame(raw_data[base_keys.CAMERA_FRAME])
         super().set_memory_data(base_keys.CAMERA_FRAME_WIDTH, raw_data[base_keys.CAMERA_FRAME_WIDTH])
         super().set_memory_data(base_keys.CAMERA_FRAME_HEIGHT, raw_data[base_keys.CAMERA_FRAME_HEIGHT])
 
@@ -186,7 +186,7 @@ class PandaLensService(BaseComponent):
         self._send_websocket_pandalens_reset("Blog has been generated and saved in the cloud!")
 
     def _get_latest_frame_from_memory(self):
-        frame = super().get_memory_data(base_keys.CAMERA_FRAME)
+        frame = super().get_latest_frame(copy=True)
         frame_width = super().get_memory_data(base_keys.CAMERA_FRAME_WIDTH)
         frame_height = super().get_memory_data(base_keys.CAMERA_FRAME_HEIGHT)
 
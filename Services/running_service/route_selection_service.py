@@ -1,7 +1,9 @@
 import asyncio
 import threading
 
-from APIs.maps.maps import generate_random_routes
+from APIs.maps.maps import generate_random_routes, run_map_request
+from APIs.maps.maps_config import RouteGenerationState
+from Services.running_service import running_session
 from Services.running_service.running_current_data import RunningCurrentData
 from Services.running_service.running_data_handler import (
     build_direction_data,
@@ -67,6 +69,8 @@ class RouteSelectionService(BaseComponent):
         self.wait_for_chosen_route_interval = 1  # sec
         # delay interval for retry when no routes could be generated
         self.retry_generating_routes_interval = 5  # sec
+        # max number of attempts to generate routes, the generation is also bounded by the map request timeout
+        self.max_generating_routes_attempts = 3
 
     def run(self, running_service, socket_data_type, decoded_data, is_demo):
         # is_demo is to check if the service is running from demo config
@@ -81,6 +85,9 @@ class RouteSelectionService(BaseComponent):
             # if no data is received from the watch, it defaults to (0.0, 0.0)
             # actual location cant be (0.0, 0.0) as that is in the middle of the ocean.
             while RunningCurrentData.curr_lat == 0 and RunningCurrentData.curr_lng == 0:
+                if super().get_component_status() != COMPONENT_IS_RUNNING_STATUS:
+                    # e.g., the session is removed
+                    return
                 _logger.info(INFO_WAIT_CURRENT_LOCATION)
                 output_data = build_direction_data(
                     curr_instr=MESSAGE_LOCATION_NOT_AVAILABLE
@@ -95,8 +102,9 @@ class RouteSelectionService(BaseComponent):
                 return
 
             threading.Thread(
-                target=self.get_random_route,
-                args=(DistanceTrainingParams.target_distance, is_demo),
+                target=running_session.run_in_session,
+                args=(running_session.get_current_session(), self.get_random_route,
+                      DistanceTrainingParams.target_distance, is_demo),
                 daemon=True,
             ).start()
 
@@ -126,27 +134,41 @@ class RouteSelectionService(BaseComponent):
 
     def get_random_route(self, training_distance, is_demo):
         # wait for route request first
-        while not BaseParams.is_item_in_queue(REQUEST_RANDOM_ROUTES_DATA):
-            _logger.info(INFO_WAIT_FOR_ROUTE_REQUEST)
-            time_utility.sleep_seconds(self.wait_for_route_request_interval)
-        BaseParams.request_queue.queue.remove(REQUEST_RANDOM_ROUTES_DATA)
+        if not self.wait_for_request(REQUEST_RANDOM_ROUTES_DATA, self.wait_for_route_request_interval,
+                                     INFO_WAIT_FOR_ROUTE_REQUEST):
+            return
         _logger.info(INFO_GENERATING_ROUTES)
         self.send_random_routes(training_distance)
 
         # wait for choice by user
-        while not BaseParams.is_item_in_queue(REQUEST_CHOSEN_ROUTE_DATA):
-            _logger.info(INFO_WAIT_FOR_CHOSEN_ROUTE)
-            time_utility.sleep_seconds(self.wait_for_chosen_route_interval)
-        BaseParams.request_queue.queue.remove(REQUEST_CHOSEN_ROUTE_DATA)
+        if not self.wait_for_request(REQUEST_CHOSEN_ROUTE_DATA, self.wait_for_chosen_route_interval,
+                                     INFO_WAIT_FOR_CHOSEN_ROUTE):
+            return
         self.save_random_route(BaseParams.chosen_route_id, is_demo)
 
+    def wait_for_request(self, request_datatype, interval, info_message):
+        '''
+        Wait for the request in BaseParams.request_queue and remove it
+
+        :return: True if the request is received, False if the service is stopped (e.g., the session is removed)
+        '''
+        while not BaseParams.is_item_in_queue(request_datatype):
+            if super().get_component_status() != COMPONENT_IS_RUNNING_STATUS:
+                return False
+            _logger.info(info_message)
+            time_utility.sleep_seconds(interval)
+        BaseParams.request_queue.queue.remove(request_datatype)
+        return True
+
     def send_random_routes(self, training_distance):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        self.random_routes = loop.run_until_complete(
-            self.get_random_routes(training_distance)
-        )
-        loop.close()
+        # the coroutine runs in the maps event loop, which is not bound to the session
+        try:
+            self.random_routes = run_map_request(
+                self.get_random_routes(training_distance, running_session.get_current_session()),
+                RunningServiceConfig.map_request_timeout)
+        except TimeoutError as e:
+            _logger.error("send_random_routes: {err_msg}", err_msg=str(e))
+            self.random_routes = []
 
         output_data = build_random_routes_data(self.random_routes)
         self.running_service.send_to_component(
@@ -159,28 +181,44 @@ class RouteSelectionService(BaseComponent):
             websocket_message=output_data, websocket_client_type=UNITY_CLIENT
         )
 
-    async def get_random_routes(self, training_distance):
-        generated_routes = None
+    async def get_random_routes(self, training_distance, session):
+        '''
+        :param session: RunningSession of the runner, as the coroutine runs in the maps event loop (see
+            run_map_request), which is not bound to a session
+        :return: list of RouteData, empty if no routes could be generated
+        '''
+        current_data = RunningCurrentData.get_state(session)
+        # the runners do not adjust each other's routes
+        route_state = session.get_state(RouteGenerationState)
+
         output_data = build_direction_data(curr_instr=INFO_GENERATING_ROUTES)
-        self.running_service.send_to_component(
-            websocket_message=output_data, websocket_client_type=UNITY_CLIENT
-        )
-        while super().get_component_status() == COMPONENT_IS_RUNNING_STATUS:
-            origin = [RunningCurrentData.curr_lat, RunningCurrentData.curr_lng]
+        # only to the connections of the session
+        with running_session.use_session(session):
+            self.running_service.send_to_component(
+                websocket_message=output_data, websocket_client_type=UNITY_CLIENT
+            )
+        for attempt in range(self.max_generating_routes_attempts):
+            if super().get_component_status() != COMPONENT_IS_RUNNING_STATUS:
+                break
+            if attempt > 0:
+                # do not block the shared maps event loop
+                await asyncio.sleep(self.retry_generating_routes_interval)
+
+            origin = [current_data.curr_lat, current_data.curr_lng]
             generated_routes = await generate_random_routes(
-                RunningCurrentData.start_time,
-                RunningCurrentData.bearing,
+                current_data.start_time,
+                current_data.bearing,
                 training_distance,
                 origin,
                 RunningServiceConfig.directions_option,
                 RunningServiceConfig.ors_option,
+                route_state,
             )
             if len(generated_routes) != 0:
-                break
-            time_utility.sleep_seconds(self.retry_generating_routes_interval)
-        if generated_routes is not None:
-            return generated_routes
+                return generated_routes
+
         _logger.error(ERR_GET_RANDOM_ROUTES)
+        return []
 
     def save_random_route(self, chosen_id, is_demo):
         # remove "please select a route" message
@@ -1,9 +1,10 @@
 import threading
-from shapely import LineString, Point
-from shapely.ops import nearest_points
 
-from APIs.maps.maps_util import get_direction_str, calculate_distance
-from Services.running_service import running_exceptions
+from APIs.maps.directions_cache import DirectionsCache
+from APIs.maps.maps_util import get_direction_str
+from APIs.maps.projected_polyline import ProjectedPolyline
+from APIs.maps.route_progress import RouteProgress
+from Services.running_service import running_exceptions, running_session
 from Services.running_service.running_current_data import RunningCurrentData
 from Services.running_service.running_data_handler import (
     build_direction_data,
@@ -147,6 +148,17 @@ class RunningCoachService(BaseComponent):
         # number of direction updates before recalculating new route
         self.deviation_update_threshold = 3
         self.deviation_update_count = 0
+        # cached directions, as the waypoints do not change between the direction requests
+        self.directions_cache = DirectionsCache(
+            max_entries=RunningServiceConfig.directions_cache_size,
+            ttl_seconds=RunningServiceConfig.directions_cache_ttl,
+            cell_size_m=RunningServiceConfig.directions_cache_cell_size,
+            on_route_threshold_m=RunningServiceConfig.directions_cache_on_route_threshold,
+        )
+        # route from the latest directions, to calculate the direction updates locally
+        self.route_progress = None
+        # RunningCurrentData.polyline projected to check the deviation from the route
+        self.projected_route = None
 
     def run(self, running_service, socket_data_type, decoded_data):
         if not self.running_service:
@@ -157,15 +169,18 @@ class RunningCoachService(BaseComponent):
         if result is not None:
             self.running_service.send_to_component(websocket_message=result, websocket_client_type=UNITY_CLIENT)
         if super().get_component_status() != COMPONENT_IS_RUNNING_STATUS:
+            # before the thread starts, as the training updates run while the service is running
+            super().set_component_status(COMPONENT_IS_RUNNING_STATUS)
             threading.Thread(
-                target=self.get_training_update,
+                target=running_session.run_in_session,
                 args=(
+                    running_session.get_current_session(),
+                    self.get_training_update,
                     SpeedTrainingParams.target_speed,
                     DistanceTrainingParams.target_distance,
                 ),
                 daemon=True,
             ).start()
-            super().set_component_status(COMPONENT_IS_RUNNING_STATUS)
 
     def get_exercise_data(self, socket_data_type, decoded_data):
         BaseParams.total_sec = (time_utility.get_current_millis() - self.running_coach_start_time) / 1000
@@ -194,8 +209,10 @@ class RunningCoachService(BaseComponent):
 
         elif socket_data_type == REQUEST_RUNNING_SUMMARY_DATA:
             # get the last known coordinates if not already in the list
-            if (RunningCurrentData.curr_lat, RunningCurrentData.curr_lng,) not in RunningCurrentData.coords:
-                RunningCurrentData.coords.append((RunningCurrentData.curr_lat, RunningCurrentData.curr_lng))
+            # (the coordinates are saved in order, so only the last one needs to be compared)
+            last_coords = [RunningCurrentData.curr_lat, RunningCurrentData.curr_lng]
+            if not RunningCurrentData.coords or list(RunningCurrentData.coords[-1]) != last_coords:
+                RunningCurrentData.coords.append(last_coords)
             image = get_static_maps_image(RunningCurrentData.coords, RunningServiceConfig.summary_map_size)
             # TODO: get start_place from current location using places api
             output_data = build_running_summary_data(
@@ -222,7 +239,8 @@ class RunningCoachService(BaseComponent):
         return output_data
 
     def get_training_update(self, training_speed, training_distance):
-        while True:
+        # until the session is removed (see RunningService.remove_runner)
+        while super().get_component_status() == COMPONENT_IS_RUNNING_STATUS:
             self.check_for_running_request(training_speed, training_distance)
             self.check_for_direction_request()
             time_utility.sleep_seconds(self.training_update_interval)
@@ -370,6 +388,25 @@ class RunningCoachService(BaseComponent):
         RunningCurrentData.waypoints.pop(0)
         RunningCurrentData.waypoints.insert(0, [RunningCurrentData.curr_lat, RunningCurrentData.curr_lng])
 
+        direction_data = None
+        if self.route_progress is not None and self.route_progress.start_time == RunningCurrentData.start_time:
+            # follow the current route locally, the directions are requested again only if the user deviates from it
+            direction_data = self.route_progress.get_direction_data(RunningCurrentData.waypoints,
+                                                                    RunningCurrentData.bearing)
+        if direction_data is None:
+            direction_data = self.request_directions()
+            if direction_data is None:
+                return
+        self.parse_direction_result(direction_data)
+
+    def request_directions(self):
+        cache_option = (RunningCurrentData.start_time, RunningServiceConfig.directions_option,
+                        RunningServiceConfig.ors_option)
+        direction_data = self.directions_cache.get(RunningCurrentData.waypoints, cache_option)
+        if direction_data is not None:
+            _logger.debug("Directions from cache: {stats}", stats=self.directions_cache.get_stats())
+            return direction_data
+
         direction_data = get_directions(
             RunningCurrentData.start_time,
             RunningCurrentData.waypoints,
@@ -379,12 +416,15 @@ class RunningCoachService(BaseComponent):
         )
         if direction_data.error_message != "":
             self.latest_direction_error_time = time_utility.get_current_millis()
-            return
-        self.parse_direction_result(direction_data)
+            return None
+        self.directions_cache.put(RunningCurrentData.waypoints, cache_option, direction_data)
+        return direction_data
 
     def parse_direction_result(self, direction_data):
         if direction_data is not None:
             save_direction_data(self, direction_data)
+        if RouteProgress.is_supported(direction_data):
+            self.route_progress = RouteProgress(direction_data, on_route_threshold_m=self.deviation_threshold)
         # result can't be None, it just returns empty DirectionData if no data
         # so no need to check if result is None
         dest_dist_str = direction_data.dest_dist_str
@@ -442,10 +482,11 @@ class RunningCoachService(BaseComponent):
 
     def check_deviation(self, polyline):
         deviation_warning = False
-        curr_location = Point(RunningCurrentData.curr_lat, RunningCurrentData.curr_lng)
-        polyline_line_string = LineString(RunningCurrentData.polyline)
-        nearest_point = nearest_points(polyline_line_string, curr_location)[0]
-        distance_from_route = calculate_distance(curr_location.x, curr_location.y, nearest_point.x, nearest_point.y)
+        # project the route once, until it is replaced
+        if self.projected_route is None or self.projected_route.polyline is not RunningCurrentData.polyline:
+            self.projected_route = ProjectedPolyline(RunningCurrentData.polyline)
+        distance_from_route = self.projected_route.get_distance([RunningCurrentData.curr_lat,
+                                                                 RunningCurrentData.curr_lng])
 
         if distance_from_route > self.deviation_threshold:
             self.deviation_update_count += 1
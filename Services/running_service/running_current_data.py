@@ -1,9 +1,19 @@
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from APIs.maps.track_compression import TrackBuffer
+from Services.running_service.running_session import SessionStateProxy
 from Utilities import time_utility
 
 
-class RunningCurrentData:
+def _get_start_time_string():
+    return time_utility.get_date_string("%d %B %I:%M %p")
+
+
+@dataclass(slots=True)
+class RunningCurrentDataState:
     """
-    RunningCurrentData stores the current state of a user's running session.
+    RunningCurrentDataState stores the current state of a user's running session.
 
     This class holds information about:
     - Current and previous running statistics such as heart rate, calories, distance, and speed.
@@ -11,57 +21,63 @@ class RunningCurrentData:
     - Current GPS coordinates, destination coordinates, and route data (e.g., waypoints and polyline).
     - The number of steps and direction data during the session.
 
-    The class also provides a reset method to clear the data and start a new session.
+    The class also provides a reset method to clear the data and start a new session. Each running session has its own
+    state, use RunningCurrentData to access the state of the current session.
     """
-    curr_heart_rate = 0  # bpm
-    curr_calories = 0  # cal
-    curr_distance = 0.0  # km
-    prev_distance = 0.0  # km
-    curr_speed = -1.0  # min/km
-    avg_speed = -1.0  # min/km
-
-    start_time = 0.0
-    start_time_string = time_utility.get_date_string("%d %B %I:%M %p")
-    start_place = 'NUS'
-    exercise_type = 'Running'
-
-    curr_lat = 0.0
-    curr_lng = 0.0
-    dest_lat = 0.0
-    dest_lng = 0.0
-    bearing = 0
-
-    coords = []  # actual coordinates user has travelled
-    waypoints = None  # list of predefined coordinates by user? that have not been reached yet
+    curr_heart_rate: int = 0  # bpm
+    curr_calories: int = 0  # cal
+    curr_distance: float = 0.0  # km
+    prev_distance: float = 0.0  # km
+    curr_speed: float = -1.0  # min/km
+    avg_speed: float = -1.0  # min/km
+
+    start_time: float = 0.0
+    start_time_string: str = field(default_factory=_get_start_time_string)
+    start_place: str = 'NUS'
+    exercise_type: str = 'Running'
+
+    curr_lat: float = 0.0
+    curr_lng: float = 0.0
+    dest_lat: float = 0.0
+    dest_lng: float = 0.0
+    bearing: int = 0
+
+    # actual coordinates user has travelled
+    coords: TrackBuffer = field(default_factory=TrackBuffer)
+    # list of predefined coordinates by user? that have not been reached yet
+    waypoints: Optional[List] = None
     # proposed route based on waypoints by maps api (google maps or ors)
-    polyline = None
-
-    total_steps = 0
-    curr_steps = 0
-    direction_data = None
-
-    @classmethod
-    def reset(cls):
-        cls.curr_heart_rate = 0
-        cls.curr_calories = 0
-        cls.curr_distance = 0.0
-        cls.prev_distance = 0.0
-        cls.curr_speed = -1.0
-        cls.avg_speed = -1.0
-
-        cls.start_time = 0.0
-        cls.start_time_string = time_utility.get_date_string("%d %B %I:%M %p")
-
-        cls.curr_lat = 0.0
-        cls.curr_lng = 0.0
-        cls.dest_lat = 0.0
-        cls.dest_lng = 0.0
-        cls.bearing = 0
-
-        cls.coords = []
-        cls.waypoints = None
-        cls.polyline = None
-
-        cls.total_steps = 0
-        cls.curr_steps = 0
-        cls.direction_data = None
+    polyline: Optional[List] = None
+
+    total_steps: int = 0
+    curr_steps: int = 0
+    direction_data: Any = None
+
+    def reset(self):
+        self.curr_heart_rate = 0
+        self.curr_calories = 0
+        self.curr_distance = 0.0
+        self.prev_distance = 0.0
+        self.curr_speed = -1.0
+        self.avg_speed = -1.0
+
+        self.start_time = 0.0
+        self.start_time_string = _get_start_time_string()
+
+        self.curr_lat = 0.0
+        self.curr_lng = 0.0
+        self.dest_lat = 0.0
+        self.dest_lng = 0.0
+        self.bearing = 0
+
+        self.coords = TrackBuffer()
+        self.waypoints = None
+        self.polyline = None
+
+        self.total_steps = 0
+        self.curr_steps = 0
+        self.direction_data = None
+
+
+# state of the current running session, see running_session
+RunningCurrentData = SessionStateProxy(RunningCurrentDataState)
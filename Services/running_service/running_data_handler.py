@@ -1,6 +1,5 @@
-import asyncio
-
-from APIs.maps.maps import get_static_maps, get_walking_directions
+from APIs.maps.direction_data import DirectionData
+from APIs.maps.maps import get_static_maps, get_walking_directions, run_map_request
 from APIs.maps.maps_config import MapsConfig
 from APIs.maps.maps_util import calculate_distance
 from DataFormat.ProtoFiles.Running import direction_data_pb2, random_routes_data_pb2, running_target_data_pb2, \
@@ -26,9 +25,11 @@ from Services.running_service.running_service_params import (
     RunningUnitParams,
 )
 from Services.running_service.running_training_mode import RunningTrainingMode
-from Utilities import time_utility
+from Utilities import logging_utility, time_utility
 from Utilities.format_utility import convert_m_s_to_min_km
 
+_logger = logging_utility.setup_logger(__name__)
+
 
 ##############################################################################################################
 ############################################## Saving data ###################################################
@@ -95,6 +96,9 @@ def save_real_coords(threshold_distance=RunningServiceConfig.threshold_coords_di
                 RunningCurrentData.coords.append(
                     [RunningCurrentData.curr_lat, RunningCurrentData.curr_lng]
                 )
+                if len(RunningCurrentData.coords) > RunningServiceConfig.max_coords:
+                    RunningCurrentData.coords.simplify(RunningServiceConfig.coords_simplify_tolerance,
+                                                       RunningServiceConfig.max_simplified_coords)
         else:
             RunningCurrentData.coords.append(
                 [RunningCurrentData.curr_lat, RunningCurrentData.curr_lng]
@@ -378,21 +382,19 @@ def get_chosen_route_id(decoded_data):
         ) from exc
 
 
-def get_directions(start_time, training_route, bearing, option, ors_option=0):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    result = loop.run_until_complete(
-        get_walking_directions(start_time, training_route, bearing, option, ors_option)
-    )
-    loop.close()
-    return result
+def get_directions(start_time, training_route, bearing, option, ors_option=0,
+                   timeout=RunningServiceConfig.map_request_timeout):
+    try:
+        return run_map_request(get_walking_directions(start_time, training_route, bearing, option, ors_option),
+                               timeout)
+    except TimeoutError as e:
+        _logger.error("get_directions: {err_msg}", err_msg=str(e))
+        return DirectionData(error_message=str(e))
 
 
-def get_static_maps_image(coords, size):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    image_bytes = loop.run_until_complete(
-        get_static_maps(coords, size, RunningServiceConfig.static_map_option)
-    )
-    loop.close()
-    return image_bytes
+def get_static_maps_image(coords, size, timeout=RunningServiceConfig.map_request_timeout):
+    try:
+        return run_map_request(get_static_maps(coords, size, RunningServiceConfig.static_map_option), timeout)
+    except TimeoutError as e:
+        _logger.error("get_static_maps_image: {err_msg}", err_msg=str(e))
+        return None
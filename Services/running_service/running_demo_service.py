@@ -1,7 +1,9 @@
 import threading
+from APIs.maps.maps_util import resample_track
 from base_keys import FPV_OPTION, WEBSOCKET_DATATYPE, WEBSOCKET_MESSAGE
 from Services.running_service.running_keys import EXERCISE_WEAR_OS_DATA
 from Services.running_service.running_current_data import RunningCurrentData
+from Services.running_service.running_service_config import RunningServiceConfig
 from Services.running_service.running_service_params import BaseParams
 from Tests.RunningFpv.running_fpv_service import RunningFpvService
 from Tests.RunningFpv.running_demo_route import demo_route, demo_waypoints, demo_distance, demo_bearing
@@ -35,7 +37,8 @@ class RunningDemoService(BaseComponent):
             threading.Thread(target=self.running_fpv_service.run, daemon=True).start()
 
         websocket_data_type = raw_data[WEBSOCKET_DATATYPE]
-        self.mock_message = raw_data[WEBSOCKET_MESSAGE]
+        # a mutable copy, as the websocket message is read-only (and shared with the other subscribers)
+        self.mock_message = dict(raw_data[WEBSOCKET_MESSAGE])
         if websocket_data_type == EXERCISE_WEAR_OS_DATA:
             if self.running_fpv_service is None:
                 self.set_null_island()
@@ -71,9 +74,10 @@ class RunningDemoService(BaseComponent):
             elif curr_time_elapsed >= 110:
                 # this is to add the skipped coords for summary map, \
                 # so that the user doesn't just teleport for the route line
+                # (spaced like the coords saved from the real locations)
                 if not self.add_mock_coords_for_summary:
-                    for i in range(40, 116):
-                        RunningCurrentData.coords.append(demo_route[i])
+                    RunningCurrentData.coords.extend(
+                        resample_track(demo_route[40:116], RunningServiceConfig.threshold_coords_distance))
                     self.add_mock_coords_for_summary = True
                 curr_time_elapsed += 470
             # 1st cut, fpv_short jumps from 1:20 to 2:50 in normal fpv, therefore need to add 90 seconds
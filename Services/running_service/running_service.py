@@ -1,5 +1,8 @@
 import threading
+import time
+
 from Utilities import logging_utility
+from Utilities.dispatch_queue import DispatchQueue
 from Services.running_service.running_keys import (
     EXERCISE_WEAR_OS_DATA,
     INFO_WAIT_WEAROS_DATA,
@@ -10,16 +13,21 @@ from Services.running_service.training_mode_selection_service import (
 from base_keys import (
     COMPONENT_NOT_STARTED_STATUS,
     COMPONENT_IS_RUNNING_STATUS,
+    COMPONENT_IS_STOPPED_STATUS,
     ORIGIN_KEY,
+    SESSION_ID_KEY,
     WEBSOCKET_MESSAGE,
     WEBSOCKET_DATATYPE,
     RUNNING_DEMO_SERVICE
 )
 from base_component import BaseComponent
+from . import running_session
 from .route_selection_service import RouteSelectionService
 from .running_coach_service import RunningCoachService
 from .running_current_data import RunningCurrentData
+from .running_service_config import RunningServiceConfig
 from .running_service_params import BaseParams
+from .running_session import DEFAULT_SESSION_ID
 from .running_ui_service import RunningUiService
 
 _logger = logging_utility.setup_logger(__name__)
@@ -35,7 +43,11 @@ class RunningService(BaseComponent):
     Key functionalities:
     - Handles different states of running services like demo mode and wearOS data reception.
     - Manages the selection of routes and interaction with the running coach.
-    - Runs UI updates and services in separate threads.
+    - Runs UI updates and services in their own worker threads, each handling its messages in order (see
+      `dispatch`), instead of a new thread per message.
+    - Coaches many runners at once, the messages with a session id (SESSION_ID_KEY) have their own state and
+      sub-services (see `running_session`), the messages without one share the default session. The sessions with an
+      id are removed when they are idle (see `remove_idle_runners`).
     - Maintains communication with other components using websocket messages.
     """
 
@@ -70,63 +82,198 @@ class RunningService(BaseComponent):
     def __init__(self, name):
         super().__init__(name)
         super().set_component_status(COMPONENT_NOT_STARTED_STATUS)
-        self.route_selection_service = None
-        self.running_coach_service = None
-        self.running_ui_service = None
-        self.training_mode_selection_service = None
-        self.received_wear_os_data = False
+        # {session id: RunnerServices}, created on the first message of the session
+        self.runners = {}
+        self._runners_lock = threading.Lock()
 
     def run(self, raw_data):
         is_demo = raw_data[ORIGIN_KEY] == RUNNING_DEMO_SERVICE
         if super().get_component_status() != COMPONENT_IS_RUNNING_STATUS:
-            BaseParams.reset()
-            if not is_demo:
-                RunningCurrentData.reset()
             super().set_component_status(COMPONENT_IS_RUNNING_STATUS)
+            # the runners do not tell when they stop, e.g., the watch disconnects
+            threading.Thread(target=self._remove_idle_runners_periodically, daemon=True).start()
 
         decoded_data = raw_data[WEBSOCKET_MESSAGE]
         socket_data_type = raw_data[WEBSOCKET_DATATYPE]
+        runner = self.get_runner(raw_data.get(SESSION_ID_KEY) or DEFAULT_SESSION_ID, is_demo)
+        runner.last_message_time = time.perf_counter()
+
+        # the state (e.g., BaseParams) is the state of the session of the message
+        with running_session.use_session(runner.session):
+            if BaseParams.training_mode is None:
+                if runner.training_mode_selection_service is None:
+                    runner.training_mode_selection_service = TrainingModeSelectionService(
+                        runner.get_service_name("TrainingModeSelectionService")
+                    )
+                self.dispatch(runner, runner.training_mode_selection_service, socket_data_type, decoded_data)
+
+            if runner.running_ui_service is None:
+                runner.running_ui_service = RunningUiService(runner.get_service_name("RunningUiService"))
+            self.dispatch(runner, runner.running_ui_service, socket_data_type)
+
+            if not runner.received_wear_os_data:
+                if socket_data_type != EXERCISE_WEAR_OS_DATA:
+                    _logger.info(INFO_WAIT_WEAROS_DATA)
+                    return
+                runner.received_wear_os_data = True
+
+            if BaseParams.chosen_route_id == -1:
+                if runner.route_selection_service is None:
+                    runner.route_selection_service = RouteSelectionService(
+                        runner.get_service_name("RouteSelectionService")
+                    )
+                self.dispatch(runner, runner.route_selection_service, socket_data_type, decoded_data, is_demo)
+            else:
+                if runner.running_coach_service is None:
+                    runner.running_coach_service = RunningCoachService(runner.get_service_name("RunningCoachService"))
+                self.dispatch(runner, runner.running_coach_service, socket_data_type, decoded_data)
+
+    def send_to_component(self, **kwargs):
+        '''
+        Send the data of the sub-services, the replies to a session with an id only go to the connections of the session
+        (see socket_server.send_data)
+        '''
+        session_id = running_session.get_current_session().session_id
+        if session_id != DEFAULT_SESSION_ID:
+            kwargs.setdefault(SESSION_ID_KEY, session_id)
+        super().send_to_component(**kwargs)
+
+    def get_runner(self, session_id, is_demo=False):
+        '''
+        :param session_id: id of the running session, see running_session
+        :param is_demo: True to keep the current data of a new session, which is set by the demo service
+        :return: RunnerServices of the session, created (with a reset state) on the first message of the session
+        '''
+        runner = self.runners.get(session_id)
+        if runner is not None:
+            return runner
+
+        with self._runners_lock:
+            runner = self.runners.get(session_id)
+            if runner is None:
+                runner = RunnerServices(running_session.get_session(session_id))
+                with running_session.use_session(runner.session):
+                    BaseParams.reset()
+                    if not is_demo:
+                        RunningCurrentData.reset()
+                self.runners[session_id] = runner
+        return runner
+
+    def dispatch(self, runner, service, *args):
+        '''
+        Queue the message to the worker thread of the sub-service, which calls `service.run(self, *args)` with the
+        session of the runner. The messages of a sub-service are handled in order, and the queue lag is recorded as the
+        "running_service.{service name}.queue_wait" latency (see `DispatchQueue`).
+
+        :param runner: RunnerServices of the session
+        :param service: sub-service, e.g., RunningUiService
+        :param args: arguments of `service.run` after the running service
+        '''
+        with self._runners_lock:
+            service_queue = runner.service_queues.get(service.name)
+            if service_queue is None:
+                service_queue = DispatchQueue(
+                    f"running_service.{service.name}",
+                    lambda run_args: running_session.run_in_session(runner.session, service.run, self, *run_args),
+                    max_size=RunningServiceConfig.service_queue_size).start()
+                runner.service_queues[service.name] = service_queue
+
+        service_queue.put(args)
+
+    def remove_runner(self, session_id, timeout=None):
+        '''
+        Stop the sub-services of the session and remove its state, e.g., when the runner disconnects
+        '''
+        with self._runners_lock:
+            runner = self.runners.pop(session_id, None)
+        if runner is not None:
+            # the threads of the sub-services (e.g., the training updates) exit when they are stopped
+            runner.set_component_statuses(COMPONENT_IS_STOPPED_STATUS)
+            runner.stop_service_queues(timeout)
+            runner.remove_component_statuses()
+            running_session.remove_session(session_id)
+
+    def remove_idle_runners(self, idle_timeout=RunningServiceConfig.session_idle_timeout):
+        '''
+        Remove the sessions with an id which have not received a message for the idle timeout, the default session is
+        kept
+
+        :param idle_timeout: seconds since the last message of the session
+        :return: list of the removed session ids
+        '''
+        now = time.perf_counter()
+        with self._runners_lock:
+            session_ids = [session_id for session_id, runner in self.runners.items()
+                           if session_id != DEFAULT_SESSION_ID and now - runner.last_message_time > idle_timeout]
+
+        for session_id in session_ids:
+            _logger.info("Removing idle running session: {session_id}", session_id=session_id)
+            self.remove_runner(session_id)
+        return session_ids
+
+    def _remove_idle_runners_periodically(self):
+        while super().get_component_status() == COMPONENT_IS_RUNNING_STATUS:
+            time.sleep(RunningServiceConfig.session_reaper_interval)
+            self.remove_idle_runners()
+
+    def stop_service_queues(self, timeout=None):
+        '''
+        Stop the worker threads of the sub-services of all the sessions, the queued messages are discarded
+        '''
+        with self._runners_lock:
+            runners = list(self.runners.values())
+        for runner in runners:
+            runner.stop_service_queues(timeout)
+
+
+class RunnerServices:
+    """
+    The running sub-services of one running session, each sub-service has its own instance (and worker thread) per
+    session, as the sub-services keep per-runner state (e.g., the route progress of RunningCoachService).
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.route_selection_service = None
+        self.running_coach_service = None
+        self.running_ui_service = None
+        self.training_mode_selection_service = None
+        self.received_wear_os_data = False
+        # time.perf_counter() time of the last message of the session, see RunningService.remove_idle_runners
+        self.last_message_time = time.perf_counter()
+        # {sub-service name: DispatchQueue}, created on the first message of the sub-service
+        self.service_queues = {}
+
+    def get_service_name(self, name):
+        '''
+        :return: name of the sub-service in the session, the sessions have their own component status and metrics
+        '''
+        if self.session.session_id == DEFAULT_SESSION_ID:
+            return name
+        return f"{name}:{self.session.session_id}"
+
+    def get_services(self):
+        '''
+        :return: list of the sub-services created in the session
+        '''
+        return [service for service in (self.training_mode_selection_service, self.running_ui_service,
+                                        self.route_selection_service, self.running_coach_service)
+                if service is not None]
+
+    def set_component_statuses(self, status):
+        for service in self.get_services():
+            service.set_component_status(status)
+
+    def remove_component_statuses(self):
+        '''
+        Remove the component status of the sub-services, which have their own names in a session with an id
+        '''
+        if self.session.session_id == DEFAULT_SESSION_ID:
+            return
+        for service in self.get_services():
+            service.remove_component_status()
 
-        if BaseParams.training_mode is None:
-            if self.training_mode_selection_service is None:
-                self.training_mode_selection_service = TrainingModeSelectionService(
-                    "TrainingModeSelectionService"
-                )
-            threading.Thread(
-                target=self.training_mode_selection_service.run,
-                args=(self, socket_data_type, decoded_data),
-                daemon=True,
-            ).start()
-
-        if self.running_ui_service is None:
-            self.running_ui_service = RunningUiService("RunningUiService")
-        threading.Thread(
-            target=self.running_ui_service.run,
-            args=(self, socket_data_type),
-            daemon=True,
-        ).start()
-
-        if not self.received_wear_os_data:
-            if socket_data_type != EXERCISE_WEAR_OS_DATA:
-                _logger.info(INFO_WAIT_WEAROS_DATA)
-                return
-            self.received_wear_os_data = True
-
-        if BaseParams.chosen_route_id == -1:
-            if self.route_selection_service is None:
-                self.route_selection_service = RouteSelectionService(
-                    "RouteSelectionService"
-                )
-            threading.Thread(
-                target=self.route_selection_service.run,
-                args=(self, socket_data_type, decoded_data, is_demo),
-                daemon=True,
-            ).start()
-        else:
-            if self.running_coach_service is None:
-                self.running_coach_service = RunningCoachService("RunningCoachService")
-            threading.Thread(
-                target=self.running_coach_service.run,
-                args=(self, socket_data_type, decoded_data),
-                daemon=True,
-            ).start()
+    def stop_service_queues(self, timeout=None):
+        service_queues, self.service_queues = self.service_queues, {}
+        for service_queue in service_queues.values():
+            service_queue.stop(timeout)
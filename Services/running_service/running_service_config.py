@@ -21,6 +21,25 @@ class RunningServiceConfig:
     # set a min distance between prev coordinate and current coordinate when saving route taken by user,
     # this is to prevent adding points that are too close to each other
     threshold_coords_distance = 30  # m
+    # simplify the coordinates taken by user once there are more than {max_coords} points, so they do not grow without
+    # bound in a long session. They are simplified down to {max_simplified_coords} points (with a growing tolerance),
+    # so the next simplification is only after many more points
+    max_coords = 5000
+    max_simplified_coords = max_coords // 2
+    coords_simplify_tolerance = 5  # m
     route_selection_map_size = (400, 560)  # width, height
     summary_map_size = (600, 400)  # width, height
     max_instruction_length = 30  # max number of characters in an instruction
+    # max number of messages waiting for each sub-service (e.g., RunningCoachService), the websocket messages wait when
+    # the queue is full
+    service_queue_size = 100
+    # remove the state and the sub-services of a session (with an id) when no message is received for
+    # {session_idle_timeout}, e.g., when the watch of the runner disconnects
+    session_idle_timeout = 600  # s
+    session_reaper_interval = 30  # s
+    map_request_timeout = 30  # s, max time to wait for directions or a static map
+    # reuse the directions to the same waypoints if the runner is in the same grid cell, or still on the cached route
+    directions_cache_size = 32  # max number of cached routes
+    directions_cache_ttl = 60  # s
+    directions_cache_cell_size = 15  # m
+    directions_cache_on_route_threshold = 20  # m, max distance from the cached route to trim it
@@ -1,29 +1,32 @@
+from dataclasses import dataclass, field
 from queue import Queue
+from typing import Any
 
+from Services.running_service.running_session import SessionStateProxy
 
-class BaseParams:
+
+@dataclass(slots=True)
+class BaseParamsState:
     """Stores general running session parameters and provides reset methods."""
-    total_sec = 0.0
-    chosen_route_id = -1
-    exercise_wear_os_count = 0
-    running_count = 0
-    direction_count = 0
-    request_queue = Queue()
-    training_mode = None
+    total_sec: float = 0.0
+    chosen_route_id: int = -1
+    exercise_wear_os_count: int = 0
+    running_count: int = 0
+    direction_count: int = 0
+    request_queue: Queue = field(default_factory=Queue)
+    training_mode: Any = None
 
-    @classmethod
-    def is_item_in_queue(cls, item):
-        with cls.request_queue.mutex:
-            return item in cls.request_queue.queue
+    def is_item_in_queue(self, item):
+        with self.request_queue.mutex:
+            return item in self.request_queue.queue
 
-    @classmethod
-    def reset(cls):
-        cls.total_sec = 0.0
-        cls.chosen_route_id = -1
-        cls.exercise_wear_os_count = 0
-        cls.running_count = 0
-        cls.direction_count = 0
-        cls.request_queue = Queue()
+    def reset(self):
+        self.total_sec = 0.0
+        self.chosen_route_id = -1
+        self.exercise_wear_os_count = 0
+        self.running_count = 0
+        self.direction_count = 0
+        self.request_queue = Queue()
 
 
 class RunningUnitParams:
@@ -54,14 +57,22 @@ class SummaryUnitParams:
         cls.duration = "min"
 
 
-class SpeedTrainingParams:
+@dataclass(slots=True)
+class SpeedTrainingParamsState:
     """Stores target speed for speed training sessions."""
-    target_speed = 10.0  # min/km
+    target_speed: float = 10.0  # min/km
 
 
-class DistanceTrainingParams:
+@dataclass(slots=True)
+class DistanceTrainingParamsState:
     """Stores target distance and training parameters for distance-based sessions."""
-    target_distance = 3  # km
-    half_dist_notif_timeout = 5  # number of running updates
-    halfway_point = False
-    training_speed = 0.0  # min/km
+    target_distance: float = 3  # km
+    half_dist_notif_timeout: int = 5  # number of running updates
+    halfway_point: bool = False
+    training_speed: float = 0.0  # min/km
+
+
+# parameters of the current running session, see running_session
+BaseParams = SessionStateProxy(BaseParamsState)
+SpeedTrainingParams = SessionStateProxy(SpeedTrainingParamsState)
+DistanceTrainingParams = SessionStateProxy(DistanceTrainingParamsState)
@@ -0,0 +1,122 @@
+import threading
+from contextlib import contextmanager
+
+# session of the messages without a session id (e.g., a single watch or the demo), and of the code outside a session
+DEFAULT_SESSION_ID = "default"
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+# session bound to the current thread, see use_session
+_thread_local = threading.local()
+
+
+class RunningSession:
+    """
+    The state of the running session of one runner (i.e., one watch), so one server can coach many runners.
+
+    The state objects (e.g., of RunningCurrentData) are created on first use. The running sub-services read and write
+    the state through the SessionStateProxy objects (e.g., `RunningCurrentData.curr_lat`), which resolve to the
+    session bound to the current thread.
+    """
+    __slots__ = ("session_id", "_states", "_lock")
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        # {state type: state object}
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def get_state(self, state_type):
+        state = self._states.get(state_type)
+        if state is None:
+            with self._lock:
+                state = self._states.setdefault(state_type, state_type())
+        return state
+
+    def __repr__(self):
+        return f"RunningSession({self.session_id})"
+
+
+class SessionStateProxy:
+    """
+    Forwards the attributes to the state of the current session, e.g., `RunningCurrentData = SessionStateProxy(
+    RunningCurrentDataState)`, so `RunningCurrentData.curr_lat` is the location of the runner of the current session.
+    """
+    __slots__ = ("_state_type",)
+
+    def __init__(self, state_type):
+        object.__setattr__(self, "_state_type", state_type)
+
+    def get_state(self, session=None):
+        '''
+        :param session: RunningSession, the current session if None
+        :return: state object of the session
+        '''
+        return (session or get_current_session()).get_state(self._state_type)
+
+    def __getattr__(self, name):
+        return getattr(self.get_state(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.get_state(), name, value)
+
+    def __repr__(self):
+        return f"SessionStateProxy({self._state_type.__name__})"
+
+
+def get_session(session_id=DEFAULT_SESSION_ID):
+    '''
+    :return: RunningSession of the session id, created if it does not exist
+    '''
+    session = _sessions.get(session_id)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.setdefault(session_id, RunningSession(session_id))
+    return session
+
+
+def has_session(session_id):
+    return session_id in _sessions
+
+
+def remove_session(session_id):
+    '''
+    Remove the session, e.g., when the run is finished, the next session with the same id starts with a new state
+    '''
+    with _sessions_lock:
+        _sessions.pop(session_id, None)
+
+
+def get_session_ids():
+    with _sessions_lock:
+        return list(_sessions)
+
+
+def get_current_session():
+    '''
+    :return: RunningSession bound to the current thread, the default session if none
+    '''
+    session = getattr(_thread_local, "session", None)
+    return session if session is not None else get_session(DEFAULT_SESSION_ID)
+
+
+@contextmanager
+def use_session(session):
+    '''
+    Bind the session to the current thread, e.g., `with use_session(session): RunningCurrentData.reset()`
+    '''
+    previous_session = getattr(_thread_local, "session", None)
+    _thread_local.session = session
+    try:
+        yield session
+    finally:
+        _thread_local.session = previous_session
+
+
+def run_in_session(session, func, *args):
+    '''
+    Call the function with the session bound, e.g., as the target of a thread started by a sub-service (threads do
+    not inherit the session of the thread starting them)
+    '''
+    with use_session(session):
+        return func(*args)
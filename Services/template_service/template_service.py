@@ -37,7 +37,7 @@ class TemplateService(BaseComponent):
             datatype = raw_data[base_keys.WEBSOCKET_DATATYPE]
             data = raw_data[base_keys.WEBSOCKET_MESSAGE]
 
-            data = datatypes_helper.convert_json_to_protobuf(datatype, data)
+            data = datatypes_helper.get_protobuf_message(datatype, data)
             _logger.debug("Template Service: {datatype}", datatype=datatype)
 
             self._handle_websocket_data(datatype, data)
@@ -78,7 +78,7 @@ class TemplateService(BaseComponent):
 
     # Set the camera frame, frame width, frame height, last detection and class labels in the "shared" memory
     def _handle_camera_data(self, raw_data: dict) -> None:
-        super().set_memory_data(base_keys.CAMERA_FRAME, raw_data[base_keys.CAMERA_FRAME])
+        super().set_latest_frame(raw_data[base_keys.CAMERA_FRAME])
         super().set_memory_data(base_keys.CAMERA_FRAME_WIDTH, raw_data[base_keys.CAMERA_FRAME_WIDTH])
         super().set_memory_data(base_keys.CAMERA_FRAME_HEIGHT, raw_data[base_keys.CAMERA_FRAME_HEIGHT])
         super().set_memory_data(base_keys.YOLOV8_LAST_DETECTION, raw_data[base_keys.YOLOV8_LAST_DETECTION])
@@ -87,7 +87,7 @@ class TemplateService(BaseComponent):
     # Get frame data from memory and get the detected label and image
     def _get_detected_label_and_image(self) -> tuple:
         frame_detections: dict = super().get_memory_data(base_keys.YOLOV8_LAST_DETECTION)
-        frame: numpy.ndarray = super().get_memory_data(base_keys.CAMERA_FRAME)
+        frame: numpy.ndarray = super().get_latest_frame()
         frame_width: int = super().get_memory_data(base_keys.CAMERA_FRAME_WIDTH)
         frame_height: int = super().get_memory_data(base_keys.CAMERA_FRAME_HEIGHT)
         class_labels: dict = super().get_memory_data(base_keys.YOLOV8_CLASS_LABELS)
@@ -26,7 +26,7 @@ class TestingService(BaseComponent):
             datatype = raw_data[base_keys.WEBSOCKET_DATATYPE]
             data = raw_data[base_keys.WEBSOCKET_MESSAGE]
 
-            data = datatypes_helper.convert_json_to_protobuf(datatype, data)
+            data = datatypes_helper.get_protobuf_message(datatype, data)
 
             self._handle_websocket_data(datatype, data)
 
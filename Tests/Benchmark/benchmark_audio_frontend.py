@@ -0,0 +1,62 @@
+"""
+Benchmark of preparing an utterance (WAV bytes from AudioWidget) for two audio processors (whisper and
+backgroundAudioClassifier), comparing each processor decoding it with torchaudio and a new Resample transform
+(previously in BackgroundAudioClassifier) with decoding it once in the audio frontend with a cached resampler. The
+models are the same for both, so they are not included. The sample audio is at 22.05 kHz, so it is resampled to 16 kHz.
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_audio_frontend
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env, run_benchmark, print_speedup
+
+setup_benchmark_env()
+
+# pylint: disable=wrong-import-position
+import io
+import os
+
+import torchaudio
+
+import base_keys
+from Utilities import audio_utility
+
+_SAMPLE_FILE = os.path.join("Tests", "Unit", "utility_tests", "sample_audio.wav")
+_SAMPLE_RATE = 16000
+# length of an utterance
+_UTTERANCE_SECONDS = 5
+_NUM_PROCESSORS = 2
+_ITERATIONS = 50
+
+
+def _load_utterance():
+    audio_data, original_rate = torchaudio.load(_SAMPLE_FILE)
+    audio_data = audio_data[:, :_UTTERANCE_SECONDS * original_rate]
+
+    wav_data = io.BytesIO()
+    torchaudio.save(wav_data, audio_data, original_rate, format="wav", encoding="PCM_S", bits_per_sample=16)
+    return wav_data
+
+
+def _decode_per_processor(wav_data):
+    for _ in range(_NUM_PROCESSORS):
+        wav_data.seek(0)
+        wav, rate = torchaudio.load(wav_data)
+        torchaudio.transforms.Resample(rate, _SAMPLE_RATE)(wav).squeeze(0)
+
+
+def _decode_once(wav_data):
+    samples = audio_utility.get_audio_samples({base_keys.AUDIO_DATA: wav_data}, _SAMPLE_RATE)
+    raw_data = {base_keys.AUDIO_SAMPLES_DATA: samples, base_keys.AUDIO_SAMPLE_RATE_DATA: _SAMPLE_RATE}
+    for _ in range(_NUM_PROCESSORS):
+        audio_utility.get_audio_samples(raw_data, _SAMPLE_RATE)
+
+
+def main():
+    wav_data = _load_utterance()
+    print(f"Decoding a {_UTTERANCE_SECONDS} s utterance for {_NUM_PROCESSORS} processors")
+    before = run_benchmark("decode per processor", lambda: _decode_per_processor(wav_data), _ITERATIONS, "utterances")
+    after = run_benchmark("audio frontend", lambda: _decode_once(wav_data), _ITERATIONS, "utterances")
+    print_speedup(before, after)
+
+
+if __name__ == "__main__":
+    main()
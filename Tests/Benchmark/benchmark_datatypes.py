@@ -0,0 +1,96 @@
+"""
+Benchmarks of the websocket messages:
+1. encode/decode round trip, comparing the protobuf class resolution by importing the proto module (decode) and
+    parsing the type name (encode) for every message with the startup-time registry
+2. hand-off from the WebsocketWidget to a service, comparing the protobuf -> dict -> protobuf conversion with the
+    lazily decoded WebsocketMessage
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_datatypes
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env, run_benchmark, print_speedup
+
+setup_benchmark_env()
+
+# pylint: disable=wrong-import-position
+import importlib
+
+from google.protobuf import json_format
+
+from DataFormat import datatypes_helper
+from DataFormat.ProtoFiles.Common import exercise_wear_os_data_pb2, socket_data_pb2
+
+_ITERATIONS = 50000
+
+
+def _get_proto_func_by_import(data_type_key):
+    """
+    The previous implementation of `datatypes_helper.get_proto_func_by_key`
+    """
+    datatype_name = datatypes_helper.get_name_by_key(data_type_key)
+    proto_file = datatypes_helper.DATATYPE_TO_PROTO_MAP[datatype_name]
+    submod_name = f"DataFormat.ProtoFiles.{proto_file[:-3].replace('/', '.')}"
+    submod = importlib.import_module(submod_name)
+
+    return getattr(submod, dir(submod)[1])
+
+
+def _get_key_by_type_name(proto):
+    """
+    The previous implementation of `datatypes_helper.get_key_by_instance`
+    """
+    _type = str(type(proto)).split("'")[1].split(".")[0]
+    datatype_names = datatypes_helper.PROTO_TO_DATATYPE_MAP.get(_type + ".py")
+
+    return datatypes_helper.get_key_by_name(datatype_names[0])
+
+
+def _round_trip_with_lookups(data):
+    encoded = socket_data_pb2.SocketData(data_type=_get_key_by_type_name(data),
+                                         data=data.SerializeToString()).SerializeToString()
+
+    msg = socket_data_pb2.SocketData()
+    msg.ParseFromString(encoded)
+    decoded = _get_proto_func_by_import(msg.data_type)()
+    decoded.ParseFromString(msg.data)
+    return decoded
+
+
+def _round_trip_with_registry(data):
+    encoded = datatypes_helper.wrap_socket_message_with_metadata(data)
+    return datatypes_helper.decode_websocket_data(encoded)[1]
+
+
+def _hand_off_with_dict(encoded):
+    data_type, data = datatypes_helper.decode_websocket_data(encoded)
+    # widget
+    data = json_format.MessageToDict(data, preserving_proto_field_name=True)
+    # service
+    return datatypes_helper.convert_json_to_protobuf(data_type, data)
+
+
+def _hand_off_with_websocket_message(encoded):
+    message = datatypes_helper.decode_websocket_message(encoded)
+    return datatypes_helper.get_protobuf_message(message.data_type, message)
+
+
+def main():
+    data = exercise_wear_os_data_pb2.ExerciseWearOsData(heart_rate=150, distance=1234.5, speed=3.2)
+
+    print("Encode/decode round trip of a websocket message")
+    before = run_benchmark("per-message import and type name parsing", lambda: _round_trip_with_lookups(data),
+                           _ITERATIONS, "messages")
+    after = run_benchmark("startup-time registry", lambda: _round_trip_with_registry(data), _ITERATIONS, "messages")
+    print_speedup(before, after)
+
+    encoded = datatypes_helper.wrap_socket_message_with_metadata(data)
+
+    print("\nHand-off of a websocket message from the WebsocketWidget to a service")
+    before = run_benchmark("protobuf -> dict -> protobuf", lambda: _hand_off_with_dict(encoded), _ITERATIONS,
+                           "messages")
+    after = run_benchmark("lazily decoded WebsocketMessage", lambda: _hand_off_with_websocket_message(encoded),
+                          _ITERATIONS, "messages")
+    print_speedup(before, after)
+
+
+if __name__ == "__main__":
+    main()
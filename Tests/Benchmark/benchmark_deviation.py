@@ -0,0 +1,58 @@
+"""
+Benchmark of the distance from the route (off-route detection of RunningCoachService) on the long demo route, comparing
+the shapely nearest point in lat/lng degrees with the projected polyline, for each GPS location and for a full GPS
+trace.
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_deviation
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env, run_benchmark, print_speedup
+
+setup_benchmark_env()
+
+# pylint: disable=wrong-import-position
+import numpy as np
+from shapely import LineString, Point
+from shapely.ops import nearest_points
+
+from APIs.maps.maps_util import calculate_distance
+from APIs.maps.projected_polyline import ProjectedPolyline
+from Tests.RunningFpv.running_demo_route import demo_route
+
+_GPS_NOISE_DEGREES = 0.0002  # about 20 m
+
+
+def _get_distance_by_shapely(polyline, location):
+    """
+    The previous implementation of `RunningCoachService.check_deviation`
+    """
+    curr_location = Point(location[0], location[1])
+    nearest_point = nearest_points(LineString(polyline), curr_location)[0]
+    return calculate_distance(curr_location.x, curr_location.y, nearest_point.x, nearest_point.y)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    trace = (np.asarray(demo_route) + rng.normal(0, _GPS_NOISE_DEGREES, (len(demo_route), 2))).tolist()
+    locations = iter(trace * 1000)
+    projected_polyline = ProjectedPolyline(demo_route)
+
+    print(f"Distance from the demo route ({len(demo_route)} points)")
+    before = run_benchmark("shapely, lat/lng degrees", lambda: _get_distance_by_shapely(demo_route, next(locations)),
+                           500, "locations")
+    after = run_benchmark("projected polyline", lambda: projected_polyline.get_distance(next(locations)), 2000,
+                          "locations")
+    print_speedup(before, after)
+
+    print(f"\nDistances of a GPS trace ({len(trace)} locations)")
+    before = run_benchmark("shapely, lat/lng degrees",
+                           lambda: [_get_distance_by_shapely(demo_route, location) for location in trace], 1, "traces")
+    after = run_benchmark("projected polyline, batch", lambda: projected_polyline.get_distances(trace), 5, "traces")
+    print_speedup(before, after)
+
+    differences = np.abs(projected_polyline.get_distances(trace) -
+                         [_get_distance_by_shapely(demo_route, location) for location in trace])
+    print(f"\nMax difference of the distances: {differences.max():.2f} m")
+
+
+if __name__ == "__main__":
+    main()
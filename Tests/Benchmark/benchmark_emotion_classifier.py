@@ -0,0 +1,61 @@
+"""
+Benchmark of the emotion classification of the transcripts, comparing the previous classification of each transcript
+with the pipeline (batch size 1) with batched classification, the score cache and the int8 / ONNX backends. The
+transcripts are a window of short, partly repeated utterances, as sent by Whisper during a conversation. The ONNX
+backend is skipped if optimum[onnxruntime] is not installed.
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_emotion_classifier
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env, run_benchmark, print_speedup
+
+setup_benchmark_env()
+
+# pylint: disable=wrong-import-position
+import importlib.util
+
+from Processors.EmotionClassifier import emotion_classifier
+from Processors.EmotionClassifier.emotion_classifier import EmotionClassifier, load_emotion_pipeline
+from Processors.EmotionClassifier.emotion_score_cache import EmotionScoreCache
+
+_TRANSCRIPTS = ["Yes.", "Okay.", "What is this?", "I can't believe it worked, this is amazing!", "Okay.",
+                "Where did I put my keys?", "No.", "Yes."]
+_ITERATIONS = 20
+
+
+def _create_classifier(backend, cache_size):
+    # only the classification, without the component setup (e.g., the database)
+    classifier = EmotionClassifier.__new__(EmotionClassifier)
+    classifier.emotion_classifier = load_emotion_pipeline(emotion_classifier._EMOTION_MODEL_FROM_TEXT, backend)
+    classifier.score_cache = EmotionScoreCache(cache_size)
+    return classifier
+
+
+def main():
+    baseline_pipeline = load_emotion_pipeline(emotion_classifier._EMOTION_MODEL_FROM_TEXT)
+
+    print(f"Classifying {len(_TRANSCRIPTS)} transcripts")
+    before = run_benchmark("pipeline, one transcript at a time",
+                           lambda: [baseline_pipeline(text) for text in _TRANSCRIPTS], _ITERATIONS, "windows")
+
+    batched_classifier = _create_classifier(emotion_classifier.BACKEND_PIPELINE, cache_size=0)
+    after = run_benchmark("pipeline, batched", lambda: batched_classifier.classify(_TRANSCRIPTS), _ITERATIONS,
+                          "windows")
+    print_speedup(before, after)
+
+    backends = [emotion_classifier.BACKEND_INT8]
+    if importlib.util.find_spec("optimum") is not None:
+        backends.append(emotion_classifier.BACKEND_ONNX)
+    for backend in backends:
+        classifier = _create_classifier(backend, cache_size=0)
+        after = run_benchmark(f"{backend}, batched", lambda: classifier.classify(_TRANSCRIPTS), _ITERATIONS, "windows")
+        print_speedup(before, after)
+
+    # the repeated transcripts of the window are classified once, then all are cached
+    cached_classifier = _create_classifier(emotion_classifier.BACKEND_PIPELINE, cache_size=256)
+    after = run_benchmark("pipeline, batched and cached", lambda: cached_classifier.classify(_TRANSCRIPTS),
+                          _ITERATIONS, "windows")
+    print_speedup(before, after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Micro-benchmark of running a coroutine from a synchronous caller, comparing an event loop created and closed for
+each call (previously in running_data_handler) with the shared background event loop.
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_event_loop
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env, run_benchmark, print_speedup
+
+setup_benchmark_env()
+
+# pylint: disable=wrong-import-position
+import asyncio
+
+from Utilities.event_loop import BackgroundEventLoop
+
+_ITERATIONS = 5000
+
+
+async def _map_request():
+    return None
+
+
+def _run_with_new_event_loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    result = loop.run_until_complete(_map_request())
+    loop.close()
+    return result
+
+
+def main():
+    background_event_loop = BackgroundEventLoop("benchmark_event_loop")
+
+    print("Running a coroutine from a synchronous caller")
+    before = run_benchmark("new event loop per call", _run_with_new_event_loop, _ITERATIONS, "calls")
+    after = run_benchmark("shared background event loop", lambda: background_event_loop.run(_map_request()),
+                          _ITERATIONS, "calls")
+    print_speedup(before, after)
+
+    background_event_loop.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark of the distances between consecutive points of 10k and 100k point tracks, comparing geographiclib for each
+pair (calculate_distance) with the vectorized haversine and accurate (Vincenty) distances, and the cumulative
+distances and resampling of the tracks.
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_geodesic
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env, run_benchmark, print_speedup
+
+setup_benchmark_env()
+
+# pylint: disable=wrong-import-position
+import numpy as np
+
+from APIs.maps import maps_util
+
+_TRACK_SIZES = (10_000, 100_000)
+_STEP_DEGREES = 0.0001  # about 10 m between consecutive points
+_RESAMPLE_SPACING = 30  # m
+
+
+def _create_track(num_points):
+    rng = np.random.default_rng(0)
+    steps = rng.normal(0, _STEP_DEGREES, (num_points, 2))
+    return np.array([1.2946, 103.7749]) + np.cumsum(steps, axis=0)
+
+
+def _calculate_track_distances_by_pair(track):
+    """
+    Distances calculated with geographiclib for each pair of consecutive points
+    """
+    return [maps_util.calculate_distance(track[i][0], track[i][1], track[i + 1][0], track[i + 1][1])
+            for i in range(len(track) - 1)]
+
+
+def main():
+    for track_size in _TRACK_SIZES:
+        track = _create_track(track_size)
+        track_list = track.tolist()
+        iterations = max(1, 100_000 // track_size)
+
+        print(f"Track of {track_size:,} points")
+        before = run_benchmark("geographiclib for each pair", lambda: _calculate_track_distances_by_pair(track_list),
+                               1, "tracks")
+        after = run_benchmark("haversine, vectorized", lambda: maps_util.calculate_track_distances(track),
+                              iterations * 10, "tracks")
+        print_speedup(before, after)
+        after = run_benchmark("accurate (Vincenty), vectorized",
+                              lambda: maps_util.calculate_track_distances(track, accurate=True), iterations, "tracks")
+        print_speedup(before, after)
+        run_benchmark("bearings, haversine, vectorized", lambda: maps_util.calculate_track_bearings(track),
+                      iterations * 10, "tracks")
+        run_benchmark("cumulative distances, haversine", lambda: maps_util.calculate_cumulative_distances(track),
+                      iterations * 10, "tracks")
+        run_benchmark(f"resample to {_RESAMPLE_SPACING} m, haversine",
+                      lambda: maps_util.resample_track(track, _RESAMPLE_SPACING), iterations * 10, "tracks")
+
+        errors = np.abs(maps_util.calculate_track_distances(track, accurate=True) -
+                        _calculate_track_distances_by_pair(track_list))
+        print(f"Max difference of the accurate distances: {errors.max() * 1000:.4f} mm\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of the image similarity of two 720p frames, comparing the pixel by pixel comparison in Python with the
+vectorized comparison (full size and downscaled), the perceptual hash, and the batch comparison with 10 frames.
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_image_similarity
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env, run_benchmark, print_speedup
+
+setup_benchmark_env()
+
+# pylint: disable=wrong-import-position
+import numpy as np
+from PIL import Image
+
+from Utilities import image_utility
+
+_THRESHOLD = 5
+_NUM_REFERENCE_FRAMES = 10
+
+
+def _get_similarity_images_by_pixel(image1, image2, threshold):
+    """
+    The previous implementation of `image_utility.get_similarity_images`
+    """
+    if image1.size != image2.size or image1.mode != image2.mode:
+        return False
+
+    pixel_count = image1.size[0] * image1.size[1]
+    pixel_diff_count = 0
+
+    pixels1 = image1.load()
+    pixels2 = image2.load()
+
+    for x in range(image1.size[0]):
+        for y in range(image1.size[1]):
+            if image_utility.get_pixel_diff(pixels1[x, y], pixels2[x, y]) > threshold:
+                pixel_diff_count += 1
+
+    return 1 - (pixel_diff_count / pixel_count)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    frame1 = rng.integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+    frame2 = np.clip(frame1 + rng.integers(-8, 8, frame1.shape), 0, 255).astype(np.uint8)
+    image1 = Image.fromarray(frame1)
+    image2 = Image.fromarray(frame2)
+    reference_frames = [frame2] * _NUM_REFERENCE_FRAMES
+    reference_hashes = np.stack([image_utility.get_perceptual_hash(frame) for frame in reference_frames])
+
+    print("Similarity of two 720p frames")
+    before = run_benchmark("pixel by pixel (Python)",
+                           lambda: _get_similarity_images_by_pixel(image1, image2, _THRESHOLD), 1, "pairs")
+    after = run_benchmark("vectorized", lambda: image_utility.get_similarity_images(image1, image2, _THRESHOLD), 20,
+                          "pairs")
+    print_speedup(before, after)
+    after = run_benchmark("vectorized, downscaled (0.25)",
+                          lambda: image_utility.get_similarity_frames(frame1, frame2, _THRESHOLD, scale=0.25), 100,
+                          "pairs")
+    print_speedup(before, after)
+    after = run_benchmark("perceptual hash", lambda: image_utility.get_perceptual_hash_similarity(
+        image_utility.get_perceptual_hash(frame1), image_utility.get_perceptual_hash(frame2)), 100, "pairs")
+    print_speedup(before, after)
+
+    print(f"\nSimilarity of a 720p frame with {_NUM_REFERENCE_FRAMES} reference frames")
+    run_benchmark("batch, downscaled (0.25)", lambda: image_utility.get_similarity_frames_batch(
+        frame1, reference_frames, _THRESHOLD, scale=0.25), 20, "batches")
+    run_benchmark("batch, full size", lambda: image_utility.get_similarity_frames_batch(
+        frame1, reference_frames, _THRESHOLD), 5, "batches")
+    run_benchmark("batch, perceptual hash (cached reference hashes)",
+                  lambda: image_utility.get_perceptual_hash_similarity(image_utility.get_perceptual_hash(frame1),
+                                                                       reference_hashes), 100, "batches")
+
+
+if __name__ == "__main__":
+    main()
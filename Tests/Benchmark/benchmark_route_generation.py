@@ -0,0 +1,77 @@
+"""
+Benchmark of the random route generation with a local stub of the directions API (200 ms per request), comparing
+the sequential directions requests with the concurrent directions requests.
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_route_generation
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env, run_benchmark, print_speedup
+
+setup_benchmark_env()
+
+# pylint: disable=wrong-import-position
+import asyncio
+import math
+import random
+
+import openrouteservice
+
+from APIs.maps import maps, maps_util
+from APIs.maps.maps_config import MapsConfig, RouteGenerationState
+from APIs.maps.route_data import RouteData
+from APIs.ors_api import ors_api
+from Tests.Benchmark.stub_directions_server import start_stub_directions_server
+from base_keys import DIRECTIONS_OPTION_ORS, ORS_OPTION_DOCKER
+
+_DELAY_SECONDS = 0.2
+_ITERATIONS = 5
+_ORIGIN = [1.2966, 103.7764]
+_TARGET_DISTANCE_KM = 3
+_DIST_FACTOR = 5
+
+
+async def _generate_random_routes_sequentially(start_time, bearing, target_dist, origin, option, ors_option=0,
+                                               route_state=None):
+    """
+    The previous implementation of `maps.generate_random_routes` (without the ordering)
+    """
+    possible_routes = []
+    for i in range(0, 360, MapsConfig.angle_increment):
+        waypoints = maps_util.pick_random_points(origin, target_dist / route_state.dist_factor, MapsConfig.sectors,
+                                                 i * math.pi / 180)
+        direction_data = await maps.get_walking_directions(start_time, waypoints, bearing, option, ors_option)
+        dest_dist = direction_data.dest_dist / 1000
+        if abs(dest_dist - target_dist) <= MapsConfig.dist_threshold * target_dist:
+            possible_routes.append(RouteData(waypoints=waypoints, direction_data=direction_data))
+            if len(possible_routes) == 3:
+                break
+        elif dest_dist < target_dist:
+            route_state.dist_factor *= 1 - MapsConfig.dist_factor_growth
+        else:
+            route_state.dist_factor *= 1 + MapsConfig.dist_factor_growth
+
+    return possible_routes
+
+
+def _run(generate_random_routes):
+    random.seed(0)
+
+    routes = asyncio.run(generate_random_routes(0, 0, _TARGET_DISTANCE_KM, _ORIGIN, DIRECTIONS_OPTION_ORS,
+                                                ORS_OPTION_DOCKER, RouteGenerationState(_DIST_FACTOR)))
+    assert len(routes) == MapsConfig.num_routes
+
+
+def main():
+    _, base_url = start_stub_directions_server(_DELAY_SECONDS)
+    ors_api._client = openrouteservice.Client(base_url=base_url)
+
+    print(f"Generating {MapsConfig.num_routes} routes, directions API delay: {_DELAY_SECONDS * 1000:.0f} ms")
+    before = run_benchmark("sequential requests", lambda: _run(_generate_random_routes_sequentially), _ITERATIONS,
+                           "route sets")
+    after = run_benchmark(f"concurrent requests (max {MapsConfig.max_concurrent_directions})",
+                          lambda: _run(maps.generate_random_routes), _ITERATIONS, "route sets")
+    print_speedup(before, after)
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Micro-benchmark of sending a websocket message to the subscribers of a component, comparing the per-message lookups
+(configuration, component instance, entry function and datatype name) with the compiled routes.
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_routing
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env, run_benchmark, print_speedup
+
+setup_benchmark_env()
+
+# pylint: disable=wrong-import-position
+import base_keys
+from base_component import BaseComponent
+from DataFormat import datatypes_helper
+from Memory import Memory
+from Tests.Integration.test_db_util import set_test_db_environ
+from Utilities import config_utility, endpoint_utility
+
+_NUM_SUBSCRIBERS = 5
+_ITERATIONS = 100000
+
+
+class BenchmarkReceiver(BaseComponent):
+    SUPPORTED_DATATYPES = {
+        "REQUEST_TEMPLATE_DATA",
+    }
+
+    def run(self, raw_data):
+        pass
+
+
+def _setup_pipes():
+    subscribers = [f"service:receiver{i}" for i in range(_NUM_SUBSCRIBERS)]
+    config_utility.configuration = {
+        config_utility.CONFIGURATION_CHANNEL_PIPES_KEY: {base_keys.WEBSOCKET_WIDGET: subscribers},
+        config_utility.CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY: {
+            subscriber: "receiver.BenchmarkReceiver.run" for subscriber in subscribers
+        },
+        config_utility.CONFIGURATION_CHANNELS_OPTIONS_KEY: {},
+    }
+    for subscriber in subscribers:
+        endpoint_utility.component_instances[subscriber] = BenchmarkReceiver(subscriber)
+
+
+def _send_with_lookups(publisher_name, message):
+    """
+    The previous implementation of `BaseComponent.send_to_component`, which looks up everything for every message
+    """
+    all_subscribers = config_utility.get_config()[config_utility.CONFIGURATION_CHANNEL_PIPES_KEY][publisher_name]
+    for subscriber in all_subscribers:
+        instance = endpoint_utility.get_component_instance(subscriber)
+
+        datatype = datatypes_helper.get_name_by_key(message[base_keys.WEBSOCKET_DATATYPE])
+        if not instance.is_supported_datatype(datatype):
+            continue
+
+        entry_func = endpoint_utility.get_entry_func_of(subscriber)
+        getattr(instance, entry_func)(message)
+
+
+def _send_with_routes(publisher, message):
+    """
+    The routing part of `BaseComponent.send_to_component` (without building the message)
+    """
+    for route in publisher.get_routes():
+        if route.accepts(message):
+            route.entry_func(message)
+
+
+def main():
+    set_test_db_environ()
+    Memory.init()
+    _setup_pipes()
+
+    publisher = BaseComponent(base_keys.WEBSOCKET_WIDGET)
+    message = {
+        base_keys.WEBSOCKET_DATATYPE: datatypes_helper.get_key_by_name("REQUEST_TEMPLATE_DATA"),
+        base_keys.WEBSOCKET_MESSAGE: {},
+    }
+
+    print(f"Routing a websocket message to {_NUM_SUBSCRIBERS} subscribers")
+    before = run_benchmark("per-message lookups", lambda: _send_with_lookups(publisher.name, message),
+                           _ITERATIONS, "messages")
+    after = run_benchmark("compiled routes", lambda: _send_with_routes(publisher, message), _ITERATIONS, "messages")
+    print_speedup(before, after)
+    run_benchmark("send_to_component (incl. building the message)", lambda: publisher.send_to_component(**message),
+                  _ITERATIONS, "messages")
+
+    Memory.close()
+
+
+if __name__ == "__main__":
+    main()
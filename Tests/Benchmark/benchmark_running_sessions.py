@@ -0,0 +1,94 @@
+"""
+Load test of the running service with N simulated watches (N = 1, 10 and 100), each in its own running session and
+sending the WearOS data of the demo route at 50x the 1 Hz rate. It prints the per-session latency of the WearOS data
+in RunningCoachService (queue lag + handler). The database and the websocket output are replaced by no-ops.
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_running_sessions
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env
+from Tests.Integration.test_db_util import set_test_db_environ
+
+setup_benchmark_env()
+set_test_db_environ()
+
+# pylint: disable=wrong-import-position
+import time
+from unittest import mock
+
+from Services.running_service import running_session
+from Services.running_service.running_coach_service import RunningCoachService
+from Services.running_service.running_keys import EXERCISE_WEAR_OS_DATA
+from Services.running_service.running_service import RunningService
+from Services.running_service.running_service_params import BaseParamsState
+from Tests.RunningFpv.running_demo_route import demo_route
+from Utilities import metrics_utility
+from base_keys import ORIGIN_KEY, SESSION_ID_KEY, WEBSOCKET_DATATYPE, WEBSOCKET_MESSAGE
+
+_NUM_SESSIONS = [1, 10, 100]
+_NUM_MESSAGES = 20
+_INTERVAL_SECONDS = 1 / 50
+_TIMEOUT_SECONDS = 60
+
+
+def _create_wear_os_message(session_id, index):
+    location = demo_route[index % len(demo_route)]
+    return {
+        ORIGIN_KEY: "wearOS",
+        SESSION_ID_KEY: session_id,
+        WEBSOCKET_DATATYPE: EXERCISE_WEAR_OS_DATA,
+        WEBSOCKET_MESSAGE: {"start_time": 0, "calories": index, "heart_rate": 120, "distance": index * 3.0,
+                            "speed": 3.0, "bearing": 0, "curr_lat": location[0], "curr_lng": location[1]},
+    }
+
+
+def _wait_for_handled(metric_names, count):
+    deadline = time.perf_counter() + _TIMEOUT_SECONDS
+    while time.perf_counter() < deadline:
+        latencies = [metrics_utility.get_latency(metric_name) for metric_name in metric_names]
+        if all(latency is not None and latency["count"] >= count for latency in latencies):
+            return
+        time.sleep(0.01)
+
+
+def _run_sessions(num_sessions):
+    metrics_utility.reset_metrics()
+    running_service = RunningService(name="RunningService")
+    session_ids = [f"watch-{i}" for i in range(num_sessions)]
+    for session_id in session_ids:
+        running_service.get_runner(session_id)
+        running_session.get_session(session_id).get_state(BaseParamsState).chosen_route_id = 1
+
+    for index in range(_NUM_MESSAGES):
+        start_time = time.perf_counter()
+        for session_id in session_ids:
+            running_service.run(_create_wear_os_message(session_id, index))
+        time.sleep(max(_INTERVAL_SECONDS - (time.perf_counter() - start_time), 0))
+
+    metric_prefixes = [f"running_service.RunningCoachService:{session_id}" for session_id in session_ids]
+    _wait_for_handled([f"{metric_prefix}.handler" for metric_prefix in metric_prefixes], _NUM_MESSAGES)
+    for session_id in session_ids:
+        running_service.remove_runner(session_id)
+
+    # mean latency of each session
+    session_latencies_ms = sorted(metrics_utility.get_latency(f"{metric_prefix}.queue_wait")["mean_ms"] +
+                                  metrics_utility.get_latency(f"{metric_prefix}.handler")["mean_ms"]
+                                  for metric_prefix in metric_prefixes)
+    max_queue_lag_ms = max(metrics_utility.get_latency(f"{metric_prefix}.queue_wait")["max_ms"]
+                           for metric_prefix in metric_prefixes)
+    print(f"{num_sessions:>8} {session_latencies_ms[len(session_latencies_ms) // 2]:>16.2f} "
+          f"{session_latencies_ms[-1]:>16.2f} {max_queue_lag_ms:>18.2f}")
+
+
+def main():
+    with mock.patch.object(RunningService, "send_to_component"), \
+            mock.patch.object(RunningCoachService, "insert_data_to_db"), \
+            mock.patch.object(RunningCoachService, "get_training_update"):
+        print(f"WearOS data latency in RunningCoachService, {_NUM_MESSAGES} messages per session at "
+              f"{1 / _INTERVAL_SECONDS:.0f} Hz")
+        print(f"{'Sessions':>8} {'Median (ms)':>16} {'Slowest (ms)':>16} {'Max queue lag (ms)':>18}")
+        for num_sessions in _NUM_SESSIONS:
+            _run_sessions(num_sessions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark of the static map paths of running tracks (coordinates every 30 m), comparing the URL length and the time
+to build the path of the full track and of the simplified track (Geoapify list of coordinates, Google encoded
+polyline), and the memory of the stored track.
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_track_compression
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env, run_benchmark, print_speedup
+
+setup_benchmark_env()
+
+# pylint: disable=wrong-import-position
+import sys
+
+import googlemaps
+import numpy as np
+
+from APIs.maps.maps_config import MapsConfig
+from APIs.maps.track_compression import TrackBuffer, simplify_for_static_map
+
+# a marathon, and a (very) long session
+_TRACK_SIZES = (1_400, 10_000)
+_POINT_DISTANCE_DEGREES = 0.0003  # about 30 m, see RunningServiceConfig.threshold_coords_distance
+_GPS_NOISE_DEGREES = 0.00003  # about 3 m
+
+
+def _get_geoapify_path(coordinates):
+    return "polyline:" + ",".join(f"{lng:.6f},{lat:.6f}" for lat, lng in coordinates)
+
+
+def _get_google_path(coordinates):
+    return "enc:" + googlemaps.convert.encode_polyline(coordinates)
+
+
+def _get_simplified_track(track):
+    return simplify_for_static_map(track, MapsConfig.static_map_max_points, MapsConfig.static_map_tolerance)
+
+
+def _create_track(num_points):
+    """
+    Winding track with GPS noise
+    """
+    rng = np.random.default_rng(0)
+    headings = np.cumsum(rng.normal(0, 0.2, num_points))
+    steps = _POINT_DISTANCE_DEGREES * np.column_stack((np.cos(headings), np.sin(headings)))
+    noise = rng.normal(0, _GPS_NOISE_DEGREES, (num_points, 2))
+    return (np.array([1.2946, 103.7749]) + np.cumsum(steps, axis=0) + noise).tolist()
+
+
+def main():
+    for num_points in _TRACK_SIZES:
+        track = _create_track(num_points)
+        simplified_track = _get_simplified_track(track)
+
+        print(f"Static map path of a {num_points:,} point track ({len(simplified_track)} points simplified)")
+        print(f"{'Geoapify URL path, full / simplified':<50} {len(_get_geoapify_path(track)):>8,} / "
+              f"{len(_get_geoapify_path(simplified_track)):,} chars")
+        print(f"{'Google URL path, full / simplified':<50} {len(_get_google_path(track)):>8,} / "
+              f"{len(_get_google_path(simplified_track)):,} chars")
+        run_benchmark("simplify", lambda: _get_simplified_track(track), 20, "tracks")
+        before = run_benchmark("Google path, full", lambda: _get_google_path(track), 20, "paths")
+        after = run_benchmark("Google path, simplified", lambda: _get_google_path(simplified_track), 20, "paths")
+        print_speedup(before, after)
+
+        track_buffer = TrackBuffer(track)
+        list_size = sys.getsizeof(track) + sum(sys.getsizeof(point) + 2 * sys.getsizeof(point[0]) for point in track)
+        print(f"{'Memory of the track, list / TrackBuffer':<50} {list_size:>8,} / "
+              f"{sys.getsizeof(track_buffer._values):,} bytes\n")  # pylint: disable=protected-access
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark of preparing an utterance (WAV bytes from AudioWidget) for Whisper, comparing writing a temporary file
+which Whisper decodes with ffmpeg (previously in Transcriber) with decoding the WAV in memory. The transcription is
+the same for both, so it is not included. It uses the recorded sample audio at its own rate (22.05 kHz) and at the
+microphone rate (16 kHz).
+
+Usage (from the project root): python -m Tests.Benchmark.benchmark_transcription_decode
+"""
+from Tests.Benchmark.benchmark_util import setup_benchmark_env, run_benchmark, print_speedup
+
+setup_benchmark_env()
+
+# pylint: disable=wrong-import-position
+import io
+import os
+from tempfile import NamedTemporaryFile
+
+import numpy as np
+import torchaudio
+import whisper
+
+from Utilities import audio_utility
+
+_SAMPLE_FILE = os.path.join("Tests", "Unit", "utility_tests", "sample_audio.wav")
+# length of an utterance
+_UTTERANCE_SECONDS = 5
+_ITERATIONS = 50
+
+
+def _load_utterance(sample_rate):
+    audio_data, original_rate = torchaudio.load(_SAMPLE_FILE)
+    audio_data = audio_data[:, :_UTTERANCE_SECONDS * original_rate]
+    if original_rate != sample_rate:
+        audio_data = torchaudio.transforms.Resample(original_rate, sample_rate)(audio_data)
+
+    wav_data = io.BytesIO()
+    torchaudio.save(wav_data, audio_data, sample_rate, format="wav", encoding="PCM_S", bits_per_sample=16)
+    return wav_data
+
+
+def _decode_with_temp_file(wav_data, temp_file):
+    wav_data.seek(0)
+    with open(temp_file, "w+b") as f:
+        f.write(wav_data.read())
+    return whisper.load_audio(temp_file)
+
+
+def _decode_in_memory(wav_data, audio_buffer):
+    samples, sample_rate = audio_utility.decode_wav(wav_data, out=audio_buffer)
+    return audio_utility.resample(samples, sample_rate, whisper.audio.SAMPLE_RATE)
+
+
+def main():
+    with NamedTemporaryFile(delete=False) as temp_file:
+        temp_file_path = temp_file.name
+    audio_buffer = np.empty(30 * whisper.audio.SAMPLE_RATE, dtype=np.float32)
+
+    for sample_rate in [22050, whisper.audio.SAMPLE_RATE]:
+        wav_data = _load_utterance(sample_rate)
+        print(f"Decoding a {_UTTERANCE_SECONDS} s utterance at {sample_rate} Hz to 16 kHz")
+        before = run_benchmark("temporary file + ffmpeg", lambda: _decode_with_temp_file(wav_data, temp_file_path),
+                               _ITERATIONS, "utterances")
+        after = run_benchmark("in memory", lambda: _decode_in_memory(wav_data, audio_buffer), _ITERATIONS,
+                              "utterances")
+        print_speedup(before, after)
+
+    os.remove(temp_file_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import time
+
+from Tests.conftest import initialize_test_env
+
+
+def setup_benchmark_env():
+    """
+    Load the test environment variables (.env.test), which are required to import most of the server modules
+    """
+    initialize_test_env()
+
+
+def run_benchmark(name, func, iterations=1000, unit="ops"):
+    '''
+    Run the function for the given iterations and print the throughput
+
+    :param name: name of the benchmark
+    :param func: function without parameters
+    :param iterations: number of calls
+    :param unit: unit of the throughput (e.g., "messages")
+    :return: throughput in calls per second
+    '''
+    func()  # warm up, e.g., lazy initialisation
+
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed_seconds = time.perf_counter() - start_time
+
+    throughput = iterations / elapsed_seconds
+    print(f"{name:<50} {throughput:>14,.0f} {unit}/s  ({elapsed_seconds * 1e6 / iterations:,.2f} us/call)")
+    return throughput
+
+
+def print_speedup(before, after):
+    print(f"{'Speed-up':<50} {after / before:>14,.1f} x")
@@ -0,0 +1,107 @@
+"""
+A local stub of the OpenRouteService directions API (foot-walking, geojson), with a configurable response delay, to
+benchmark the route generation offline.
+
+The stub returns the straight lines between the requested coordinates as the route, with a detour factor for the
+distance.
+
+Usage (from the project root): python -m Tests.Benchmark.stub_directions_server [delay_seconds]
+    serves on http://localhost:8080/ors, i.e., the local ORS docker (ORS_OPTION = 1)
+"""
+import json
+import math
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_DEFAULT_PORT = 8080
+_BASE_PATH = "/ors"
+_DETOUR_FACTOR = 1.2
+_WALKING_SPEED_M_S = 1.4
+_EARTH_RADIUS_M = 6371000
+
+
+def _get_distance_m(coord1, coord2):
+    lng1, lat1, lng2, lat2 = map(math.radians, [coord1[0], coord1[1], coord2[0], coord2[1]])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * math.asin(math.sqrt(a)) * _DETOUR_FACTOR
+
+
+def _get_step(distance, location, instruction):
+    return {
+        "distance": distance,
+        "duration": distance / _WALKING_SPEED_M_S,
+        "type": 11,
+        "instruction": instruction,
+        "name": "-",
+        "way_points": [0, 1],
+        "maneuver": {"location": location, "bearing_before": 0, "bearing_after": 90},
+    }
+
+
+def get_directions_response(coordinates):
+    '''
+    :param coordinates: [[lng, lat], ...]
+    :return: ORS directions response in geojson format
+    '''
+    segments = []
+    for start, end in zip(coordinates, coordinates[1:]):
+        distance = _get_distance_m(start, end)
+        segments.append({
+            "distance": distance,
+            "duration": distance / _WALKING_SPEED_M_S,
+            "steps": [_get_step(distance, start, "Head east"), _get_step(0, end, "Arrive at your destination")],
+        })
+
+    total_distance = sum(segment["distance"] for segment in segments)
+    return {
+        "type": "FeatureCollection",
+        "features": [{
+            "type": "Feature",
+            "properties": {
+                "segments": segments,
+                "summary": {"distance": total_distance, "duration": total_distance / _WALKING_SPEED_M_S},
+            },
+            "geometry": {"coordinates": coordinates, "type": "LineString"},
+        }],
+    }
+
+
+def _create_handler(delay_seconds):
+    class StubDirectionsHandler(BaseHTTPRequestHandler):
+        def do_POST(self):  # pylint: disable=invalid-name
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(delay_seconds)
+
+            response = json.dumps(get_directions_response(body["coordinates"])).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            pass
+
+    return StubDirectionsHandler
+
+
+def start_stub_directions_server(delay_seconds=0.2, port=0):
+    '''
+    Start the stub server in a daemon thread
+
+    :param delay_seconds: delay of each response, i.e., the round trip time of the directions API
+    :param port: 0 to use a free port
+    :return: (server, base url for openrouteservice.Client), call server.shutdown() to stop
+    '''
+    server = ThreadingHTTPServer(("127.0.0.1", port), _create_handler(delay_seconds))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server, f"http://127.0.0.1:{server.server_address[1]}{_BASE_PATH}"
+
+
+if __name__ == "__main__":
+    _delay_seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 0.2
+    ThreadingHTTPServer(("127.0.0.1", _DEFAULT_PORT), _create_handler(_delay_seconds)).serve_forever()
@@ -0,0 +1,37 @@
+from Processors.EmotionClassifier.emotion_score_cache import EmotionScoreCache
+
+
+def test_whitespace_is_normalized():
+    cache = EmotionScoreCache()
+    cache.put(" Okay. ", {"joy": 0.5})
+
+    assert cache.get("Okay.") == {"joy": 0.5}
+    # the model is case sensitive
+    assert cache.get("okay.") is None
+
+
+def test_least_recently_used_is_evicted():
+    cache = EmotionScoreCache(max_entries=2)
+    cache.put("Yes.", {"joy": 0.1})
+    cache.put("No.", {"anger": 0.2})
+    cache.get("Yes.")
+    cache.put("Okay.", {"neutral": 0.9})
+
+    assert len(cache) == 2
+    assert cache.get("No.") is None
+    assert cache.get("Yes.") == {"joy": 0.1}
+
+
+def test_cached_scores_are_copies():
+    cache = EmotionScoreCache()
+    cache.put("Yes.", {"joy": 0.1})
+    cache.get("Yes.")["joy"] = 1
+
+    assert cache.get("Yes.") == {"joy": 0.1}
+
+
+def test_disabled_cache():
+    cache = EmotionScoreCache(max_entries=0)
+    cache.put("Yes.", {"joy": 0.1})
+
+    assert cache.get("Yes.") is None
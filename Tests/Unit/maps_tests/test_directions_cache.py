@@ -0,0 +1,124 @@
+import pytest
+
+from APIs.maps import directions_cache, maps_util
+from APIs.maps.direction_data import DirectionData
+from APIs.maps.directions_cache import DirectionsCache
+from Utilities import metrics_utility
+
+_OPTION = (0, 1, 0)
+_ORIGIN = [1.3000, 103.7700]
+_DESTINATION = [1.3000, 103.7800]  # about 1.1 km to the east
+# the route goes north for about 110 m, then east to the destination
+_POLYLINE = [_ORIGIN, [1.3010, 103.7700], [1.3010, 103.7800], _DESTINATION]
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics_utility.reset_metrics()
+    yield
+    metrics_utility.reset_metrics()
+
+
+def _create_direction_data():
+    return DirectionData(start_time=1, update_time=1, dest_dist=1330, dest_dist_str="1330 m", dest_duration=1000,
+                         dest_duration_str="17 min", curr_dist=110, curr_dist_str="110 m", curr_duration=100,
+                         curr_duration_str="2 min", curr_instr="Head north", num_steps="3", waypoint_dist=1330,
+                         waypoint_dist_str="1330 m", waypoint_duration=1000, waypoint_duration_str="17 min",
+                         polyline=_POLYLINE)
+
+
+def test_get_same_cell():
+    cache = DirectionsCache()
+    cache.put([_ORIGIN, _DESTINATION], _OPTION, _create_direction_data())
+
+    # a few metres from the cached origin
+    direction_data = cache.get([[1.30001, 103.77001], _DESTINATION], _OPTION)
+
+    assert direction_data.dest_dist == 1330
+    assert direction_data.polyline == _POLYLINE
+    assert direction_data.update_time > 1
+    assert cache.get_stats()["hits"] == 1
+    assert metrics_utility.get_counter(directions_cache.METRIC_HITS) == 1
+
+
+def test_get_on_cached_route_is_trimmed():
+    cache = DirectionsCache()
+    cache.put([_ORIGIN, _DESTINATION], _OPTION, _create_direction_data())
+
+    # about 55 m north of the cached origin, on the route
+    runner = [1.3005, 103.7700]
+    direction_data = cache.get([runner, _DESTINATION], _OPTION)
+
+    assert direction_data.curr_dist == pytest.approx(55, abs=2)
+    assert direction_data.curr_dist_str == f"{direction_data.curr_dist} m"
+    assert direction_data.dest_dist == pytest.approx(1275, abs=2)
+    assert direction_data.curr_duration == pytest.approx(50, abs=2)
+    assert direction_data.curr_instr == "Head north"
+    assert direction_data.polyline == [runner] + _POLYLINE[1:]
+    assert cache.get_stats()["trimmed_hits"] == 1
+    assert metrics_utility.get_counter(directions_cache.METRIC_TRIMMED_HITS) == 1
+
+
+@pytest.mark.parametrize("runner", [
+    [1.3005, 103.7710],  # about 110 m off the route
+    [1.3010, 103.7710],  # passed the turn, the instruction is outdated
+])
+def test_get_not_reusable_route_is_miss(runner):
+    cache = DirectionsCache()
+    cache.put([_ORIGIN, _DESTINATION], _OPTION, _create_direction_data())
+
+    assert cache.get([runner, _DESTINATION], _OPTION) is None
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_get_different_waypoints_or_option_is_miss():
+    cache = DirectionsCache()
+    cache.put([_ORIGIN, _DESTINATION], _OPTION, _create_direction_data())
+
+    assert cache.get([_ORIGIN, [1.3100, 103.7800]], _OPTION) is None
+    assert cache.get([_ORIGIN, _DESTINATION], (0, 2, 0)) is None
+    assert cache.get_hit_rate() == 0
+
+
+def test_get_expired_is_miss(mocker):
+    cache = DirectionsCache(ttl_seconds=60)
+    monotonic = mocker.patch.object(directions_cache.time, "monotonic", return_value=100)
+    cache.put([_ORIGIN, _DESTINATION], _OPTION, _create_direction_data())
+
+    monotonic.return_value = 161
+    assert cache.get([_ORIGIN, _DESTINATION], _OPTION) is None
+    assert cache.get_stats()["size"] == 0
+
+
+def test_put_evicts_least_recently_used():
+    cache = DirectionsCache(max_entries=2)
+    destinations = [[1.3000, 103.7800], [1.3000, 103.7900], [1.3000, 103.8000]]
+    cache.put([_ORIGIN, destinations[0]], _OPTION, _create_direction_data())
+    cache.put([_ORIGIN, destinations[1]], _OPTION, _create_direction_data())
+    cache.get([_ORIGIN, destinations[0]], _OPTION)
+    cache.put([_ORIGIN, destinations[2]], _OPTION, _create_direction_data())
+
+    assert cache.get([_ORIGIN, destinations[0]], _OPTION) is not None
+    assert cache.get([_ORIGIN, destinations[1]], _OPTION) is None
+    assert cache.get([_ORIGIN, destinations[2]], _OPTION) is not None
+    assert cache.get_hit_rate() == pytest.approx(0.75)
+    assert metrics_utility.get_gauge(directions_cache.METRIC_HIT_RATE) == pytest.approx(0.75)
+
+
+def test_put_error_is_not_cached():
+    cache = DirectionsCache()
+    cache.put([_ORIGIN, _DESTINATION], _OPTION, DirectionData(error_message="error"))
+
+    assert cache.get([_ORIGIN, _DESTINATION], _OPTION) is None
+
+
+def test_cells_are_about_cell_size_away_from_equator():
+    cache = DirectionsCache(cell_size_m=15)
+    lat = 50.0
+    # about 1 km to the east, at 50 degrees of latitude
+    lng_delta = 1000 / maps_util.calculate_distance(lat, 0, lat, 1)
+    west_cell = cache._get_cell([lat, 8.0])
+    east_cell = cache._get_cell([lat, 8.0 + lng_delta])
+
+    assert east_cell[0] == west_cell[0]
+    assert east_cell[1] - west_cell[1] == pytest.approx(1000 / 15, abs=1)
@@ -1,3 +1,8 @@
+import numpy as np
+import pytest
+
+from APIs.maps import maps_util
+
 coordinates = [(1.293749, 103.775822),
                (1.293690, 103.775317),
                (1.2932756, 103.7750778),
@@ -12,3 +17,61 @@ coordinates = [(1.293749, 103.775822),
 
 size = (600, 400)
 threshold_distance = 20.0
+
+
+def _get_consecutive_pairs():
+    lats, lngs = np.asarray(coordinates).T
+    return lats[:-1], lngs[:-1], lats[1:], lngs[1:]
+
+
+def test_calculate_distances_accurate_same_as_calculate_distance():
+    expected_distances = [maps_util.calculate_distance(*pair) for pair in zip(*_get_consecutive_pairs())]
+
+    assert maps_util.calculate_distances(*_get_consecutive_pairs(), accurate=True) == pytest.approx(
+        expected_distances, abs=1e-3)
+    assert maps_util.calculate_distances(*_get_consecutive_pairs()) == pytest.approx(expected_distances, rel=1e-2)
+
+
+def test_calculate_distances_accurate_nearly_antipodal():
+    distances = maps_util.calculate_distances([0, 1.3], [0, 103.77], [0.5, 1.3], [179.7, 103.77], accurate=True)
+
+    assert distances == pytest.approx([maps_util.calculate_distance(0, 0, 0.5, 179.7), 0], abs=1e-3)
+
+
+def test_calculate_bearings_same_as_calculate_bearing_after():
+    expected_bearings = [maps_util.calculate_bearing_after(*pair) for pair in zip(*_get_consecutive_pairs())]
+
+    # calculate_bearing_after truncates the bearings
+    assert maps_util.calculate_bearings(*_get_consecutive_pairs(), accurate=True).astype(int) == pytest.approx(
+        expected_bearings, abs=1)
+    assert maps_util.calculate_track_bearings(coordinates) == pytest.approx(expected_bearings, abs=2)
+
+
+def test_calculate_cumulative_distances():
+    cumulative_distances = maps_util.calculate_cumulative_distances(coordinates, accurate=True)
+
+    assert cumulative_distances[0] == 0
+    assert np.diff(cumulative_distances) == pytest.approx(maps_util.calculate_track_distances(coordinates, True))
+    assert cumulative_distances[-1] == pytest.approx(
+        sum(maps_util.calculate_distance(*coordinates[i], *coordinates[i + 1]) for i in range(len(coordinates) - 1)))
+
+
+def test_resample_track():
+    resampled_track = maps_util.resample_track(coordinates, threshold_distance)
+    track_distances = maps_util.calculate_track_distances(resampled_track)
+
+    assert resampled_track[0] == pytest.approx(coordinates[0])
+    assert resampled_track[-1] == pytest.approx(coordinates[-1])
+    # the points are on the straight segments between the original points, except at the corners
+    assert np.median(track_distances[:-1]) == pytest.approx(threshold_distance, rel=0.01)
+    assert track_distances.max() <= threshold_distance + 1e-3
+
+
+def test_resample_track_single_point():
+    assert maps_util.resample_track(coordinates[:1], threshold_distance).tolist() == [list(coordinates[0])]
+
+
+def test_resample_track_zero_length():
+    resampled_track = maps_util.resample_track([coordinates[0], coordinates[0]], threshold_distance)
+
+    assert resampled_track.tolist() == [list(coordinates[0]), list(coordinates[0])]
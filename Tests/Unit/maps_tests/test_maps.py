@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from APIs.maps import maps
+from APIs.maps.direction_data import DirectionData
+from APIs.maps.maps_config import MapsConfig, RouteGenerationState
+from base_keys import DIRECTIONS_OPTION_ORS
+
+_TARGET_DISTANCE_KM = 3
+_REQUEST_SECONDS = 0.1
+_DIST_FACTOR = 5
+
+
+def _mock_directions(mocker, dest_dists):
+    '''
+    Mock the (blocking) directions requests, which return the given destination distances in order
+    '''
+    lock = threading.Lock()
+    requested_dists = iter(dest_dists)
+
+    async def find_directions_ors(start_time, coordinates, bearing, option):
+        with lock:
+            dest_dist = next(requested_dists)
+        # the directions clients are blocking
+        time.sleep(_REQUEST_SECONDS)
+        return DirectionData(dest_dist=dest_dist)
+
+    return mocker.patch.object(maps.ors_api, "find_directions_ors", side_effect=find_directions_ors)
+
+
+def test_generate_random_routes_concurrently(mocker):
+    mock_directions = _mock_directions(mocker, [_TARGET_DISTANCE_KM * 1000] * 8)
+
+    start_time = time.perf_counter()
+    routes = asyncio.run(maps.generate_random_routes(0, 0, _TARGET_DISTANCE_KM, [1.29, 103.77],
+                                                     DIRECTIONS_OPTION_ORS))
+    elapsed_seconds = time.perf_counter() - start_time
+
+    # the requests are in flight together, and it stops (without requesting all the angles) once 3 routes are found
+    assert [route.route_id for route in routes] == [1, 2, 3]
+    assert mock_directions.call_count < 360 // MapsConfig.angle_increment
+    assert elapsed_seconds < 2 * _REQUEST_SECONDS
+
+
+def test_generate_random_routes_requests_new_routes(mocker):
+    mock_directions = _mock_directions(mocker, [_TARGET_DISTANCE_KM * 1000] * 16)
+
+    first_routes = asyncio.run(maps.generate_random_routes(0, 0, _TARGET_DISTANCE_KM, [1.29, 103.77],
+                                                           DIRECTIONS_OPTION_ORS))
+    call_count = mock_directions.call_count
+    routes = asyncio.run(maps.generate_random_routes(0, 0, _TARGET_DISTANCE_KM, [1.29, 103.77], DIRECTIONS_OPTION_ORS))
+
+    # the routes of the previous call are not reused
+    assert len(routes) == 3
+    assert not set(map(id, routes)) & set(map(id, first_routes))
+    assert mock_directions.call_count >= call_count + 3
+
+
+def test_generate_random_routes_adjusts_radius(mocker):
+    # the first routes are too short, then the routes are in tolerance
+    _mock_directions(mocker, [1000, 1000] + [_TARGET_DISTANCE_KM * 1000] * 6)
+    route_state = RouteGenerationState(_DIST_FACTOR)
+
+    routes = asyncio.run(maps.generate_random_routes(0, 0, _TARGET_DISTANCE_KM, [1.29, 103.77],
+                                                     DIRECTIONS_OPTION_ORS, route_state=route_state))
+
+    assert len(routes) == 3
+    # increase circle radius for each short route, kept for the next calls with the same state
+    assert route_state.dist_factor == pytest.approx(_DIST_FACTOR * (1 - MapsConfig.dist_factor_growth) ** 2)
+
+
+def test_run_map_request_from_threads(mocker):
+    _mock_directions(mocker, [_TARGET_DISTANCE_KM * 1000] * 4)
+
+    results = []
+
+    def get_directions():
+        results.append(maps.run_map_request(maps.get_walking_directions(0, [], 0, DIRECTIONS_OPTION_ORS), timeout=5))
+
+    threads = [threading.Thread(target=get_directions) for _ in range(4)]
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # the requests of the threads overlap in the shared event loop
+    assert [result.dest_dist for result in results] == [_TARGET_DISTANCE_KM * 1000] * 4
+    assert time.perf_counter() - start_time < 2 * _REQUEST_SECONDS
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from APIs.maps.maps_util import calculate_distance
+from APIs.maps.projected_polyline import ProjectedPolyline
+from Tests.RunningFpv.running_demo_route import demo_route
+
+
+@pytest.mark.parametrize("lat", [1.3, 60.0])
+def test_get_distance_is_geodesic(lat):
+    # about 1 km to the east, the raw lat/lng degrees are distorted at 60 degrees
+    polyline = [[lat, 10.0], [lat, 10.0 + 1 / (111.32 * np.cos(np.radians(lat)))]]
+    projected_polyline = ProjectedPolyline(polyline)
+    location = [lat + 0.0003, 10.001]
+
+    expected_distance = calculate_distance(location[0], location[1], lat, location[1])
+    assert projected_polyline.get_distance(location) == pytest.approx(expected_distance, rel=0.01)
+    assert projected_polyline.length == pytest.approx(1000, rel=0.01)
+
+
+def test_get_distance_beyond_end_is_distance_to_end():
+    projected_polyline = ProjectedPolyline([[1.3000, 103.7700], [1.3010, 103.7700]])
+
+    # about 110 m further to the north
+    assert projected_polyline.get_distance([1.3020, 103.7700]) == pytest.approx(110.5, abs=1)
+
+
+def test_get_nearest():
+    projected_polyline = ProjectedPolyline([[1.3000, 103.7700], [1.3010, 103.7700], [1.3010, 103.7710]])
+
+    distance, along_dist = projected_polyline.get_nearest([1.3012, 103.7705])
+
+    assert distance == pytest.approx(22, abs=1)
+    assert along_dist == pytest.approx(110.5 + 55.6, abs=1)
+
+
+def test_single_point():
+    projected_polyline = ProjectedPolyline([[1.3000, 103.7700]])
+
+    assert projected_polyline.get_distance([1.3010, 103.7700]) == pytest.approx(110.5, abs=1)
+
+
+def test_get_distances_same_as_get_distance():
+    projected_polyline = ProjectedPolyline(demo_route)
+    rng = np.random.default_rng(0)
+    trace = (np.asarray(demo_route[::2]) + rng.normal(0, 0.0002, (len(demo_route[::2]), 2))).tolist()
+
+    distances = projected_polyline.get_distances(trace)
+
+    assert distances.shape == (len(trace),)
+    assert distances == pytest.approx([projected_polyline.get_distance(location) for location in trace])
@@ -0,0 +1,101 @@
+import pytest
+
+from APIs.maps.direction_data import DirectionData
+from APIs.maps.direction_step import DirectionStep
+from APIs.maps.maps_util import get_direction_str
+from APIs.maps.route_progress import RouteProgress
+
+_ORIGIN = [1.3000, 103.7700]
+_WAYPOINT = [1.3010, 103.7700]  # about 110 m to the north
+_DESTINATION = [1.3010, 103.7800]  # then about 1.1 km to the east
+_STEPS = [
+    DirectionStep(instruction="Head north", distance=110, duration=80, leg_index=0),
+    DirectionStep(instruction="Arrive at the waypoint", distance=0, duration=0, leg_index=0),
+    DirectionStep(instruction="Turn right", distance=1110, duration=800, leg_index=1),
+    DirectionStep(instruction="Arrive at the destination", distance=0, duration=0, leg_index=1),
+]
+
+
+def _create_route_progress(polyline=None, steps=None):
+    direction_data = DirectionData(start_time=1, polyline=polyline or [_ORIGIN, _WAYPOINT, _DESTINATION],
+                                   steps=steps or _STEPS)
+    return RouteProgress(direction_data)
+
+
+def test_get_direction_data_at_origin():
+    route_progress = _create_route_progress()
+
+    direction_data = route_progress.get_direction_data([_ORIGIN, _WAYPOINT, _DESTINATION], 0)
+
+    assert direction_data.curr_instr == "Head north"
+    assert direction_data.curr_dist == 110
+    assert direction_data.curr_direction == 0
+    assert direction_data.dest_dist == 1220
+    assert direction_data.dest_duration == 880
+    assert direction_data.waypoint_dist == 110
+    assert direction_data.num_steps == "4"
+    assert direction_data.start_time == 1
+
+
+def test_get_direction_data_along_route():
+    route_progress = _create_route_progress()
+
+    # about 55 m to the north, the turn to the east is ahead
+    direction_data = route_progress.get_direction_data([[1.3005, 103.7700], _WAYPOINT, _DESTINATION], 0)
+    assert direction_data.curr_instr == "Head north"
+    assert direction_data.curr_dist == pytest.approx(55, abs=2)
+    assert direction_data.curr_duration == pytest.approx(40, abs=2)
+    assert direction_data.dest_dist == pytest.approx(1165, abs=2)
+    assert direction_data.polyline == [[1.3005, 103.7700], _WAYPOINT, _DESTINATION]
+
+    # after the turn, and the waypoint is removed from the coordinates once reached
+    direction_data = route_progress.get_direction_data([[1.3010, 103.7750], _DESTINATION], 90)
+    assert direction_data.curr_instr == "Turn right"
+    assert get_direction_str(direction_data.curr_direction) == "straight"
+    assert direction_data.curr_dist == pytest.approx(555, abs=5)
+    assert direction_data.waypoint_dist == direction_data.dest_dist
+    assert direction_data.num_steps == "2"
+
+
+def test_get_direction_data_off_route_is_none():
+    route_progress = _create_route_progress()
+
+    assert route_progress.get_direction_data([[1.3005, 103.7710], _WAYPOINT, _DESTINATION], 0) is None
+
+
+def test_get_direction_data_loop_follows_route_in_order():
+    # square loop back to the origin
+    polyline = [_ORIGIN, [1.3010, 103.7700], [1.3010, 103.7710], [1.3000, 103.7710], _ORIGIN]
+    steps = [DirectionStep(instruction=f"Step {i}", distance=110, duration=80) for i in range(4)]
+    route_progress = _create_route_progress(polyline, steps)
+
+    direction_data = route_progress.get_direction_data([[1.30001, 103.7700], _ORIGIN], 0)
+    assert direction_data.curr_instr == "Step 0"
+    assert direction_data.dest_dist == pytest.approx(440, abs=5)
+
+    for location, instruction in [([1.3010, 103.7705], "Step 1"), ([1.3005, 103.7710], "Step 2"),
+                                  ([1.3000, 103.77095], "Step 3")]:
+        assert route_progress.get_direction_data([location, _ORIGIN], 0).curr_instr == instruction
+
+    direction_data = route_progress.get_direction_data([[1.30001, 103.7700], _ORIGIN], 0)
+    assert direction_data.curr_instr == "Step 3"
+    assert direction_data.dest_dist < 5
+
+
+def test_is_supported():
+    assert RouteProgress.is_supported(DirectionData(polyline=[_ORIGIN, _DESTINATION], steps=_STEPS))
+    assert not RouteProgress.is_supported(DirectionData(polyline=[_ORIGIN, _DESTINATION]))
+    assert not RouteProgress.is_supported(DirectionData(steps=_STEPS))
+
+
+def test_leg_without_steps():
+    # the first waypoint is at the origin, so its leg has no steps
+    steps = [DirectionStep(instruction=step.instruction, distance=step.distance, duration=step.duration,
+                           leg_index=step.leg_index + 1) for step in _STEPS]
+    route_progress = _create_route_progress(steps=steps)
+
+    direction_data = route_progress.get_direction_data([_ORIGIN, _ORIGIN, _WAYPOINT, _DESTINATION], 0)
+
+    assert direction_data.curr_instr == "Head north"
+    assert direction_data.waypoint_dist == 0
+    assert direction_data.dest_dist == 1220
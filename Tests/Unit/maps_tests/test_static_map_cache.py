@@ -0,0 +1,131 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from APIs.maps import maps, static_map_cache
+from APIs.maps.static_map_cache import StaticMapCache
+from Utilities import metrics_utility
+from base_keys import STATIC_MAPS_OPTION_GEOAPIFY, STATIC_MAPS_OPTION_GOOGLE
+
+_COORDINATES = [[1.3000, 103.7700], [1.3010, 103.7700], [1.3010, 103.7800]]
+_SIZE = (400, 300)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics_utility.reset_metrics()
+    yield
+    metrics_utility.reset_metrics()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StaticMapCache(str(tmp_path / "static_map_cache"), max_bytes=1000)
+
+
+def test_get_key():
+    key = StaticMapCache.get_key(STATIC_MAPS_OPTION_GEOAPIFY, _SIZE, "", _COORDINATES)
+
+    # less than 0.1 m apart is the same map
+    assert StaticMapCache.get_key(STATIC_MAPS_OPTION_GEOAPIFY, _SIZE, "", [[lat + 1e-8, lng] for lat, lng in
+                                                                           _COORDINATES]) == key
+    assert StaticMapCache.get_key(STATIC_MAPS_OPTION_GOOGLE, _SIZE, "", _COORDINATES) != key
+    assert StaticMapCache.get_key(STATIC_MAPS_OPTION_GEOAPIFY, (400, 400), "", _COORDINATES) != key
+    assert StaticMapCache.get_key(STATIC_MAPS_OPTION_GEOAPIFY, _SIZE, "&style=dark", _COORDINATES) != key
+    assert StaticMapCache.get_key(STATIC_MAPS_OPTION_GEOAPIFY, _SIZE, "", _COORDINATES[:2]) != key
+
+
+def test_put_get(cache):
+    assert cache.get("key") is None
+    cache.put("key", b"image")
+
+    assert cache.get("key") == b"image"
+    # the image is written to a temporary file, then renamed
+    assert os.listdir(cache.directory) == ["key.img"]
+    assert metrics_utility.get_counter(static_map_cache.METRIC_HITS) == 1
+    assert metrics_utility.get_counter(static_map_cache.METRIC_MISSES) == 1
+
+
+def test_put_evicts_least_recently_used(cache):
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, b"x" * 300)
+        # the modification times are distinct even on file systems with a coarse resolution
+        os.utime(cache._get_file_path(key), (i, i))
+    cache.get("a")
+    cache.put("d", b"x" * 300)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.get("d") is not None
+    assert metrics_utility.get_counter(static_map_cache.METRIC_EVICTIONS) == 1
+
+
+def test_put_evicts_images_of_previous_runs(cache):
+    cache.put("a", b"x" * 600)
+    os.utime(cache._get_file_path("a"), (0, 0))
+
+    # the size of the existing images is read from the directory
+    StaticMapCache(cache.directory, max_bytes=1000).put("b", b"x" * 600)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+
+def test_get_or_fetch_shares_in_flight_fetch(cache):
+    fetch_count = 0
+
+    async def fetch():
+        nonlocal fetch_count
+        fetch_count += 1
+        await asyncio.sleep(0.05)
+        return b"image"
+
+    async def get_maps():
+        return await asyncio.gather(*[cache.get_or_fetch("key", fetch) for _ in range(5)])
+
+    assert asyncio.run(get_maps()) == [b"image"] * 5
+    assert fetch_count == 1
+    assert metrics_utility.get_counter(static_map_cache.METRIC_SHARED_FETCHES) == 4
+
+    # cached for the next requests
+    assert asyncio.run(cache.get_or_fetch("key", fetch)) == b"image"
+    assert fetch_count == 1
+
+
+def test_get_or_fetch_error_is_not_cached(cache):
+    async def fetch_error():
+        await asyncio.sleep(0.05)
+        raise Exception("error")
+
+    async def fetch():
+        return b"image"
+
+    async def get_maps():
+        return await asyncio.gather(*[cache.get_or_fetch("key", fetch_error) for _ in range(2)],
+                                    return_exceptions=True)
+
+    assert [str(result) for result in asyncio.run(get_maps())] == ["error", "error"]
+    assert asyncio.run(cache.get_or_fetch("key", fetch)) == b"image"
+
+
+def test_get_static_maps_is_cached(mocker, tmp_path):
+    mocker.patch.object(maps, "_static_map_cache", StaticMapCache(str(tmp_path), max_bytes=1000))
+
+    async def find_static_maps_geoapify(coordinates, size):
+        # the static maps clients are blocking
+        time.sleep(0.05)
+        return b"image"
+
+    mock_static_maps = mocker.patch.object(maps.geoapify_api, "find_static_maps_geoapify",
+                                           side_effect=find_static_maps_geoapify)
+
+    async def get_static_maps():
+        return await asyncio.gather(*[maps.get_static_maps(_COORDINATES, _SIZE, STATIC_MAPS_OPTION_GEOAPIFY)
+                                      for _ in range(3)])
+
+    assert asyncio.run(get_static_maps()) == [b"image"] * 3
+    assert asyncio.run(maps.get_static_maps(_COORDINATES, _SIZE, STATIC_MAPS_OPTION_GEOAPIFY)) == b"image"
+    assert mock_static_maps.call_count == 1
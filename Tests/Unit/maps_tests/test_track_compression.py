@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from APIs.maps.projected_polyline import ProjectedPolyline
+from APIs.maps.track_compression import TrackBuffer, simplify_for_static_map, simplify_track
+from Tests.RunningFpv.running_demo_route import demo_route
+
+
+def _create_noisy_track(num_points):
+    rng = np.random.default_rng(0)
+    return np.array([1.2946, 103.7749]) + np.cumsum(rng.normal(0, 0.0001, (num_points, 2)), axis=0)
+
+
+@pytest.mark.parametrize("tolerance", [1, 5, 20])
+def test_simplify_track_within_tolerance(tolerance):
+    track = _create_noisy_track(1000)
+
+    simplified_track = simplify_track(track, tolerance)
+
+    assert 2 < len(simplified_track) < len(track)
+    assert simplified_track[0] == pytest.approx(track[0])
+    assert simplified_track[-1] == pytest.approx(track[-1])
+    assert ProjectedPolyline(simplified_track.tolist()).get_distances(track).max() <= tolerance + 1e-6
+
+
+def test_simplify_track_straight_line():
+    track = [[1.3000 + i * 0.0001, 103.7700] for i in range(10)]
+
+    assert simplify_track(track, 1).tolist() == [track[0], track[-1]]
+
+
+def test_simplify_track_loop():
+    # the first point is the last point
+    loop = [[1.3000, 103.7700], [1.3010, 103.7700], [1.3010, 103.7710], [1.3000, 103.7710], [1.3000, 103.7700]]
+
+    assert simplify_track(loop, 5).tolist() == loop
+
+
+def test_simplify_for_static_map_max_points():
+    track = _create_noisy_track(5000)
+
+    simplified_track = simplify_for_static_map(track, 300, 2)
+
+    assert 2 < len(simplified_track) <= 300
+    assert simplified_track[0] == pytest.approx(track[0].tolist())
+
+
+def test_simplify_for_static_map_demo_route():
+    simplified_track = simplify_for_static_map(demo_route, 300, 2)
+
+    assert len(simplified_track) < len(demo_route)
+    assert ProjectedPolyline(simplified_track).get_distances(demo_route).max() <= 2 + 1e-6
+
+
+def test_track_buffer():
+    track_buffer = TrackBuffer([[1.3, 103.77]])
+    track_buffer.append([1.31, 103.78])
+    track_buffer.extend([(1.32, 103.79)])
+
+    assert len(track_buffer) == 3
+    assert track_buffer[-1] == (1.32, 103.79)
+    assert track_buffer[:2] == [(1.3, 103.77), (1.31, 103.78)]
+    assert track_buffer == [[1.3, 103.77], [1.31, 103.78], [1.32, 103.79]]
+    assert track_buffer.to_numpy().shape == (3, 2)
+    assert TrackBuffer() == []
+    with pytest.raises(IndexError):
+        _ = track_buffer[3]
+
+
+def test_track_buffer_simplify():
+    track_buffer = TrackBuffer([[1.3000 + i * 0.0001, 103.7700] for i in range(10)])
+
+    track_buffer.simplify(1)
+
+    assert track_buffer == [[1.3000, 103.7700], [1.3009, 103.7700]]
+
+
+def test_track_buffer_simplify_max_points():
+    track = _create_noisy_track(1000)
+    track_buffer = TrackBuffer(track)
+
+    track_buffer.simplify(2, 100)
+
+    assert 2 < len(track_buffer) <= 100
+    assert track_buffer[0] == tuple(track[0])
+    assert track_buffer[-1] == tuple(track[-1])
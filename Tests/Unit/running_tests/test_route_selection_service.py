@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+from Tests.Integration.test_db_util import set_test_db_environ
+from base_component import BaseComponent
+from base_keys import COMPONENT_IS_RUNNING_STATUS, COMPONENT_IS_STOPPED_STATUS, SESSION_ID_KEY
+
+set_test_db_environ()
+from Services.running_service import route_selection_service, running_session
+from Services.running_service.route_selection_service import RouteSelectionService
+from Services.running_service.running_service import RunningService
+
+
+def _create_route_selection_service(mocker, status=COMPONENT_IS_RUNNING_STATUS):
+    service = RouteSelectionService("RouteSelectionService")
+    service.set_component_status(status)
+    service.running_service = mocker.Mock()
+    service.retry_generating_routes_interval = 0
+    return service
+
+
+def test_get_random_routes_retries_are_bounded(mocker):
+    generate_random_routes = mocker.patch.object(route_selection_service, "generate_random_routes",
+                                                 mocker.AsyncMock(return_value=[]))
+    service = _create_route_selection_service(mocker)
+
+    routes = asyncio.run(service.get_random_routes(3, running_session.get_session()))
+
+    assert routes == []
+    assert generate_random_routes.call_count == service.max_generating_routes_attempts
+
+
+def test_get_random_routes_not_running(mocker):
+    generate_random_routes = mocker.patch.object(route_selection_service, "generate_random_routes",
+                                                 mocker.AsyncMock(return_value=[]))
+    service = _create_route_selection_service(mocker, COMPONENT_IS_STOPPED_STATUS)
+
+    assert asyncio.run(service.get_random_routes(3, running_session.get_session())) == []
+    generate_random_routes.assert_not_called()
+
+
+def test_send_random_routes_timeout(mocker):
+    def run_map_request(coroutine, timeout=None):
+        coroutine.close()
+        raise TimeoutError(f"no routes within {timeout} s")
+
+    run_map_request = mocker.patch.object(route_selection_service, "run_map_request", side_effect=run_map_request)
+    service = _create_route_selection_service(mocker)
+
+    service.send_random_routes(3)
+
+    assert run_map_request.call_args.args[1] is not None
+    assert service.random_routes == []
+    # the (empty) routes and the select route message are still sent
+    assert service.running_service.send_to_component.call_count == 2
+
+
+def test_generating_routes_message_goes_to_own_session(mocker):
+    mocker.patch.object(route_selection_service, "generate_random_routes", mocker.AsyncMock(return_value=[]))
+    send_to_component = mocker.patch.object(BaseComponent, "send_to_component")
+    service = _create_route_selection_service(mocker)
+    service.running_service = RunningService("RunningService")
+    service.max_generating_routes_attempts = 1
+
+    threads = [threading.Thread(target=running_session.run_in_session,
+                                args=(running_session.get_session(session_id), service.send_random_routes, 3))
+               for session_id in ("watch-1", "watch-2")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    running_session.remove_session("watch-1")
+    running_session.remove_session("watch-2")
+
+    # the coroutines run in the maps event loop, but each message goes to the session which requested the routes
+    session_ids = [call.kwargs.get(SESSION_ID_KEY) for call in send_to_component.call_args_list]
+    assert sorted(session_ids) == ["watch-1"] * 3 + ["watch-2"] * 3
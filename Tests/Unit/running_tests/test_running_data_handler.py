@@ -254,6 +254,21 @@ def test_save_real_coords_no_location():
     assert RunningCurrentData.coords == demo_waypoints[:3:2]
 
 
+def test_save_real_coords_simplify_amortized(monkeypatch, mocker):
+    monkeypatch.setattr(RunningServiceConfig, "max_coords", 20)
+    monkeypatch.setattr(RunningServiceConfig, "max_simplified_coords", 10)
+    simplify = mocker.spy(type(RunningCurrentData.coords), "simplify")
+    # a zigzag of about 150 m steps, which is not simplified by the default tolerance
+    for i in range(60):
+        RunningCurrentData.curr_lat = 1.3 + (i % 2) * 0.001
+        RunningCurrentData.curr_lng = 103.77 + i * 0.001
+        save_real_coords()
+        assert len(RunningCurrentData.coords) <= RunningServiceConfig.max_coords
+
+    # simplified once every (max_coords - max_simplified_coords) points at most, instead of on each point
+    assert 0 < simplify.call_count <= 60 // 10
+
+
 @pytest.mark.parametrize("decoded_data", training_mode_data)
 def test_save_training_mode_valid(decoded_data):
     save_training_mode_data(decoded_data)
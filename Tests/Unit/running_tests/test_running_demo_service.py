@@ -0,0 +1,26 @@
+from DataFormat import datatypes_helper
+from DataFormat.ProtoFiles.Common import exercise_wear_os_data_pb2
+from Tests.Integration.test_db_util import set_test_db_environ
+from base_keys import ORIGIN_KEY, WEBSOCKET_DATATYPE, WEBSOCKET_MESSAGE
+
+set_test_db_environ()
+from Services.running_service import running_session
+from Services.running_service.running_demo_service import RunningDemoService
+from Services.running_service.running_keys import EXERCISE_WEAR_OS_DATA
+
+
+def test_run_updates_a_copy_of_the_message(mocker):
+    mocker.patch.object(RunningDemoService, "send_to_component")
+    data = exercise_wear_os_data_pb2.ExerciseWearOsData(curr_lat=1.3, curr_lng=103.8, speed=3.0)
+    message = datatypes_helper.decode_websocket_message(datatypes_helper.wrap_socket_message_with_metadata(data))
+
+    demo_service = RunningDemoService(name="RunningDemoService")
+    with running_session.use_session(running_session.get_session("demo-test")):
+        demo_service.run({ORIGIN_KEY: "wearOS", WEBSOCKET_DATATYPE: EXERCISE_WEAR_OS_DATA, WEBSOCKET_MESSAGE: message})
+    running_session.remove_session("demo-test")
+
+    # the runner is at null island until the FPV video starts
+    sent_message = RunningDemoService.send_to_component.call_args.kwargs["websocket_message"]
+    assert (sent_message["curr_lat"], sent_message["curr_lng"]) == (0, 0)
+    assert sent_message["speed"] == 3.0
+    assert (message["curr_lat"], message["curr_lng"]) == (1.3, 103.8)
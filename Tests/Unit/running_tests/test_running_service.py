@@ -1,17 +1,183 @@
+import threading
+import time
+
 from Tests.Integration.test_db_util import set_test_db_environ
-from base_keys import COMPONENT_NOT_STARTED_STATUS
+from Tests.RunningFpv.running_demo_route import demo_route
+from Utilities import metrics_utility
+from base_component import BaseComponent
+from base_keys import COMPONENT_NOT_STARTED_STATUS, COMPONENT_IS_RUNNING_STATUS, MEMORY_COMPONENT_STATUS_KEY, \
+    ORIGIN_KEY, SESSION_ID_KEY, WEBSOCKET_DATATYPE, WEBSOCKET_MESSAGE
 
 set_test_db_environ()
-from Services.running_service.running_service import RunningService
+from Services.running_service import running_session
+from Services.running_service.running_coach_service import RunningCoachService
+from Services.running_service.running_current_data import RunningCurrentData
+from Services.running_service.running_keys import EXERCISE_WEAR_OS_DATA
+from Services.running_service.running_service import RunningService, RunnerServices
+from Services.running_service.running_service_params import BaseParams, BaseParamsState
 
 mock_running_service = RunningService(name="RunningService")
 
 
 def test_running_service_init():
     assert mock_running_service.name == "RunningService"
-    assert mock_running_service.route_selection_service is None
-    assert mock_running_service.running_coach_service is None
-    assert mock_running_service.running_ui_service is None
-    assert mock_running_service.training_mode_selection_service is None
+    assert mock_running_service.runners == {}
     assert mock_running_service.get_component_status() == COMPONENT_NOT_STARTED_STATUS
-    assert mock_running_service.received_wear_os_data is False
+
+
+def test_get_runner():
+    runner = RunnerServices(running_session.get_session("watch-1"))
+
+    assert runner.route_selection_service is None
+    assert runner.running_coach_service is None
+    assert runner.running_ui_service is None
+    assert runner.training_mode_selection_service is None
+    assert runner.received_wear_os_data is False
+    assert runner.get_service_name("RunningCoachService") == "RunningCoachService:watch-1"
+    running_session.remove_session("watch-1")
+
+
+def _create_wear_os_message(index, location, session_id=None):
+    return {
+        ORIGIN_KEY: "wearOS",
+        SESSION_ID_KEY: session_id,
+        WEBSOCKET_DATATYPE: EXERCISE_WEAR_OS_DATA,
+        WEBSOCKET_MESSAGE: {"start_time": 0, "calories": index, "heart_rate": 120, "distance": index * 3.0,
+                            "speed": 3.0, "bearing": 0, "curr_lat": location[0], "curr_lng": location[1]},
+    }
+
+
+def _wait_for_handled(metric_name, count, timeout_seconds=10):
+    deadline = time.perf_counter() + timeout_seconds
+    while time.perf_counter() < deadline:
+        latency = metrics_utility.get_latency(metric_name)
+        if latency is not None and latency["count"] >= count:
+            return
+        time.sleep(0.01)
+
+
+def test_run_replays_session_in_order(mocker):
+    # the recorded demo route at 50x the 1 Hz rate of the WearOS data
+    route = demo_route[:100]
+    interval_seconds = 1 / 50
+    mocker.patch.object(RunningService, "send_to_component")
+    mocker.patch.object(RunningCoachService, "insert_data_to_db")
+    mocker.patch.object(RunningCoachService, "get_training_update")
+    metrics_utility.reset_metrics()
+
+    running_service = RunningService(name="RunningService")
+    running_service.set_component_status(COMPONENT_IS_RUNNING_STATUS)
+    running_service.get_runner(running_session.DEFAULT_SESSION_ID)
+    BaseParams.chosen_route_id = 1
+
+    thread_count = threading.active_count()
+    max_thread_count = thread_count
+    try:
+        for index, location in enumerate(route):
+            running_service.run(_create_wear_os_message(index, location))
+            max_thread_count = max(max_thread_count, threading.active_count())
+            time.sleep(interval_seconds)
+        _wait_for_handled("running_service.RunningCoachService.handler", len(route))
+    finally:
+        running_service.stop_service_queues()
+        BaseParams.reset()
+
+    # one worker thread per sub-service (training mode selection, UI and coach), instead of a thread per message
+    assert max_thread_count <= thread_count + 3
+    # the messages are handled in order, so the last location is the current location
+    assert [RunningCurrentData.curr_lat, RunningCurrentData.curr_lng] == list(route[-1])
+    assert RunningCurrentData.curr_calories == len(route) - 1
+    route_indices = [route.index(list(coordinate)) for coordinate in RunningCurrentData.coords]
+    assert route_indices == sorted(route_indices)
+
+    queue_lag = metrics_utility.get_latency("running_service.RunningCoachService.queue_wait")
+    assert queue_lag["count"] == len(route)
+    # the worker keeps up with the replay
+    assert queue_lag["p50_ms"] < interval_seconds * 1000
+
+
+def test_run_sessions_have_own_state(mocker):
+    mocker.patch.object(RunningService, "send_to_component")
+    mocker.patch.object(RunningCoachService, "insert_data_to_db")
+    mocker.patch.object(RunningCoachService, "get_training_update")
+    metrics_utility.reset_metrics()
+
+    running_service = RunningService(name="RunningService")
+    session_ids = ["watch-1", "watch-2"]
+    routes = [demo_route[:20], demo_route[100:130]]
+    for session_id in session_ids:
+        running_service.get_runner(session_id)
+        running_session.get_session(session_id).get_state(BaseParamsState).chosen_route_id = 1
+    current_data_states = [RunningCurrentData.get_state(running_session.get_session(session_id))
+                           for session_id in session_ids]
+
+    try:
+        for index in range(max(len(route) for route in routes)):
+            for session_id, route in zip(session_ids, routes):
+                if index < len(route):
+                    running_service.run(_create_wear_os_message(index, route[index], session_id))
+        for session_id, route in zip(session_ids, routes):
+            _wait_for_handled(f"running_service.RunningCoachService:{session_id}.handler", len(route))
+        assert "RunningCoachService:watch-1_STATUS" in _get_component_statuses()
+    finally:
+        for session_id in session_ids:
+            running_service.remove_runner(session_id)
+
+    for current_data, route in zip(current_data_states, routes):
+        assert [current_data.curr_lat, current_data.curr_lng] == list(route[-1])
+        assert current_data.curr_calories == len(route) - 1
+    assert running_service.runners == {}
+    assert not running_session.has_session(session_ids[0])
+    # the statuses of the sub-services of the sessions are removed with the sessions
+    assert not [name for name in _get_component_statuses() if ":watch-" in name]
+
+
+def _get_component_statuses():
+    return mock_running_service.get_memory_data(MEMORY_COMPONENT_STATUS_KEY)
+
+
+def test_send_to_component_adds_session_id(mocker):
+    send_to_component = mocker.patch.object(BaseComponent, "send_to_component")
+
+    with running_session.use_session(running_session.get_session("watch-1")):
+        mock_running_service.send_to_component(websocket_message="reply")
+    mock_running_service.send_to_component(websocket_message="broadcast")
+    running_session.remove_session("watch-1")
+
+    # the replies of a session go to the connections of the session only
+    assert send_to_component.call_args_list == [mocker.call(websocket_message="reply", session_id="watch-1"),
+                                                mocker.call(websocket_message="broadcast")]
+
+
+def test_remove_idle_runners_releases_threads_and_session(mocker):
+    running_service = RunningService(name="RunningService")
+    running_service.get_runner(running_session.DEFAULT_SESSION_ID)
+    runner = running_service.get_runner("watch-1")
+
+    # a training update thread and a sub-service worker thread of the session
+    runner.running_coach_service = RunningCoachService(runner.get_service_name("RunningCoachService"))
+    runner.running_coach_service.training_update_interval = 0.01
+    mocker.patch.object(runner.running_coach_service, "check_for_running_request")
+    mocker.patch.object(runner.running_coach_service, "check_for_direction_request")
+    runner.running_coach_service.set_component_status(COMPONENT_IS_RUNNING_STATUS)
+    training_update_thread = threading.Thread(target=runner.running_coach_service.get_training_update, args=(0, 0),
+                                              daemon=True)
+    training_update_thread.start()
+    service = mocker.Mock()
+    service.name = runner.get_service_name("IdleService")
+    running_service.dispatch(runner, service, None)
+
+    try:
+        # the session is not idle yet
+        assert running_service.remove_idle_runners(idle_timeout=60) == []
+        runner.last_message_time -= 120
+        assert running_service.remove_idle_runners(idle_timeout=60) == ["watch-1"]
+        training_update_thread.join(timeout=5)
+    finally:
+        running_service.remove_runner(running_session.DEFAULT_SESSION_ID)
+
+    assert not training_update_thread.is_alive()
+    assert not [thread for thread in threading.enumerate() if thread.name == f"running_service.{service.name}"]
+    assert not running_session.has_session("watch-1")
+    assert list(running_service.runners) == []
+    assert not [name for name in _get_component_statuses() if ":watch-" in name]
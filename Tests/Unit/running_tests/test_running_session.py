@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from Services.running_service import running_session
+from Services.running_service.running_current_data import RunningCurrentData, RunningCurrentDataState
+
+
+@pytest.fixture(autouse=True)
+def reset_default_session():
+    # the default session is shared with the other tests, which may have updated its state
+    running_session.remove_session(running_session.DEFAULT_SESSION_ID)
+    yield
+    running_session.remove_session(running_session.DEFAULT_SESSION_ID)
+
+
+def test_proxy_resolves_to_current_session():
+    session = running_session.get_session("watch-1")
+    try:
+        with running_session.use_session(session):
+            RunningCurrentData.curr_heart_rate = 150
+            assert running_session.get_current_session() is session
+
+        assert RunningCurrentData.get_state(session).curr_heart_rate == 150
+        assert RunningCurrentData.curr_heart_rate == 0
+        assert running_session.get_current_session().session_id == running_session.DEFAULT_SESSION_ID
+    finally:
+        running_session.remove_session("watch-1")
+
+
+def test_session_is_bound_per_thread():
+    sessions = [running_session.get_session(f"watch-{i}") for i in range(4)]
+
+    def update_heart_rate(heart_rate):
+        RunningCurrentData.curr_heart_rate = heart_rate
+
+    threads = [threading.Thread(target=running_session.run_in_session, args=(session, update_heart_rate, i))
+               for i, session in enumerate(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [session.get_state(RunningCurrentDataState).curr_heart_rate for session in sessions] == [0, 1, 2, 3]
+    for session in sessions:
+        running_session.remove_session(session.session_id)
+
+
+def test_remove_session():
+    running_session.get_session("watch-1").get_state(RunningCurrentDataState).curr_calories = 100
+    running_session.remove_session("watch-1")
+
+    assert not running_session.has_session("watch-1")
+    assert running_session.get_session("watch-1").get_state(RunningCurrentDataState).curr_calories == 0
+    running_session.remove_session("watch-1")
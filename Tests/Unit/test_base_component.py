@@ -1,7 +1,10 @@
+import threading
+
 import pytest
 
 from base_component import BaseComponent
 from Memory import Memory
+from Utilities import config_utility, endpoint_utility
 from Tests.Integration.test_db_util import set_test_db_environ
 
 set_test_db_environ()
@@ -46,6 +49,49 @@ def test_get_memory_data():
     assert base_component.get_memory_data(key_name) == value
 
 
+class ReceiverComponent(BaseComponent):
+    def __init__(self, name):
+        super().__init__(name)
+        self.messages = []
+        self.received = threading.Event()
+
+    def run(self, raw_data):
+        self.messages.append(raw_data)
+        self.received.set()
+
+
+@pytest.fixture
+def pipe_config():
+    Memory.init()
+    config_utility.configuration = {
+        "channel-pipes": {"Test": ["service:inline", "service:queued"]},
+        "channel-entrypoints": {"service:inline": "inline.ReceiverComponent.run",
+                                "service:queued": "queued.ReceiverComponent.run"},
+        "channel-options": {"service:queued": {"dispatch_policy": "latest_only"}},
+    }
+    endpoint_utility.component_instances["service:inline"] = ReceiverComponent("service:inline")
+    endpoint_utility.component_instances["service:queued"] = ReceiverComponent("service:queued")
+    yield
+    config_utility.configuration = {}
+    endpoint_utility.component_instances.clear()
+
+
+def test_send_to_component_inline_and_queued(pipe_config):
+    publisher = BaseComponent(name="Test")
+
+    publisher.send_to_component(test_data="value")
+
+    inline_receiver = endpoint_utility.component_instances["service:inline"]
+    queued_receiver = endpoint_utility.component_instances["service:queued"]
+    assert inline_receiver.messages[0]["test_data"] == "value"
+    assert queued_receiver.received.wait(timeout=2)
+    assert queued_receiver.messages[0]["test_data"] == "value"
+
+    assert publisher.get_dispatch_queues()["service:inline"] is None
+    assert publisher.get_dispatch_queues()["service:queued"].policy == "latest_only"
+    publisher.get_dispatch_queues()["service:queued"].stop()
+
+
 def test_get_supported_datatypes():
     assert len(base_component.get_supported_datatypes()) == 0
     assert base_component.is_supported_datatype("TEST_DATA") is False
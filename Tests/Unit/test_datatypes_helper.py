@@ -64,3 +64,114 @@ def test__get_proto_file_to_data_type_mapping(mock_datatypes_helper):
 
 def test_get_key_by_name(mock_datatypes_helper):
     assert datatypes_helper.get_key_by_name("data") == 1000
+
+
+def test_get_proto_func_by_key():
+    from DataFormat.ProtoFiles.Common import exercise_wear_os_data_pb2
+
+    key = datatypes_helper.get_key_by_name("EXERCISE_WEAR_OS_DATA")
+
+    assert datatypes_helper.get_proto_func_by_key(key) is exercise_wear_os_data_pb2.ExerciseWearOsData
+    assert datatypes_helper.get_proto_func_by_key(-1) is None
+
+
+def test_get_key_by_instance():
+    from DataFormat.ProtoFiles.Template import template_data_pb2
+    from DataFormat.ProtoFiles.Common import request_data_pb2
+
+    assert datatypes_helper.get_key_by_instance(template_data_pb2.TemplateData()) == \
+           datatypes_helper.get_key_by_name("TEMPLATE_DATA")
+    # shared protobuf classes return the first datatype key in DataTypes.json
+    assert datatypes_helper.get_key_by_instance(request_data_pb2.RequestData()) == \
+           datatypes_helper.get_key_by_name("REQUEST_TEMPLATE_DATA")
+
+
+def test_encode_decode_round_trip():
+    from DataFormat.ProtoFiles.Template import template_data_pb2
+
+    data = template_data_pb2.TemplateData(text="text")
+    encoded = datatypes_helper.wrap_socket_message_with_metadata(data)
+
+    data_type, decoded = datatypes_helper.decode_websocket_data(encoded)
+
+    assert data_type == datatypes_helper.get_key_by_name("TEMPLATE_DATA")
+    assert decoded == data
+
+
+def test_validate_data_type_json_duplicate_key(mocker):
+    mocker.patch.object(datatypes_helper, "DATATYPE_JSON", {
+        "data1": {"key": 1000, "proto_file": "file.py"},
+        "data2": {"key": 1000, "proto_file": "file.py"},
+    })
+
+    with pytest.raises(ValueError):
+        datatypes_helper._validate_data_type_json()
+
+
+def test_validate_data_type_json_missing_value(mocker):
+    mocker.patch.object(datatypes_helper, "DATATYPE_JSON", {"data": {"key": 1000}})
+
+    with pytest.raises(ValueError):
+        datatypes_helper._validate_data_type_json()
+
+
+def test_decode_websocket_message():
+    from DataFormat.ProtoFiles.Template import template_data_pb2
+
+    data = template_data_pb2.TemplateData(text="text")
+    message = datatypes_helper.decode_websocket_message(datatypes_helper.wrap_socket_message_with_metadata(data))
+
+    assert message.data_type == datatypes_helper.get_key_by_name("TEMPLATE_DATA")
+    # the payload is decoded once, and shared by the readers
+    proto = datatypes_helper.get_protobuf_message(message.data_type, message)
+    assert proto == data
+    assert datatypes_helper.get_protobuf_message(message.data_type, message) is proto
+    # compatibility with the components which expect a dictionary
+    assert message["text"] == "text"
+    assert dict(message) == {"text": "text"}
+    assert datatypes_helper.convert_json_to_protobuf(message.data_type, message) is proto
+
+
+def test_websocket_message_is_read_only():
+    from DataFormat.ProtoFiles.Template import template_data_pb2
+
+    data = template_data_pb2.TemplateData(text="text")
+    message = datatypes_helper.decode_websocket_message(datatypes_helper.wrap_socket_message_with_metadata(data))
+
+    with pytest.raises(TypeError):
+        message["text"] = "other text"
+
+    # subscribers which update the message use a copy, the other subscribers still get the received data
+    message_copy = dict(message)
+    message_copy["text"] = "other text"
+    assert message["text"] == "text"
+
+
+def test_decode_websocket_message_invalid_data():
+    assert datatypes_helper.decode_websocket_message(b"") is None
+    assert datatypes_helper.decode_websocket_message("text") is None
+    assert datatypes_helper.decode_websocket_message(b"\xff\xff") is None
+
+
+def test_websocket_message_pickle():
+    import pickle
+    from DataFormat.ProtoFiles.Template import template_data_pb2
+
+    data = template_data_pb2.TemplateData(text="text")
+    message = datatypes_helper.decode_websocket_message(datatypes_helper.wrap_socket_message_with_metadata(data))
+    message.get_proto()
+
+    unpickled = pickle.loads(pickle.dumps(message))
+
+    assert unpickled.data_type == message.data_type
+    assert unpickled.get_proto() == data
+
+
+def test_get_protobuf_message_from_dict():
+    from DataFormat.ProtoFiles.Template import template_data_pb2
+
+    data_type = datatypes_helper.get_key_by_name("TEMPLATE_DATA")
+    data = template_data_pb2.TemplateData(text="text")
+
+    assert datatypes_helper.get_protobuf_message(data_type, {"text": "text"}) == data
+    assert datatypes_helper.get_protobuf_message(data_type, data) is data
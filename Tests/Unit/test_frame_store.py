@@ -0,0 +1,96 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from Memory import frame_store
+from Memory.frame_store import FrameStore
+
+_TEST_FRAME_STORE_NAME = "TOM_TEST_FRAME_STORE"
+
+
+@pytest.fixture
+def store():
+    test_store = FrameStore(name=_TEST_FRAME_STORE_NAME, num_slots=2, max_frame_bytes=4 * 4 * 3)
+    yield test_store
+    test_store.close(unlink=True)
+
+
+def _get_frame(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+def test_get_latest_frame_if_no_frame(store):
+    assert store.get_latest_frame() == (None, None)
+
+
+def test_publish_and_get_latest_frame(store):
+    sequence = store.publish_frame(_get_frame(1), timestamp=10.0)
+    frame, metadata = store.get_latest_frame()
+
+    assert sequence == 1
+    assert np.array_equal(frame, _get_frame(1))
+    assert metadata.sequence == 1
+    assert metadata.timestamp == 10.0
+    assert (metadata.width, metadata.height, metadata.channels, metadata.dtype) == (4, 4, 3, "|u1")
+
+
+def test_get_latest_frame_returns_newest_frame(store):
+    for value in range(5):
+        store.publish_frame(_get_frame(value))
+
+    frame, metadata = store.get_latest_frame()
+
+    assert metadata.sequence == 5
+    assert np.array_equal(frame, _get_frame(4))
+
+
+def test_get_latest_frame_view_and_copy(store):
+    store.publish_frame(_get_frame(1))
+    view, _ = store.get_latest_frame()
+    copy, _ = store.get_latest_frame(copy=True)
+
+    # the view is overwritten when the slot is reused, the copy is not
+    store.publish_frame(_get_frame(2))
+    store.publish_frame(_get_frame(3))
+
+    assert np.array_equal(view, _get_frame(3))
+    assert np.array_equal(copy, _get_frame(1))
+
+
+def test_publish_grayscale_frame(store):
+    store.publish_frame(np.full((4, 4), 7, dtype=np.uint8))
+    frame, metadata = store.get_latest_frame()
+
+    assert frame.shape == (4, 4)
+    assert metadata.channels == 1
+
+
+def test_publish_frame_too_large(store):
+    with pytest.raises(ValueError):
+        store.publish_frame(np.zeros((10, 10, 3), dtype=np.uint8))
+
+
+def _publish_from_another_process():
+    other_store = FrameStore(name=_TEST_FRAME_STORE_NAME)
+    other_store.publish_frame(_get_frame(9))
+    other_store.close()
+
+
+def test_frame_shared_across_processes(store):
+    process = multiprocessing.Process(target=_publish_from_another_process)
+    process.start()
+    process.join()
+
+    frame, _ = store.get_latest_frame(copy=True)
+    assert np.array_equal(frame, _get_frame(9))
+
+
+def test_module_level_frame_store():
+    frame_store.init()
+    frame_store.publish_frame(_get_frame(5))
+
+    assert np.array_equal(frame_store.get_latest_frame(copy=True), _get_frame(5))
+    assert frame_store.get_latest_frame_with_metadata()[1].width == 4
+
+    frame_store.close()
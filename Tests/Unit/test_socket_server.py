@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from base_keys import SESSION_ID_KEY, WEBSOCKET_CLIENT_TYPE
+from Websocket import socket_server
+
+
+def test_receive_data_no_data():
+    assert socket_server.receive_data() is None
+    assert socket_server.receive_timed_data(timeout=0.01) is None
+
+
+def test_receive_timed_data_drains_burst():
+    for i in range(3):
+        socket_server._rx_queue.put_nowait((time.perf_counter(), f"data_{i}", None))
+
+    received = [socket_server.receive_timed_data()[1] for _ in range(3)]
+
+    assert received == ["data_0", "data_1", "data_2"]
+    assert socket_server.receive_data() is None
+
+
+def test_receive_data_wakes_up_on_arrival():
+    timer = threading.Timer(0.05, lambda: socket_server._rx_queue.put_nowait((time.perf_counter(), "data", None)))
+    timer.start()
+
+    start_time = time.perf_counter()
+    data = socket_server.receive_data(timeout=5)
+
+    assert data == "data"
+    assert time.perf_counter() - start_time < 1
+
+
+class FakeWebsocket:
+    def __init__(self, client_type=None, path="/", send_delay=0, session_id=None):
+        self.request_headers = {} if client_type is None else {WEBSOCKET_CLIENT_TYPE: client_type}
+        if session_id is not None:
+            self.request_headers[SESSION_ID_KEY] = session_id
+        self.path = path
+        self.remote_address = ("127.0.0.1", 0)
+        self.send_delay = send_delay
+        self.sent_data = []
+        self.close_code = None
+
+    async def send(self, data):
+        await asyncio.sleep(self.send_delay)
+        self.sent_data.append(data)
+
+    async def close(self, code=1000, reason=""):
+        self.close_code = code
+
+
+def test_get_client_type():
+    assert socket_server.get_client_type(FakeWebsocket("hololens")) == "hololens"
+    assert socket_server.get_client_type(FakeWebsocket(path="/?websocket_client_type=dashboard")) == "dashboard"
+    assert socket_server.get_client_type(FakeWebsocket()) is None
+
+
+def test_get_session_id():
+    assert socket_server.get_session_id(FakeWebsocket("wearOS", session_id="watch-1")) == "watch-1"
+    assert socket_server.get_session_id(FakeWebsocket(path="/?session_id=watch-2")) == "watch-2"
+    assert socket_server.get_session_id(FakeWebsocket("wearOS")) is None
+
+
+def test_send_data_to_session():
+    async def run():
+        runner_1 = socket_server._add_connection(FakeWebsocket("unity", session_id="watch-1"))
+        runner_2 = socket_server._add_connection(FakeWebsocket("unity", session_id="watch-2"))
+
+        socket_server._enqueue_data(b"to_runner_1", "unity", "watch-1")
+        socket_server._enqueue_data(b"to_unity", "unity")
+        await asyncio.sleep(0.05)
+
+        socket_server._remove_connection(runner_1)
+        socket_server._remove_connection(runner_2)
+
+        return runner_1.websocket.sent_data, runner_2.websocket.sent_data
+
+    runner_1_data, runner_2_data = asyncio.run(run())
+
+    assert runner_1_data == [b"to_runner_1", b"to_unity"]
+    assert runner_2_data == [b"to_unity"]
+
+
+def test_received_data_has_session_id():
+    class ReceivingWebsocket(FakeWebsocket):
+        def __aiter__(self):
+            return self._receive()
+
+        async def _receive(self):
+            yield "data"
+
+    asyncio.run(socket_server.receive_data_from_websocket(ReceivingWebsocket("wearOS", session_id="watch-1")))
+
+    assert socket_server.receive_timed_data(timeout=1)[1:] == ("data", "watch-1")
+
+
+def test_send_data_to_client_type():
+    async def run():
+        hololens = socket_server._add_connection(FakeWebsocket("hololens"))
+        dashboard = socket_server._add_connection(FakeWebsocket("dashboard"))
+
+        socket_server._enqueue_data(b"to_hololens", "hololens")
+        socket_server._enqueue_data(b"to_all")
+        await asyncio.sleep(0.05)
+
+        stats = {stat[WEBSOCKET_CLIENT_TYPE]: stat for stat in socket_server.get_client_stats()}
+        socket_server._remove_connection(hololens)
+        socket_server._remove_connection(dashboard)
+
+        return hololens.websocket.sent_data, dashboard.websocket.sent_data, stats
+
+    hololens_data, dashboard_data, stats = asyncio.run(run())
+
+    assert hololens_data == [b"to_hololens", b"to_all"]
+    assert dashboard_data == [b"to_all"]
+    assert stats["hololens"]["sent_messages"] == 2
+    assert stats["hololens"]["sent_bytes"] == len(b"to_hololens") + len(b"to_all")
+    assert not socket_server._CONNECTIONS_BY_CLIENT_TYPE
+
+
+def test_slow_client_does_not_delay_others():
+    async def run():
+        slow = socket_server.ClientConnection(FakeWebsocket("slow", send_delay=0.2), "slow", max_queue_size=2).start()
+        fast = socket_server.ClientConnection(FakeWebsocket("fast"), "fast", max_queue_size=2).start()
+
+        for i in range(5):
+            slow.enqueue(bytes([i]))
+            fast.enqueue(bytes([i]))
+            await asyncio.sleep(0.01)
+
+        fast_data = list(fast.websocket.sent_data)
+        slow_data = list(slow.websocket.sent_data)
+        dropped = slow.dropped_messages
+        slow.stop()
+        fast.stop()
+
+        return fast_data, slow_data, dropped
+
+    fast_data, slow_data, dropped = asyncio.run(run())
+
+    assert fast_data == [bytes([i]) for i in range(5)]
+    assert not slow_data
+    # the first message is being sent, only the latest 2 messages are kept in the queue
+    assert dropped == 2
+
+
+def test_slow_client_disconnect_policy():
+    async def run():
+        slow = socket_server.ClientConnection(FakeWebsocket("slow", send_delay=0.2), "slow", max_queue_size=1,
+                                              slow_client_policy=socket_server.SLOW_CLIENT_POLICY_DISCONNECT).start()
+
+        results = [slow.enqueue(b"0")]
+        # the first message is being sent, the second message is queued
+        await asyncio.sleep(0.01)
+        results += [slow.enqueue(b"1"), slow.enqueue(b"2"), slow.enqueue(b"3")]
+        await asyncio.sleep(0.01)
+        slow.stop()
+
+        return results, slow.websocket.close_code
+
+    results, close_code = asyncio.run(run())
+
+    assert results == [True, True, False, False]
+    assert close_code == socket_server._SLOW_CLIENT_CLOSE_CODE
+
+
+def test_invalid_slow_client_policy_fails_on_start(monkeypatch):
+    monkeypatch.setattr(socket_server, "_SLOW_CLIENT_POLICY", "unknown")
+    monkeypatch.setattr(socket_server, "start_server", lambda: None)
+
+    with pytest.raises(ValueError):
+        socket_server.start_server_threaded()
@@ -1,9 +1,13 @@
 import io
 import os
+import wave
+
+import numpy as np
 import torchaudio
 import pytest
 
-from Utilities.audio_utility import to_wav
+import base_keys
+from Utilities.audio_utility import to_wav, decode_wav, decode_pcm, resample, get_resampler, get_audio_samples
 
 
 @pytest.fixture(scope="session")
@@ -44,3 +48,88 @@ def test_to_wav_higher_resample(seek_audio, read_audio_file):
     resampled_audio = to_wav(seek_audio, target_rate)
     expected_length = int(audio_data.size(-1) * target_rate / original_rate)
     assert resampled_audio.size(-1) == expected_length
+
+
+def test_decode_wav(seek_audio, read_audio_file):
+    audio_data, original_rate, _ = read_audio_file
+    samples, sample_rate = decode_wav(seek_audio)
+
+    assert sample_rate == original_rate
+    assert samples.dtype == np.float32
+    # the same samples as torchaudio (normalised 16-bit PCM)
+    assert np.allclose(samples, audio_data.squeeze(0).numpy(), atol=1e-6)
+
+
+def test_decode_wav_into_buffer(seek_audio):
+    buffer = np.empty(10_000_000, dtype=np.float32)
+    samples, _ = decode_wav(seek_audio, out=buffer)
+    assert np.shares_memory(samples, buffer)
+
+    # too small, a new array is returned
+    small_buffer = np.empty(10, dtype=np.float32)
+    samples, _ = decode_wav(seek_audio.getvalue(), out=small_buffer)
+    assert not np.shares_memory(samples, small_buffer)
+    assert len(samples) > 10
+
+
+def test_decode_wav_stereo():
+    wav_data = io.BytesIO()
+    with wave.open(wav_data, "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(16000)
+        wav_file.writeframes(np.array([16384, 0, -16384, -16384], dtype="<i2").tobytes())
+
+    samples, sample_rate = decode_wav(wav_data)
+
+    assert sample_rate == 16000
+    assert samples.tolist() == [0.25, -0.5]
+
+
+def test_resample(seek_audio, read_audio_file):
+    _, original_rate, _ = read_audio_file
+    samples, _ = decode_wav(seek_audio)
+
+    assert resample(samples, original_rate, original_rate) is samples
+    assert len(resample(samples, original_rate, 16000)) == int(len(samples) * 16000 / original_rate)
+
+
+def test_resampler_is_cached():
+    assert get_resampler(22050, 16000) is get_resampler(22050, 16000)
+    assert get_resampler(22050, 16000) is not get_resampler(16000, 22050)
+
+
+def test_get_audio_samples_decodes_audio_data(seek_audio, read_audio_file):
+    _, original_rate, _ = read_audio_file
+    samples = get_audio_samples({base_keys.AUDIO_DATA: seek_audio}, 16000)
+
+    assert samples.dtype == np.float32
+    assert len(samples) == int(len(decode_wav(seek_audio)[0]) * 16000 / original_rate)
+
+
+def test_get_audio_samples_uses_decoded_samples():
+    samples = np.zeros(16000, dtype=np.float32)
+    # audio_data is not decoded again
+    raw_data = {base_keys.AUDIO_DATA: None, base_keys.AUDIO_SAMPLES_DATA: samples,
+                base_keys.AUDIO_SAMPLE_RATE_DATA: 16000}
+
+    assert get_audio_samples(raw_data, 16000) is samples
+    assert len(get_audio_samples(raw_data, 8000)) == 8000
+
+
+def test_decode_pcm(seek_audio):
+    samples, _ = decode_wav(seek_audio)
+    pcm_data = (samples * 32768).astype("<i2").tobytes()
+
+    assert np.allclose(decode_pcm(pcm_data, 2), samples, atol=1e-6)
+
+
+def test_get_audio_samples_decodes_audio_pcm():
+    pcm_data = np.array([16384, -16384] * 8000, dtype="<i2").tobytes()
+    raw_data = {base_keys.AUDIO_PCM_DATA: pcm_data, base_keys.AUDIO_PCM_SAMPLE_RATE: 16000,
+                base_keys.AUDIO_PCM_SAMPLE_WIDTH: 2, base_keys.AUDIO_PCM_CHANNELS: 1}
+
+    samples = get_audio_samples(raw_data, 16000)
+
+    assert samples[:2].tolist() == [0.5, -0.5]
+    assert len(get_audio_samples(raw_data, 8000)) == 8000
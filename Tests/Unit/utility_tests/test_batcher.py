@@ -0,0 +1,81 @@
+import threading
+import time
+
+from Utilities.batcher import Batcher
+
+
+class BatchRecorder:
+    def __init__(self, expected_frames):
+        self.batches = []
+        self.expected_frames = expected_frames
+        self.done = threading.Event()
+
+    def process_batch(self, batch):
+        self.batches.append(batch)
+        if sum(len(batch) for batch in self.batches) >= self.expected_frames:
+            self.done.set()
+
+
+def test_full_batch_is_processed():
+    recorder = BatchRecorder(expected_frames=4)
+    batcher = Batcher(recorder.process_batch, max_batch_size=4, max_wait_ms=10000).start()
+
+    for i in range(4):
+        batcher.add({"camera_frame": i})
+
+    assert recorder.done.wait(timeout=2)
+    batcher.stop()
+
+    assert recorder.batches == [[{"camera_frame": i} for i in range(4)]]
+
+
+def test_partial_batch_is_processed_after_timeout():
+    recorder = BatchRecorder(expected_frames=2)
+    batcher = Batcher(recorder.process_batch, max_batch_size=4, max_wait_ms=50).start()
+
+    start_time = time.perf_counter()
+    batcher.add({"camera_frame": 0})
+    batcher.add({"camera_frame": 1})
+
+    assert recorder.done.wait(timeout=2)
+    batcher.stop()
+
+    assert time.perf_counter() - start_time >= 0.05
+    assert recorder.batches == [[{"camera_frame": 0}, {"camera_frame": 1}]]
+
+
+def test_oldest_frames_are_dropped():
+    batcher = Batcher(lambda batch: None, max_batch_size=2, max_pending=3)
+
+    for i in range(5):
+        batcher.add({"camera_frame": i})
+
+    assert batcher.get_pending_count() == 3
+    assert [raw_data["camera_frame"] for _, raw_data in batcher._pending] == [2, 3, 4]
+
+
+def test_add_blocks_when_full_without_drop_oldest():
+    recorder = BatchRecorder(expected_frames=5)
+    release = threading.Event()
+
+    def process_batch(batch):
+        release.wait(timeout=2)
+        recorder.process_batch(batch)
+
+    batcher = Batcher(process_batch, max_batch_size=1, max_pending=2, drop_oldest=False).start()
+    batcher.add({"transcript": 0})
+    # the worker takes the first item and waits, so two more items fill the batcher
+    batcher.add({"transcript": 1})
+    batcher.add({"transcript": 2})
+
+    adder = threading.Thread(target=lambda: [batcher.add({"transcript": i}) for i in (3, 4)])
+    adder.start()
+    adder.join(timeout=0.1)
+    assert adder.is_alive()
+
+    release.set()
+    adder.join(timeout=2)
+    assert recorder.done.wait(timeout=2)
+    batcher.stop()
+
+    assert [batch[0]["transcript"] for batch in recorder.batches] == [0, 1, 2, 3, 4]
@@ -172,3 +172,44 @@ def test_get_channel_pipes():
     }
 
     assert expected_result == config_utility.get_channel_pipes()
+
+
+def test_add_options_to_configuration():
+    config_utility.configuration = {
+        "channel-options": {}
+    }
+
+    test_component = {
+        "options": {"batch_size": 4}
+    }
+
+    config_utility.add_options_to_configuration(test_component, "test_key")
+    config_utility.add_options_to_configuration({}, "no_options_key")
+
+    expected_result = {
+        "channel-options": {
+            "test_key": {"batch_size": 4}
+        }
+    }
+
+    assert expected_result == config_utility.configuration
+
+
+def test_get_channel_options():
+    config_utility.configuration = {
+        "channel-options": {
+            "test_key": {"batch_size": 4}
+        }
+    }
+
+    assert config_utility.get_channel_options("test_key") == {"batch_size": 4}
+    assert config_utility.get_channel_options("unknown") == {}
+
+
+def test_get_channel_options_loads_configuration(mocker):
+    def parse_all_config():
+        config_utility.configuration["channel-options"] = {"test_key": {"batch_size": 4}}
+
+    mocker.patch.object(config_utility, "parse_all_config", side_effect=parse_all_config)
+
+    assert config_utility.get_channel_options("test_key") == {"batch_size": 4}
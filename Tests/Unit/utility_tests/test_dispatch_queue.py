@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from Utilities.dispatch_queue import DispatchQueue, DISPATCH_POLICY_BLOCK, DISPATCH_POLICY_DROP_OLDEST, \
+    DISPATCH_POLICY_LATEST_ONLY
+
+
+class BlockingHandler:
+    def __init__(self):
+        self.messages = []
+        self.release = threading.Event()
+        self.received = threading.Event()
+
+    def handle(self, message):
+        self.received.set()
+        self.release.wait(timeout=2)
+        self.messages.append(message)
+
+
+def _fill_queue(policy, num_messages, max_size=2):
+    handler = BlockingHandler()
+    dispatch_queue = DispatchQueue("test", handler.handle, max_size=max_size, policy=policy).start()
+
+    # the first message is taken by the worker, which is then blocked by the handler
+    dispatch_queue.put(0)
+    assert handler.received.wait(timeout=2)
+
+    for i in range(1, num_messages):
+        dispatch_queue.put(i)
+
+    return dispatch_queue, handler
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        DispatchQueue("test", print, policy="unknown")
+
+
+def test_messages_are_handled_in_order():
+    done = threading.Event()
+    messages = []
+
+    def handle(message):
+        messages.append(message)
+        if len(messages) == 5:
+            done.set()
+
+    dispatch_queue = DispatchQueue("test", handle, policy=DISPATCH_POLICY_BLOCK).start()
+    for i in range(5):
+        dispatch_queue.put(i)
+
+    assert done.wait(timeout=2)
+    dispatch_queue.stop()
+    assert messages == [0, 1, 2, 3, 4]
+
+
+def test_drop_oldest_policy():
+    dispatch_queue, handler = _fill_queue(DISPATCH_POLICY_DROP_OLDEST, num_messages=5)
+
+    assert dispatch_queue.get_queue_depth() == 2
+    assert dispatch_queue.get_dropped_count() == 2
+    assert [message for _, message in dispatch_queue._messages] == [3, 4]
+
+    handler.release.set()
+    dispatch_queue.stop()
+
+
+def test_latest_only_policy():
+    dispatch_queue, handler = _fill_queue(DISPATCH_POLICY_LATEST_ONLY, num_messages=5, max_size=10)
+
+    assert dispatch_queue.get_queue_depth() == 1
+    assert dispatch_queue.get_dropped_count() == 3
+    assert [message for _, message in dispatch_queue._messages] == [4]
+
+    handler.release.set()
+    dispatch_queue.stop()
+
+
+def test_block_policy():
+    dispatch_queue, handler = _fill_queue(DISPATCH_POLICY_BLOCK, num_messages=3)
+
+    # the queue is full, so the publisher is blocked until the handler consumes a message
+    publisher = threading.Thread(target=dispatch_queue.put, args=(3,))
+    publisher.start()
+    publisher.join(timeout=0.1)
+    assert publisher.is_alive()
+
+    handler.release.set()
+    publisher.join(timeout=2)
+    assert not publisher.is_alive()
+    assert dispatch_queue.get_dropped_count() == 0
+    dispatch_queue.stop()
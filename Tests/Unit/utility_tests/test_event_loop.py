@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from Utilities.event_loop import BackgroundEventLoop
+
+
+@pytest.fixture
+def background_loop():
+    loop = BackgroundEventLoop("test_event_loop")
+    yield loop
+    loop.stop(timeout=1)
+
+
+async def _sleep_and_return(seconds, value):
+    await asyncio.sleep(seconds)
+    return value
+
+
+def test_run(background_loop):
+    assert background_loop.run(_sleep_and_return(0, "value")) == "value"
+    assert background_loop.is_running()
+
+
+def test_run_from_threads_overlap(background_loop):
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(background_loop.run(_sleep_and_return(0.2, i))))
+               for i in range(5)]
+
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert time.perf_counter() - start_time < 0.5
+
+
+def test_run_timeout_cancels(background_loop):
+    cancelled = threading.Event()
+
+    async def wait_forever():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        background_loop.run(wait_forever(), timeout=0.05)
+
+    assert cancelled.wait(1)
+
+
+def test_submit_and_stop(background_loop):
+    future = background_loop.submit(_sleep_and_return(0, "value"))
+
+    assert future.result(1) == "value"
+
+    background_loop.stop(timeout=1)
+    assert not background_loop.is_running()
+    # the event loop is started again on the next coroutine
+    assert background_loop.run(_sleep_and_return(0, "value")) == "value"
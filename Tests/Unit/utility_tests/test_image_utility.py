@@ -9,6 +9,10 @@ from io import BytesIO
 from unittest.mock import patch, mock_open
 from Utilities.image_utility import (
     get_similarity_images,
+    get_similarity_frames,
+    get_similarity_frames_batch,
+    get_perceptual_hash,
+    get_perceptual_hash_similarity,
     get_pixel_diff,
     get_cropped_frame,
     read_image_file_bytes,
@@ -64,6 +68,45 @@ def test_get_similarity_images(sample_image_red_100: Image, sample_image_blue_10
     assert similarity == 0
 
 
+def test_get_similarity_images_threshold():
+    image1 = Image.new('RGB', (20, 20), color=(100, 100, 100))
+    image2 = Image.new('RGB', (20, 20), color=(103, 104, 100))  # pixel diff is 5
+    image2.paste((200, 200, 200), (0, 0, 10, 20))  # half of the pixels are different
+
+    assert get_similarity_images(image1, image2, 4.9) == 0
+    assert get_similarity_images(image1, image2, 5) == 0.5
+    assert get_similarity_images(image1, image2, 5, scale=0.5) == 0.5
+
+
+def test_get_similarity_frames_batch(sample_opencv_frame: np.ndarray):
+    half_white_frame = sample_opencv_frame.copy()
+    half_white_frame[:50] = 255
+    small_frame = np.zeros((50, 50, 3), dtype=np.uint8)
+
+    similarities = get_similarity_frames_batch(sample_opencv_frame, [sample_opencv_frame, half_white_frame,
+                                                                     small_frame], 10)
+
+    assert similarities.tolist() == [1, 0.5, 0]
+    assert get_similarity_frames(sample_opencv_frame, half_white_frame, 10) == 0.5
+    assert get_similarity_frames(sample_opencv_frame, small_frame, 10) == 0
+
+
+def test_get_perceptual_hash_similarity():
+    rng = np.random.default_rng(0)
+    frame = cv2.resize(rng.integers(0, 256, (8, 8), dtype=np.uint8), (128, 128), interpolation=cv2.INTER_CUBIC)
+    noisy_frame = np.clip(frame + rng.integers(-5, 5, frame.shape), 0, 255).astype(np.uint8)
+    flipped_frame = frame[:, ::-1]
+
+    frame_hash = get_perceptual_hash(frame)
+    similarities = get_perceptual_hash_similarity(frame_hash, np.stack([get_perceptual_hash(noisy_frame),
+                                                                        get_perceptual_hash(flipped_frame)]))
+
+    assert frame_hash.size == 64
+    assert get_perceptual_hash_similarity(frame_hash, frame_hash) == 1
+    assert similarities[0] > 0.9
+    assert similarities[1] < 0.8
+
+
 def test_get_pixel_diff():
     pixel1: tuple = (255, 0, 0)
     pixel2: tuple = (0, 0, 255)
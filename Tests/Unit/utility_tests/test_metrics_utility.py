@@ -0,0 +1,85 @@
+import pytest
+
+from Utilities import metrics_utility
+from Utilities.metrics_utility import LatencyHistogram
+
+
+@pytest.fixture(autouse=True)
+def teardown():
+    yield
+    metrics_utility.reset_metrics()
+
+
+def test_increment_counter():
+    metrics_utility.increment_counter("test.counter")
+    metrics_utility.increment_counter("test.counter", 2)
+
+    assert metrics_utility.get_counter("test.counter") == 3
+    assert metrics_utility.get_counter("test.unknown") == 0
+
+
+def test_set_gauge():
+    metrics_utility.set_gauge("test.gauge", 5)
+    metrics_utility.set_gauge("test.gauge", 3)
+
+    assert metrics_utility.get_gauge("test.gauge") == 3
+    assert metrics_utility.get_gauge("test.unknown") is None
+
+
+def test_record_latency_ms():
+    for value_ms in [1, 3, 8, 40, 6000]:
+        metrics_utility.record_latency_ms("test.latency", value_ms)
+
+    latency = metrics_utility.get_latency("test.latency")
+    assert latency["count"] == 5
+    assert latency["min_ms"] == 1
+    assert latency["max_ms"] == 6000
+    assert latency["mean_ms"] == pytest.approx(6052 / 5)
+    assert latency["buckets_ms"][float("inf")] == 1
+    assert metrics_utility.get_latency("test.unknown") is None
+
+
+def test_measure_latency():
+    with metrics_utility.measure_latency("test.measure"):
+        pass
+
+    assert metrics_utility.get_latency("test.measure")["count"] == 1
+
+
+def test_latency_histogram_percentile():
+    histogram = LatencyHistogram(buckets_ms=(10, 20, 50))
+    assert histogram.get_percentile_ms(50) is None
+
+    for value_ms in [5] * 90 + [15] * 9 + [100]:
+        histogram.observe(value_ms)
+
+    assert histogram.get_percentile_ms(50) == 10
+    assert histogram.get_percentile_ms(95) == 20
+    assert histogram.get_percentile_ms(100) == 100
+
+
+def test_metrics_hook():
+    recorded = []
+
+    def hook(metric_type, name, value):
+        recorded.append((metric_type, name, value))
+
+    metrics_utility.add_metrics_hook(hook)
+    metrics_utility.increment_counter("test.counter")
+    metrics_utility.record_latency_ms("test.latency", 2)
+    metrics_utility.remove_metrics_hook(hook)
+    metrics_utility.set_gauge("test.gauge", 1)
+
+    assert recorded == [(metrics_utility.METRIC_TYPE_COUNTER, "test.counter", 1),
+                        (metrics_utility.METRIC_TYPE_LATENCY, "test.latency", 2)]
+
+
+def test_get_all_metrics():
+    metrics_utility.increment_counter("test.counter")
+    metrics_utility.set_gauge("test.gauge", 1)
+    metrics_utility.record_latency_ms("test.latency", 2)
+
+    all_metrics = metrics_utility.get_all_metrics()
+    assert all_metrics[metrics_utility.METRIC_TYPE_COUNTER] == {"test.counter": 1}
+    assert all_metrics[metrics_utility.METRIC_TYPE_GAUGE] == {"test.gauge": 1}
+    assert "test.latency" in all_metrics[metrics_utility.METRIC_TYPE_LATENCY]
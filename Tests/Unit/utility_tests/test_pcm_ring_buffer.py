@@ -0,0 +1,68 @@
+import threading
+
+from Utilities import metrics_utility
+from Utilities.pcm_ring_buffer import PcmRingBuffer
+
+
+def test_read_returns_written_data():
+    ring_buffer = PcmRingBuffer(16)
+    ring_buffer.write(b"abcd")
+    ring_buffer.write(b"ef")
+
+    assert ring_buffer.get_size() == 6
+    assert ring_buffer.read() == b"abcdef"
+    assert ring_buffer.read() == b""
+
+
+def test_data_wraps_around():
+    ring_buffer = PcmRingBuffer(8)
+    ring_buffer.write(b"abcdef")
+    assert ring_buffer.read() == b"abcdef"
+
+    ring_buffer.write(b"ghijkl")
+
+    assert ring_buffer.read() == b"ghijkl"
+
+
+def test_chunks_are_dropped_when_full():
+    metrics_utility.reset_metrics()
+    ring_buffer = PcmRingBuffer(8, name="test_ring_buffer")
+
+    assert ring_buffer.write(b"abcdef")
+    assert not ring_buffer.write(b"ghij")
+
+    assert ring_buffer.read() == b"abcdef"
+    assert metrics_utility.get_counter("test_ring_buffer.dropped_bytes") == 4
+
+
+def test_capacity_is_whole_frames():
+    assert PcmRingBuffer(15, frame_bytes=4).capacity_bytes == 12
+
+
+def test_latency_is_recorded_per_chunk():
+    metrics_utility.reset_metrics()
+    ring_buffer = PcmRingBuffer(16, name="test_ring_buffer")
+    ring_buffer.write(b"ab")
+    ring_buffer.write(b"cd")
+    ring_buffer.read()
+
+    assert metrics_utility.get_latency("test_ring_buffer.callback_to_send")["count"] == 2
+
+
+def test_consumer_is_woken_up_by_write():
+    ring_buffer = PcmRingBuffer(1024)
+    received = []
+
+    def consume():
+        while len(received) < 3:
+            assert ring_buffer.wait(timeout=2)
+            received.extend(ring_buffer.read())
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    for value in range(3):
+        ring_buffer.write(bytes([value]))
+    consumer.join(timeout=2)
+
+    assert received == [0, 1, 2]
+    assert not ring_buffer.wait(timeout=0.01)
@@ -0,0 +1,67 @@
+import pytest
+
+import base_keys
+from base_component import BaseComponent
+from DataFormat import datatypes_helper
+from Memory import Memory
+from Utilities import config_utility, endpoint_utility, routing_utility
+
+
+class TemplateReceiver(BaseComponent):
+    SUPPORTED_DATATYPES = {
+        "REQUEST_TEMPLATE_DATA",
+        "UNKNOWN_DATA",
+    }
+
+    def run(self, raw_data):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def pipe_config():
+    Memory.init()
+    config_utility.configuration = {
+        "channel-pipes": {base_keys.WEBSOCKET_WIDGET: ["service:first", "service:second"],
+                          "input:camera": ["service:first"]},
+        "channel-entrypoints": {"service:first": "first.TemplateReceiver.run",
+                                "service:second": "second.TemplateReceiver.run"},
+        "channel-options": {"service:second": {"dispatch_policy": "drop_oldest", "dispatch_queue_size": 3}},
+    }
+    endpoint_utility.component_instances["service:first"] = TemplateReceiver("service:first")
+    endpoint_utility.component_instances["service:second"] = TemplateReceiver("service:second")
+    yield
+    config_utility.configuration = {}
+    endpoint_utility.component_instances.clear()
+
+
+def test_compile_routes():
+    routes = routing_utility.compile_routes(base_keys.WEBSOCKET_WIDGET)
+
+    assert [route.subscriber for route in routes] == ["service:first", "service:second"]
+    assert routes[0].entry_func == endpoint_utility.component_instances["service:first"].run
+    assert routes[0].dispatch_queue is None
+    assert routes[1].dispatch_queue.policy == "drop_oldest"
+    assert routes[1].dispatch_queue.max_size == 3
+    routes[1].dispatch_queue.stop()
+
+
+def test_compile_routes_no_subscribers():
+    assert routing_utility.compile_routes("output:unknown") == ()
+
+
+def test_route_accepts_websocket_datatypes():
+    template_key = datatypes_helper.get_key_by_name("REQUEST_TEMPLATE_DATA")
+    running_key = datatypes_helper.get_key_by_name("EXERCISE_WEAR_OS_DATA")
+
+    route = routing_utility.compile_routes(base_keys.WEBSOCKET_WIDGET)[0]
+
+    assert route.datatype_keys == frozenset({template_key})
+    assert route.accepts({base_keys.WEBSOCKET_DATATYPE: template_key})
+    assert not route.accepts({base_keys.WEBSOCKET_DATATYPE: running_key})
+
+
+def test_route_accepts_all_non_websocket_messages():
+    route = routing_utility.compile_routes("input:camera")[0]
+
+    assert route.datatype_keys is None
+    assert route.accepts({base_keys.CAMERA_FRAME: None})
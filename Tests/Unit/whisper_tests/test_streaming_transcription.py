@@ -0,0 +1,125 @@
+import time
+
+import numpy as np
+
+from Processors.Whisper.streaming_transcription import StreamingTranscription
+
+SAMPLE_RATE = 16000
+
+
+def speech(seconds):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(SAMPLE_RATE * seconds), dtype=np.float32)
+
+
+class ScriptedTranscriber:
+    def __init__(self, hypotheses):
+        self.hypotheses = list(hypotheses)
+        self.lengths = []
+
+    def transcribe(self, samples):
+        self.lengths.append(len(samples))
+        return self.hypotheses.pop(0)
+
+
+def test_silence_is_not_transcribed():
+    transcriber = ScriptedTranscriber([])
+    streaming = StreamingTranscription(transcriber.transcribe)
+
+    assert streaming.add_audio(silence(1)) is None
+    assert streaming.flush() is None
+    assert transcriber.lengths == []
+
+
+def test_words_are_committed_when_hypotheses_agree():
+    transcriber = ScriptedTranscriber(["hello word", "hello world how", "hello world how are you"])
+    streaming = StreamingTranscription(transcriber.transcribe)
+
+    update = streaming.add_audio(speech(1))
+    assert (update.partial_text, update.committed_text, update.is_final) == ("hello word", "", False)
+
+    update = streaming.add_audio(speech(1))
+    assert (update.partial_text, update.committed_text) == ("hello world how", "hello")
+
+    update = streaming.add_audio(speech(1))
+    assert (update.partial_text, update.committed_text) == ("hello world how are you", "world how")
+    # the whole segment is transcribed again
+    assert transcriber.lengths == [SAMPLE_RATE, 2 * SAMPLE_RATE, 3 * SAMPLE_RATE]
+
+
+def test_segment_is_finalized_after_silence():
+    transcriber = ScriptedTranscriber(["hello", "hello there", "hi there"])
+    streaming = StreamingTranscription(transcriber.transcribe, min_silence_ms=600)
+
+    streaming.add_audio(speech(1))
+    update = streaming.add_audio(speech(1))
+    assert update.committed_text == "hello"
+
+    update = streaming.add_audio(silence(1))
+    # the committed words are kept, only the rest of the final hypothesis is committed
+    assert (update.partial_text, update.committed_text, update.is_final) == ("hello there", "there", True)
+
+    assert streaming.add_audio(silence(1)) is None
+
+
+def test_segment_is_finalized_when_no_audio_arrives():
+    transcriber = ScriptedTranscriber(["hello", "hello there", "hello there you"])
+    streaming = StreamingTranscription(transcriber.transcribe, min_silence_ms=600)
+
+    # the audio source stops sending audio after the phrase, without any silence
+    streaming.add_audio(speech(1))
+    add_time = time.perf_counter()
+    streaming.add_audio(speech(1))
+
+    # the next chunk is still expected while it is being recorded
+    assert streaming.flush_if_idle(now=add_time + 1.5) is None
+
+    update = streaming.flush_if_idle(now=add_time + 1.7)
+    assert (update.partial_text, update.committed_text, update.is_final) == ("hello there you", "there you", True)
+    assert streaming.flush_if_idle(now=add_time + 10) is None
+
+
+def test_ended_segment_is_transcribed_after_new_audio():
+    transcriber = ScriptedTranscriber(["hello", "hello there", "how", "hello there you"])
+    streaming = StreamingTranscription(transcriber.transcribe, min_silence_ms=600)
+
+    streaming.add_audio(speech(1))
+    add_time = time.perf_counter()
+    streaming.add_audio(speech(1))
+
+    segment = streaming.end_if_idle(now=add_time + 1.7)
+    assert streaming.end_if_idle(now=add_time + 10) is None
+    # the next segment starts before the ended one is transcribed
+    update = streaming.add_audio(speech(0.5))
+    assert (update.partial_text, update.committed_text) == ("how", "")
+
+    update = streaming.transcribe_segment(segment)
+    assert (update.partial_text, update.committed_text, update.is_final) == ("hello there you", "there you", True)
+    assert transcriber.lengths == [SAMPLE_RATE, 2 * SAMPLE_RATE, SAMPLE_RATE // 2, 2 * SAMPLE_RATE]
+
+
+def test_leading_silence_is_skipped():
+    transcriber = ScriptedTranscriber(["hello"])
+    streaming = StreamingTranscription(transcriber.transcribe)
+
+    streaming.add_audio(np.concatenate((silence(0.3), speech(0.3))))
+
+    assert abs(transcriber.lengths[0] - int(SAMPLE_RATE * 0.3)) < streaming.frame_length
+
+
+def test_long_segment_is_split():
+    transcriber = ScriptedTranscriber(["first segment", "second"])
+    streaming = StreamingTranscription(transcriber.transcribe, max_segment_seconds=2)
+
+    update = streaming.add_audio(speech(3))
+    assert (update.committed_text, update.is_final) == ("first segment", True)
+    assert transcriber.lengths == [2 * SAMPLE_RATE]
+
+    # the speech after the split starts the next segment
+    update = streaming.flush()
+    assert (update.committed_text, update.is_final) == ("second", True)
+    assert transcriber.lengths[1] == SAMPLE_RATE
@@ -0,0 +1,56 @@
+import pytest
+
+from Processors.Yolov8 import model_registry
+
+
+class FakeYolo:
+    loaded_paths = []
+
+    def __init__(self, model_path):
+        self.loaded_paths.append(model_path)
+        self.inference_count = 0
+
+    def __call__(self, frame, verbose=False):
+        self.inference_count += 1
+
+
+@pytest.fixture(autouse=True)
+def fake_yolo(monkeypatch):
+    FakeYolo.loaded_paths = []
+    monkeypatch.setattr(model_registry, "YOLO", FakeYolo)
+    model_registry.clear_models()
+    yield
+    model_registry.clear_models()
+
+
+def test_model_is_loaded_once():
+    model = model_registry.get_model("model.pt")
+
+    assert model_registry.get_model("model.pt") is model
+    assert FakeYolo.loaded_paths == ["model.pt"]
+    # warmed up once, when loaded
+    assert model.inference_count == 1
+
+
+def test_models_are_loaded_by_path():
+    model = model_registry.get_model("model.pt", warmup=False)
+    other_model = model_registry.get_model("other_model.pt", warmup=False)
+
+    assert model is not other_model
+    assert FakeYolo.loaded_paths == ["model.pt", "other_model.pt"]
+    assert model.inference_count == 0
+
+
+def test_cleared_model_is_loaded_again():
+    model_registry.get_model("model.pt")
+    model_registry.clear_models()
+    model_registry.get_model("model.pt")
+
+    assert FakeYolo.loaded_paths == ["model.pt", "model.pt"]
+
+
+def test_inference_lock_is_shared_by_path():
+    model_registry.get_model("model.pt", warmup=False)
+
+    assert model_registry.get_inference_lock("model.pt") is model_registry.get_inference_lock("model.pt")
+    assert model_registry.get_inference_lock("model.pt") is not model_registry.get_inference_lock("other_model.pt")
@@ -1,10 +1,127 @@
+import functools
+import io
+import wave
+
+import numpy as np
+import torch
 import torchaudio
 
+import base_keys
+
+# numpy dtype and scale to [-1, 1] of the PCM samples by sample width in bytes (8-bit WAV samples are unsigned)
+_PCM_FORMATS = {
+    1: (np.uint8, 1 / 128, -1.0),
+    2: (np.dtype("<i2"), 1 / 32768, 0.0),
+    4: (np.dtype("<i4"), 1 / 2147483648, 0.0),
+}
+
 
 def to_wav(audio_data, sample_rate):
     wav, rate = torchaudio.load(audio_data)
 
     if rate != sample_rate:
-        wav = torchaudio.transforms.Resample(rate, sample_rate)(wav)
+        wav = get_resampler(rate, sample_rate)(wav)
 
     return wav.squeeze(0)
+
+
+def decode_wav(wav_data, out=None):
+    '''
+    Decode a PCM WAV in memory to float32 mono samples in [-1, 1], without a temporary file or ffmpeg
+
+    :param wav_data: WAV file as BytesIO or bytes
+    :param out: preallocated float32 array to decode into, the samples are a view of it if it is large enough (so the
+        samples are valid only until the next call with the same array)
+    :return: (numpy float32 array of the samples, sample rate)
+    '''
+    if isinstance(wav_data, (bytes, bytearray, memoryview)):
+        wav_data = io.BytesIO(wav_data)
+    wav_data.seek(0)
+
+    with wave.open(wav_data, "rb") as wav_file:
+        num_channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        sample_rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    return decode_pcm(frames, sample_width, num_channels, out=out), sample_rate
+
+
+def decode_pcm(pcm_data, sample_width, num_channels=1, out=None):
+    '''
+    Decode raw PCM to float32 mono samples in [-1, 1]
+
+    :param pcm_data: bytes of the interleaved PCM frames, e.g., the audio_pcm of AudioWidget
+    :param sample_width: bytes per sample
+    :param num_channels: number of channels, they are averaged
+    :param out: preallocated float32 array to decode into, see decode_wav
+    :return: numpy float32 array of the samples
+    '''
+    if sample_width not in _PCM_FORMATS:
+        raise ValueError(f"Unsupported PCM sample width: {sample_width} bytes, must be one of {list(_PCM_FORMATS)}")
+    dtype, scale, offset = _PCM_FORMATS[sample_width]
+    pcm = np.frombuffer(pcm_data, dtype=dtype, count=len(pcm_data) // sample_width)
+    num_samples = len(pcm) // num_channels
+
+    samples = out[:num_samples] if out is not None and len(out) >= num_samples else np.empty(num_samples, np.float32)
+    if num_channels == 1:
+        np.multiply(pcm, scale, out=samples, casting="unsafe")
+    else:
+        np.mean(pcm[:num_samples * num_channels].reshape(-1, num_channels), axis=1, out=samples)
+        samples *= scale
+    if offset:
+        samples += offset
+
+    return samples
+
+
+def decode_audio_data(raw_data, out=None):
+    '''
+    :param raw_data: message of the audio widget, with raw PCM (audio_pcm and its format) or a WAV (audio_data)
+    :param out: preallocated float32 array to decode into, see decode_wav
+    :return: (numpy float32 array of the mono samples in [-1, 1], sample rate)
+    '''
+    if base_keys.AUDIO_PCM_DATA in raw_data:
+        samples = decode_pcm(raw_data[base_keys.AUDIO_PCM_DATA], raw_data[base_keys.AUDIO_PCM_SAMPLE_WIDTH],
+                             raw_data[base_keys.AUDIO_PCM_CHANNELS], out=out)
+        return samples, raw_data[base_keys.AUDIO_PCM_SAMPLE_RATE]
+
+    return decode_wav(raw_data[base_keys.AUDIO_DATA], out=out)
+
+
+def resample(samples, rate, target_rate):
+    '''
+    :param samples: numpy float32 array of mono samples
+    :return: numpy float32 array of the samples at the target rate, the same array if the rates are the same
+    '''
+    if rate == target_rate:
+        return samples
+    with torch.no_grad():
+        return get_resampler(rate, target_rate)(torch.from_numpy(samples)).numpy()
+
+
+@functools.lru_cache(maxsize=16)
+def get_resampler(rate, target_rate):
+    '''
+    :return: torchaudio Resample transform of the rate pair, created once as it computes the filter kernel
+    '''
+    return torchaudio.transforms.Resample(rate, target_rate)
+
+
+def get_audio_samples(raw_data, sample_rate, out=None):
+    '''
+    Get the samples of an utterance, decoded once by the audio frontend (audio_samples) if it is in the pipeline,
+    otherwise decoded from the audio of the audio widget (see decode_audio_data)
+
+    :param raw_data: message of the audio frontend or of the audio widget
+    :param sample_rate: sample rate of the samples
+    :param out: preallocated float32 array to decode into, see decode_wav
+    :return: numpy float32 array of the mono samples in [-1, 1], must not be modified (it may be shared with the other
+        processors of the utterance)
+    '''
+    if base_keys.AUDIO_SAMPLES_DATA in raw_data:
+        return resample(raw_data[base_keys.AUDIO_SAMPLES_DATA], raw_data[base_keys.AUDIO_SAMPLE_RATE_DATA],
+                        sample_rate)
+
+    samples, rate = decode_audio_data(raw_data, out=out)
+    return resample(samples, rate, sample_rate)
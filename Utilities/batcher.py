@@ -0,0 +1,126 @@
+import threading
+import time
+
+from Utilities import logging_utility, metrics_utility
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+class Batcher:
+    """
+    Collects items (e.g., the raw data sent by camera widgets) from one or more sources and hands them over as a
+    batch once `max_batch_size` items are pending or the oldest pending item has waited `max_wait_ms`.
+
+    The batch is processed in a background thread, so the sources are not blocked by the processing. If the processing
+    cannot keep up and `max_pending` items are pending, the oldest pending item is dropped (e.g., for camera frames),
+    or `add` blocks until there is room if `drop_oldest` is False (e.g., for transcripts).
+
+    Batch size, batch wait and dropped items are recorded through metrics_utility, with the batcher name as prefix.
+    """
+
+    def __init__(self, process_batch, max_batch_size=4, max_wait_ms=30, max_pending=None, drop_oldest=True,
+                 name="batcher"):
+        '''
+        :param process_batch: callable which receives the list of pending items, in arrival order
+        :param max_batch_size: maximum number of items in a batch
+        :param max_wait_ms: maximum time to wait for a full batch, counted from the arrival of the oldest item
+        :param max_pending: maximum number of pending items, default to 2 batches
+        :param drop_oldest: True to drop the oldest pending item when full, False to block `add` until there is room
+        :param name: prefix of the metrics
+        '''
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_ms / 1000
+        self.max_pending = max_pending if max_pending else 2 * self.max_batch_size
+        self.drop_oldest = drop_oldest
+
+        self.metric_batch_size = f"{name}.batch_size"
+        self.metric_batch_wait = f"{name}.batch_wait"
+        self.metric_dropped = f"{name}.dropped"
+
+        self._pending = []  # [(arrival_time, raw_data), ...]
+        self._condition = threading.Condition()
+        self._is_running = False
+        self._thread = None
+
+    def start(self):
+        with self._condition:
+            if self._is_running:
+                return self
+            self._is_running = True
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._condition:
+            self._is_running = False
+            self._condition.notify_all()
+
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def add(self, item):
+        with self._condition:
+            if not self.drop_oldest:
+                # woken up by the worker when it takes a batch
+                while self._is_running and len(self._pending) >= self.max_pending:
+                    self._condition.wait()
+
+            self._pending.append((time.perf_counter(), item))
+
+            if len(self._pending) > self.max_pending:
+                self._pending.pop(0)
+                metrics_utility.increment_counter(self.metric_dropped)
+
+            # wake up the worker to start the wait window of the first item, or to process a full batch
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch_size:
+                self._condition.notify_all()
+
+    def get_pending_count(self):
+        with self._condition:
+            return len(self._pending)
+
+    def _next_batch(self):
+        '''
+        Block until a batch is ready (or the batcher is stopped)
+
+        :return: list of items, empty if the batcher is stopped
+        '''
+        with self._condition:
+            while self._is_running:
+                if len(self._pending) >= self.max_batch_size:
+                    break
+
+                if self._pending:
+                    remaining_seconds = self._pending[0][0] + self.max_wait_seconds - time.perf_counter()
+                    if remaining_seconds <= 0:
+                        break
+                    self._condition.wait(remaining_seconds)
+                else:
+                    self._condition.wait()
+
+            if not self._is_running:
+                return []
+
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            # wake up the sources blocked by a full batcher
+            self._condition.notify_all()
+
+        metrics_utility.record_latency_ms(self.metric_batch_wait, metrics_utility.get_elapsed_ms(batch[0][0]))
+        metrics_utility.set_gauge(self.metric_batch_size, len(batch))
+        return [item for _, item in batch]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+
+            try:
+                self.process_batch(batch)
+            except Exception:
+                _logger.exception("Error processing batch of {size} items", size=len(batch))
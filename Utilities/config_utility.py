@@ -10,11 +10,13 @@ CONFIGURATION_CHANNELS_KEY = "channels"
 CONFIGURATION_CHANNEL_PIPES_KEY = "channel-pipes"
 CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY = "channel-entrypoints"
 CONFIGURATION_CHANNELS_EXITPOINTS_KEY = "channel-exitpoints"
+CONFIGURATION_CHANNELS_OPTIONS_KEY = "channel-options"
 
 BASE_CONFIGURATION_ENTRYPOINT_KEY = "entrypoint"
 BASE_CONFIGURATION_EXITPOINT_KEY = "exitpoint"
 BASE_CONFIGURATION_COMPONENT_NAME_KEY = "name"
 BASE_CONFIGURATION_COMPONENT_SUBSCRIBER_KEY = "next"
+BASE_CONFIGURATION_COMPONENT_OPTIONS_KEY = "options"
 
 _logger = logging_utility.setup_logger(__name__)
 
@@ -30,6 +32,7 @@ def parse_all_config():
     configuration[CONFIGURATION_CHANNEL_PIPES_KEY] = {}
     configuration[CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY] = {}
     configuration[CONFIGURATION_CHANNELS_EXITPOINTS_KEY] = {}
+    configuration[CONFIGURATION_CHANNELS_OPTIONS_KEY] = {}
 
     for filename in config_files:
         filepath = f"{CONFIG_DIR}/{filename}"
@@ -49,6 +52,7 @@ def parse_config(cfg, cfg_type, filename):
             add_entrypoint_to_configuration(component, cfg_key)
             add_exitpoint_to_configuration(component, cfg_key)
             add_pipe_to_configuration(component, cfg_key)
+            add_options_to_configuration(component, cfg_key)
     except Exception as exc:
         raise Exception(f"Error parsing Configuration File: {filename}") from exc
 
@@ -96,6 +100,17 @@ def add_pipe_to_configuration(component, cfg_key):
         configuration[CONFIGURATION_CHANNEL_PIPES_KEY][cfg_key] = []
 
 
+def add_options_to_configuration(component, cfg_key):
+    if BASE_CONFIGURATION_COMPONENT_OPTIONS_KEY not in component:
+        return
+
+    options = component[BASE_CONFIGURATION_COMPONENT_OPTIONS_KEY] or {}
+    if cfg_key not in configuration[CONFIGURATION_CHANNELS_OPTIONS_KEY]:
+        configuration[CONFIGURATION_CHANNELS_OPTIONS_KEY][cfg_key] = dict(options)
+    else:
+        configuration[CONFIGURATION_CHANNELS_OPTIONS_KEY][cfg_key].update(options)
+
+
 def get_config():
     if not configuration:
         parse_all_config()
@@ -113,3 +128,13 @@ def get_channel_exitpoints():
 
 def get_channel_pipes():
     return configuration[CONFIGURATION_CHANNEL_PIPES_KEY]
+
+
+def get_channel_options(component):
+    '''
+    Get the optional, component specific settings (i.e., `options` of the component in the configuration file)
+
+    :param component: Format in configuration file, i.e., processing:yolov8
+    :return: dict of options, empty if not configured
+    '''
+    return get_config().get(CONFIGURATION_CHANNELS_OPTIONS_KEY, {}).get(component, {})
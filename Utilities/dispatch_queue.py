@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import deque
+
+from Utilities import logging_utility, metrics_utility
+
+# Backpressure policies, i.e., what to do when a message arrives and the queue is full
+DISPATCH_POLICY_BLOCK = "block"  # wait until the subscriber has consumed a message
+DISPATCH_POLICY_DROP_OLDEST = "drop_oldest"  # drop the oldest queued message
+DISPATCH_POLICY_LATEST_ONLY = "latest_only"  # keep only the latest message (e.g., for video frames)
+DISPATCH_POLICIES = [DISPATCH_POLICY_BLOCK, DISPATCH_POLICY_DROP_OLDEST, DISPATCH_POLICY_LATEST_ONLY]
+
+DEFAULT_QUEUE_SIZE = 10
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+class DispatchQueue:
+    """
+    A bounded queue with a worker thread, which decouples a publisher from a (slow) subscriber. Messages are handled
+    in order by the worker thread, and the backpressure policy decides what happens when the queue is full.
+
+    Queue depth, dropped messages and handler latency are recorded through metrics_utility, with the queue name as
+    the prefix (e.g., "dispatch.input:camera->processing:yolov8.dropped").
+    """
+
+    def __init__(self, name, handler, max_size=DEFAULT_QUEUE_SIZE, policy=DISPATCH_POLICY_BLOCK):
+        if policy not in DISPATCH_POLICIES:
+            raise ValueError(f"Invalid dispatch policy: {policy}, must be one of {DISPATCH_POLICIES}")
+
+        self.name = name
+        self.handler = handler
+        self.policy = policy
+        self.max_size = 1 if policy == DISPATCH_POLICY_LATEST_ONLY else max(1, max_size)
+
+        self.metric_queue_depth = f"{name}.queue_depth"
+        self.metric_dropped = f"{name}.dropped"
+        self.metric_handler = f"{name}.handler"
+        self.metric_queue_wait = f"{name}.queue_wait"
+
+        self._messages = deque()
+        self._condition = threading.Condition()
+        self._dropped_count = 0
+        self._is_running = False
+        self._thread = None
+
+    def start(self):
+        with self._condition:
+            if self._is_running:
+                return self
+            self._is_running = True
+
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        with self._condition:
+            self._is_running = False
+            self._condition.notify_all()
+
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def put(self, message):
+        dropped = 0
+        with self._condition:
+            if self.policy == DISPATCH_POLICY_BLOCK:
+                while self._is_running and len(self._messages) >= self.max_size:
+                    self._condition.wait()
+            else:
+                while len(self._messages) >= self.max_size:
+                    self._messages.popleft()
+                    dropped += 1
+
+            self._messages.append((time.perf_counter(), message))
+            self._dropped_count += dropped
+            queue_depth = len(self._messages)
+            self._condition.notify_all()
+
+        if dropped:
+            metrics_utility.increment_counter(self.metric_dropped, dropped)
+        metrics_utility.set_gauge(self.metric_queue_depth, queue_depth)
+
+    def get_queue_depth(self):
+        with self._condition:
+            return len(self._messages)
+
+    def get_dropped_count(self):
+        with self._condition:
+            return self._dropped_count
+
+    def _next_message(self):
+        with self._condition:
+            while self._is_running and not self._messages:
+                self._condition.wait()
+
+            if not self._is_running:
+                return None
+
+            queued_time, message = self._messages.popleft()
+            queue_depth = len(self._messages)
+            # wake up the publisher waiting for space (block policy)
+            self._condition.notify_all()
+
+        metrics_utility.set_gauge(self.metric_queue_depth, queue_depth)
+        metrics_utility.record_latency_ms(self.metric_queue_wait, metrics_utility.get_elapsed_ms(queued_time))
+        return message
+
+    def _run(self):
+        while True:
+            message = self._next_message()
+            if message is None:
+                return
+
+            try:
+                with metrics_utility.measure_latency(self.metric_handler):
+                    self.handler(message)
+            except Exception:
+                _logger.exception("Error handling message in {name}", name=self.name)
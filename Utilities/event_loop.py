@@ -0,0 +1,87 @@
+import asyncio
+import concurrent.futures
+import threading
+
+from Utilities import logging_utility
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+class BackgroundEventLoop:
+    """
+    A long-lived asyncio event loop in a daemon thread, so synchronous code (e.g., service threads) can run coroutines
+    without creating and closing an event loop for each call, and coroutines submitted from different threads can
+    overlap.
+
+    The loop is started on the first submitted coroutine. Coroutines must not block the loop, run the blocking calls
+    with `loop.run_in_executor` instead.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._loop is not None:
+                return self
+
+            loop_ready = threading.Event()
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run, args=(self._loop, loop_ready), name=self.name,
+                                            daemon=True)
+            self._thread.start()
+            loop_ready.wait()
+
+        return self
+
+    def stop(self, timeout=None):
+        with self._lock:
+            if self._loop is None:
+                return
+
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._loop = None
+            self._thread = None
+
+    def is_running(self):
+        return self._loop is not None and self._loop.is_running()
+
+    def submit(self, coroutine):
+        '''
+        Run the coroutine in the event loop, without waiting for it
+
+        :param coroutine: coroutine object, e.g., get_walking_directions(...)
+        :return: concurrent.futures.Future of the result, which can be cancelled
+        '''
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def run(self, coroutine, timeout=None):
+        '''
+        Run the coroutine in the event loop, and wait for the result
+
+        :param coroutine: coroutine object
+        :param timeout: seconds to wait for the result, None to wait until it is done
+        :return: result of the coroutine
+        :raises TimeoutError: if the result is not available within the timeout (the coroutine is cancelled)
+        '''
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError as e:
+            future.cancel()
+            raise TimeoutError(f"{self.name}: coroutine did not complete within {timeout} seconds") from e
+
+    def _run(self, loop, loop_ready):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(loop_ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+            _logger.debug("Event loop {name} is closed", name=self.name)
@@ -6,29 +6,118 @@ import requests
 from PIL import Image
 
 
-def get_similarity_images(image1, image2, threshold):
+def get_similarity_images(image1, image2, threshold, scale=1.0):
+    '''
+    :param image1: PIL image
+    :param image2: PIL image
+    :param threshold: maximum Euclidean distance (RGB) between two pixels to be considered the same pixel
+    :param scale: downscale factor (e.g., 0.25) to compare smaller images, which is faster but less precise
+    :return: ratio of the same pixels (0 to 1), False if the images have different sizes or colour modes
+    '''
     # check if same size and same colour mode
     if image1.size != image2.size or image1.mode != image2.mode:
         return False
 
-    pixel_count = image1.size[0] * image1.size[1]
-    pixel_diff_count = 0
+    return get_similarity_frames(np.asarray(image1), np.asarray(image2), threshold, scale)
 
-    pixels1 = image1.load()
-    pixels2 = image2.load()
 
-    # compare pixel by pixel for difference
-    for x in range(image1.size[0]):
-        for y in range(image1.size[1]):
-            # as long as pixel diff is less than threshold, it is considered the same pixel
-            if get_pixel_diff(pixels1[x, y], pixels2[x, y]) > threshold:
-                pixel_diff_count += 1
+def get_similarity_frames(frame1, frame2, threshold, scale=1.0):
+    '''
+    Same as `get_similarity_images`, but for numpy arrays (e.g., OpenCV frames)
 
-    similarity = 1 - (pixel_diff_count / pixel_count)
-    return similarity
+    :return: ratio of the same pixels (0 to 1), 0 if the frames have different shapes
+    '''
+    if frame1.shape != frame2.shape:
+        return 0.0
+
+    return float(get_similarity_frames_batch(frame1, [frame2], threshold, scale)[0])
+
+
+def get_similarity_frames_batch(frame, reference_frames, threshold, scale=1.0):
+    '''
+    Compare a frame with multiple reference frames at once, e.g., to skip saving a frame similar to the saved frames
+
+    :param frame: numpy array with the shape (height, width) or (height, width, channels)
+    :param reference_frames: list of numpy arrays
+    :param threshold: maximum Euclidean distance (of the first 3 channels) between two pixels to be considered the
+        same pixel
+    :param scale: downscale factor (e.g., 0.25) to compare smaller frames, which is faster but less precise
+    :return: numpy array with the similarity (0 to 1) of each reference frame, 0 if its shape is different
+    '''
+    frame_shape = frame.shape
+    similarities = np.zeros(len(reference_frames))
+
+    frame = _get_comparable_pixels(frame, scale)
+    frame_pixel_count = frame.shape[0] * frame.shape[1]
+    for i, reference_frame in enumerate(reference_frames):
+        if reference_frame.shape != frame_shape:
+            continue
+
+        reference_frame = _get_comparable_pixels(reference_frame, scale)
+        similarities[i] = 1 - _get_pixel_diff_count(frame, reference_frame, threshold) / frame_pixel_count
+
+    return similarities
+
+
+def _get_comparable_pixels(frame, scale):
+    # only the first 3 channels are compared (e.g., ignore alpha)
+    if frame.ndim == 3:
+        frame = frame[:, :, :3]
+    frame = np.ascontiguousarray(frame)
+
+    if scale != 1.0:
+        frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    return frame
+
+
+def _get_pixel_diff_count(frame1, frame2, threshold):
+    if threshold < 0:
+        return frame1.shape[0] * frame1.shape[1]
+
+    # compare the squared distance with the squared threshold, to avoid the square root of every pixel
+    # (float32 is exact for the squared distances of 8-bit pixels)
+    diff = cv2.absdiff(frame1, frame2).astype(np.float32)
+    squared_distances = cv2.multiply(diff, diff)
+    if squared_distances.ndim == 3:
+        squared_distances = squared_distances.reshape(-1, squared_distances.shape[2]) @ \
+                            np.ones(squared_distances.shape[2], dtype=np.float32)
+
+    return np.count_nonzero(squared_distances > threshold ** 2)
+
+
+def get_perceptual_hash(frame, hash_size=8):
+    '''
+    Perceptual hash (pHash) of a frame, which is robust to small changes (e.g., noise, compression, lighting), to find
+    near-duplicate frames much faster than the pixel comparison
+
+    :param frame: numpy array (OpenCV BGR frame or grayscale)
+    :param hash_size: the hash has hash_size * hash_size bits
+    :return: numpy array of hash_size * hash_size booleans
+    '''
+    if frame.ndim == 3:
+        frame = cv2.cvtColor(np.ascontiguousarray(frame[:, :, :3]), cv2.COLOR_BGR2GRAY)
+
+    # the low frequencies of the DCT of a small image
+    image_size = hash_size * 4
+    small_frame = cv2.resize(frame, (image_size, image_size), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low_frequencies = cv2.dct(small_frame)[:hash_size, :hash_size].flatten()
+
+    # ignore the DC term (average brightness) for the median
+    return low_frequencies > np.median(low_frequencies[1:])
+
+
+def get_perceptual_hash_similarity(hash1, hashes2):
+    '''
+    :param hash1: perceptual hash, see `get_perceptual_hash`
+    :param hashes2: perceptual hash, or numpy array of perceptual hashes (one per row)
+    :return: ratio of the same bits (0 to 1), a numpy array for multiple hashes
+    '''
+    return 1 - np.count_nonzero(np.asarray(hashes2) != hash1, axis=-1) / hash1.size
 
 
 def get_pixel_diff(pixel1, pixel2):
+    # NOTE: use get_similarity_frames to compare images, which compares all the pixels at once
     r1, g1, b1 = pixel1[:3]
     r2, g2, b2 = pixel2[:3]
     # Calculate the Euclidean distance between two pixels
@@ -0,0 +1,187 @@
+# coding=utf-8
+
+# This file contains utility functions to record in-process performance metrics (counters, gauges and
+# latency histograms). Metrics are kept per process. Hooks can be registered to forward every recorded value
+# (e.g., to a log file, the web dashboard or an external monitoring system).
+
+from bisect import bisect_left
+from contextlib import contextmanager
+import threading
+import time
+
+METRIC_TYPE_COUNTER = "counter"
+METRIC_TYPE_GAUGE = "gauge"
+METRIC_TYPE_LATENCY = "latency"
+
+# upper bounds (inclusive) of the latency buckets in milliseconds, the last bucket holds all larger values
+DEFAULT_LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+_histograms = {}
+_hooks = []
+
+
+class LatencyHistogram:
+    """
+    A fixed-bucket latency histogram, which keeps count, sum, min and max of all observed values (in milliseconds).
+    """
+
+    def __init__(self, buckets_ms=DEFAULT_LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self.bucket_counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def observe(self, value_ms):
+        self.bucket_counts[bisect_left(self.buckets_ms, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.min_ms = value_ms if self.min_ms is None else min(self.min_ms, value_ms)
+        self.max_ms = value_ms if self.max_ms is None else max(self.max_ms, value_ms)
+
+    def get_mean_ms(self):
+        if self.count == 0:
+            return 0.0
+        return self.total_ms / self.count
+
+    def get_percentile_ms(self, percentile):
+        '''
+        Approximate the percentile using the upper bound of the bucket that contains it
+
+        :param percentile: percentile in the range [0, 100]
+        :return: the upper bound of the bucket (or the max value for the overflow bucket), None if empty
+        '''
+        if self.count == 0:
+            return None
+
+        target = max(1, round(self.count * percentile / 100))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                if index < len(self.buckets_ms):
+                    return min(self.buckets_ms[index], self.max_ms)
+                return self.max_ms
+
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.get_mean_ms(),
+            "min_ms": self.min_ms,
+            "max_ms": self.max_ms,
+            "p50_ms": self.get_percentile_ms(50),
+            "p95_ms": self.get_percentile_ms(95),
+            "p99_ms": self.get_percentile_ms(99),
+            "buckets_ms": dict(zip([*self.buckets_ms, float("inf")], self.bucket_counts)),
+        }
+
+
+def add_metrics_hook(hook):
+    '''
+    Register a hook which is called for every recorded metric
+
+    :param hook: callable with the signature hook(metric_type, name, value)
+    '''
+    with _lock:
+        if hook not in _hooks:
+            _hooks.append(hook)
+
+
+def remove_metrics_hook(hook):
+    with _lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def increment_counter(name, value=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+        hooks = list(_hooks)
+    _notify_hooks(hooks, METRIC_TYPE_COUNTER, name, value)
+
+
+def set_gauge(name, value):
+    with _lock:
+        _gauges[name] = value
+        hooks = list(_hooks)
+    _notify_hooks(hooks, METRIC_TYPE_GAUGE, name, value)
+
+
+def record_latency_ms(name, value_ms):
+    with _lock:
+        if name not in _histograms:
+            _histograms[name] = LatencyHistogram()
+        _histograms[name].observe(value_ms)
+        hooks = list(_hooks)
+    _notify_hooks(hooks, METRIC_TYPE_LATENCY, name, value_ms)
+
+
+@contextmanager
+def measure_latency(name):
+    '''
+    Record the elapsed time of the enclosed block as a latency metric, e.g.,
+    `with measure_latency("yolov8.frame"): ...`
+    '''
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_latency_ms(name, get_elapsed_ms(start_time))
+
+
+def get_elapsed_ms(start_time):
+    '''
+    :param start_time: value of `time.perf_counter()` at the start
+    :return: elapsed milliseconds since the start time
+    '''
+    return (time.perf_counter() - start_time) * 1000
+
+
+def get_counter(name):
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def get_gauge(name):
+    with _lock:
+        return _gauges.get(name)
+
+
+def get_latency(name):
+    '''
+    :return: the summary of the latency histogram as a dict (see `LatencyHistogram.to_dict`), None if not recorded
+    '''
+    with _lock:
+        if name not in _histograms:
+            return None
+        return _histograms[name].to_dict()
+
+
+def get_all_metrics():
+    with _lock:
+        return {
+            METRIC_TYPE_COUNTER: dict(_counters),
+            METRIC_TYPE_GAUGE: dict(_gauges),
+            METRIC_TYPE_LATENCY: {name: histogram.to_dict() for name, histogram in _histograms.items()},
+        }
+
+
+def reset_metrics():
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+
+
+def _notify_hooks(hooks, metric_type, name, value):
+    for hook in hooks:
+        try:
+            hook(metric_type, name, value)
+        except Exception as e:
+            print(f"Error in metrics hook: {e}")
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import deque
+
+from Utilities import metrics_utility
+
+
+class PcmRingBuffer:
+    """
+    A preallocated ring buffer of PCM bytes between one producer thread (e.g., the recording callback) and one consumer
+    thread, without locks: the producer only advances the write position and the consumer only the read position.
+
+    The consumer is woken up by an event when data is written, instead of polling. If the consumer cannot keep up, the
+    new chunks which do not fit are dropped (recorded as "{name}.dropped_bytes"). The time from writing a chunk to
+    reading it is recorded as "{name}.callback_to_send".
+    """
+
+    def __init__(self, capacity_bytes, frame_bytes=1, name="pcm_ring_buffer"):
+        '''
+        :param capacity_bytes: size of the buffer, rounded down to whole frames
+        :param frame_bytes: size of a frame (i.e., sample width * channels), the capacity is a multiple of it
+        :param name: prefix of the metrics
+        '''
+        self.frame_bytes = frame_bytes
+        self.capacity_bytes = capacity_bytes - capacity_bytes % frame_bytes
+
+        self.metric_dropped_bytes = f"{name}.dropped_bytes"
+        self.metric_callback_to_send = f"{name}.callback_to_send"
+
+        self._buffer = bytearray(self.capacity_bytes)
+        # total bytes written and read, the positions in the buffer are modulo the capacity
+        self._write_total = 0
+        self._read_total = 0
+        # (write total after the chunk, write time) of the chunks not read yet
+        self._chunk_times = deque()
+        self._data_event = threading.Event()
+
+    def write(self, data):
+        '''
+        Called by the producer thread
+
+        :return: True if written, False if dropped as the buffer is full
+        '''
+        data = memoryview(data).cast("B")
+        size = len(data)
+        if size > self.capacity_bytes - (self._write_total - self._read_total):
+            metrics_utility.increment_counter(self.metric_dropped_bytes, size)
+            return False
+
+        position = self._write_total % self.capacity_bytes
+        first_size = min(size, self.capacity_bytes - position)
+        self._buffer[position:position + first_size] = data[:first_size]
+        self._buffer[:size - first_size] = data[first_size:]
+
+        self._chunk_times.append((self._write_total + size, time.perf_counter()))
+        # published after the data, so the consumer never reads a partial chunk
+        self._write_total += size
+        self._data_event.set()
+        return True
+
+    def read(self):
+        '''
+        Called by the consumer thread
+
+        :return: bytes written since the last read, empty if none
+        '''
+        write_total = self._write_total
+        size = write_total - self._read_total
+        if size == 0:
+            return b""
+
+        position = self._read_total % self.capacity_bytes
+        first_size = min(size, self.capacity_bytes - position)
+        data = bytes(self._buffer[position:position + first_size]) + bytes(self._buffer[:size - first_size])
+        self._read_total = write_total
+
+        read_time = time.perf_counter()
+        while self._chunk_times and self._chunk_times[0][0] <= write_total:
+            _, write_time = self._chunk_times.popleft()
+            metrics_utility.record_latency_ms(self.metric_callback_to_send, (read_time - write_time) * 1000)
+
+        return data
+
+    def wait(self, timeout=None):
+        '''
+        Block the consumer until data is written (or `notify` is called)
+
+        :return: True if woken up, False on timeout
+        '''
+        is_set = self._data_event.wait(timeout)
+        # cleared before reading, so data written after the read sets it again
+        self._data_event.clear()
+        return is_set
+
+    def notify(self):
+        '''
+        Wake up the consumer, e.g., to stop it
+        '''
+        self._data_event.set()
+
+    def get_size(self):
+        return self._write_total - self._read_total
@@ -0,0 +1,96 @@
+# coding=utf-8
+
+# This file contains utility functions to compile the channel pipes of the configuration into routes, so sending a
+# message to the subscribers of a component does not need to look up the configuration, the component instances and
+# the entry functions for every message.
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import base_keys
+from DataFormat import datatypes_helper
+from Utilities import config_utility, endpoint_utility, logging_utility
+from Utilities.dispatch_queue import DispatchQueue, DEFAULT_QUEUE_SIZE
+
+# Options of a subscriber in the configuration file to receive messages through a queue (handled by a worker
+# thread) instead of inline in the publisher's thread, e.g.,
+#   options:
+#     dispatch_policy: "latest_only"  # block, drop_oldest or latest_only
+#     dispatch_queue_size: 10
+CONFIG_DISPATCH_POLICY_KEY = "dispatch_policy"
+CONFIG_DISPATCH_QUEUE_SIZE_KEY = "dispatch_queue_size"
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    A compiled route from a publisher to one of its subscribers
+    """
+    # Name of the subscriber, i.e., processing:yolov8
+    subscriber: str
+    # Bound entry function of the subscriber instance
+    entry_func: Callable
+    # Datatype keys accepted by the subscriber (only for websocket messages), None to accept all messages
+    datatype_keys: Optional[frozenset] = None
+    # Queue to dispatch the messages in a worker thread, None to call the entry function inline
+    dispatch_queue: Optional[DispatchQueue] = None
+
+    def accepts(self, message):
+        return self.datatype_keys is None or message[base_keys.WEBSOCKET_DATATYPE] in self.datatype_keys
+
+
+def compile_routes(publisher):
+    '''
+    Compile the routes from the publisher to all of its subscribers (in the order of the configuration file).
+    Subscribers are instantiated if needed, so this should be called in the process sending the messages.
+
+    :param publisher: Format in configuration file, i.e., processing:yolov8
+    :return: tuple of Route
+    '''
+    subscribers = config_utility.get_config()[config_utility.CONFIGURATION_CHANNEL_PIPES_KEY].get(publisher, [])
+
+    return tuple(_compile_route(publisher, subscriber) for subscriber in subscribers)
+
+
+def get_supported_datatype_keys(instance):
+    '''
+    :param instance: component instance
+    :return: frozenset of datatype keys for the SUPPORTED_DATATYPES of the component
+    '''
+    datatype_keys = set()
+    for datatype in instance.get_supported_datatypes():
+        if datatype in datatypes_helper.DATATYPE_TO_KEY_MAP:
+            datatype_keys.add(datatypes_helper.get_key_by_name(datatype))
+        else:
+            _logger.warning("Unknown datatype {datatype} in {component}", datatype=datatype, component=instance.name)
+
+    return frozenset(datatype_keys)
+
+
+def _compile_route(publisher, subscriber):
+    instance = endpoint_utility.get_component_instance(subscriber)
+    entry_func = getattr(instance, endpoint_utility.get_entry_func_of(subscriber))
+
+    # Send websocket data only if the subscriber is interested in the datatype
+    datatype_keys = None
+    if publisher == base_keys.WEBSOCKET_WIDGET:
+        datatype_keys = get_supported_datatype_keys(instance)
+
+    return Route(subscriber=subscriber, entry_func=entry_func, datatype_keys=datatype_keys,
+                 dispatch_queue=_create_dispatch_queue(publisher, subscriber, entry_func))
+
+
+def _create_dispatch_queue(publisher, subscriber, entry_func):
+    options = config_utility.get_channel_options(subscriber)
+    if CONFIG_DISPATCH_POLICY_KEY not in options:
+        return None
+
+    queue_size = int(options.get(CONFIG_DISPATCH_QUEUE_SIZE_KEY, DEFAULT_QUEUE_SIZE))
+    dispatch_queue = DispatchQueue(f"dispatch.{publisher}->{subscriber}", entry_func, max_size=queue_size,
+                                   policy=options[CONFIG_DISPATCH_POLICY_KEY]).start()
+    _logger.info("Dispatching to {subscriber} through a queue: {policy}", subscriber=subscriber,
+                 policy=dispatch_queue.policy)
+
+    return dispatch_queue
@@ -1,39 +1,228 @@
 ﻿import asyncio
+import queue
 import threading
 import time
-from asyncio import Queue
 from urllib.parse import urlparse, parse_qs
 import websockets
-from Utilities import environment_utility, logging_utility
-from base_keys import WEBSOCKET_CLIENT_TYPE
+from Utilities import environment_utility, logging_utility, metrics_utility
+from base_keys import SESSION_ID_KEY, WEBSOCKET_CLIENT_TYPE
 
 _SERVER_IP = environment_utility.get_env_variable_or_default("SERVER_IP", "")
 _SERVER_PORT = environment_utility.get_env_int("SERVER_PORT")
 
+# What to do when the outbound queue of a (slow) client is full
+SLOW_CLIENT_POLICY_DROP_OLDEST = "drop_oldest"  # drop the oldest queued message
+SLOW_CLIENT_POLICY_DISCONNECT = "disconnect"  # close the connection, the client may reconnect
+SLOW_CLIENT_POLICIES = [SLOW_CLIENT_POLICY_DROP_OLDEST, SLOW_CLIENT_POLICY_DISCONNECT]
+
+_SEND_QUEUE_SIZE = int(environment_utility.get_env_variable_or_default("WEBSOCKET_SEND_QUEUE_SIZE", 32))
+_SLOW_CLIENT_POLICY = environment_utility.get_env_variable_or_default("WEBSOCKET_SLOW_CLIENT_POLICY",
+                                                                     SLOW_CLIENT_POLICY_DROP_OLDEST)
+# close code of the disconnected slow clients, "Try Again Later"
+_SLOW_CLIENT_CLOSE_CODE = 1013
+
+METRIC_RX_QUEUE_SIZE = "websocket.rx_queue_size"
+# metrics of each client type, e.g., "websocket.hololens.sent_bytes"
+METRIC_SENT_MESSAGES = "websocket.{client_type}.sent_messages"
+METRIC_SENT_BYTES = "websocket.{client_type}.sent_bytes"
+METRIC_DROPPED_MESSAGES = "websocket.{client_type}.dropped_messages"
+METRIC_SEND_QUEUE_DEPTH = "websocket.{client_type}.send_queue_depth"
+
 _CONNECTIONS = set()
-_rx_queue = Queue()
+# connections indexed by their client type when they connect, { client_type: { websocket: ClientConnection } }
+_CONNECTIONS_BY_CLIENT_TYPE = {}
+# thread-safe hand-off from the server (asyncio) thread to the receiver (e.g., WebsocketWidget), items are
+# (received time in `time.perf_counter()` seconds, data, session id of the connection)
+_rx_queue = queue.Queue()
 loop = None
 
 _logger = logging_utility.setup_logger(__name__)
 
 
+class ClientConnection:
+    """
+    A websocket connection with its own bounded outbound queue, which is sent by its own sender task. So a slow
+    client does not delay the others, and only fills its own queue (handled by the slow client policy).
+
+    Must be used in the event loop of the server.
+    """
+
+    def __init__(self, websocket, client_type, max_queue_size=_SEND_QUEUE_SIZE, slow_client_policy=_SLOW_CLIENT_POLICY,
+                 session_id=None):
+        check_slow_client_policy(slow_client_policy)
+
+        self.websocket = websocket
+        self.client_type = client_type
+        # session of the client (e.g., the watch and the headset of one runner), None for the default session
+        self.session_id = session_id
+        self.slow_client_policy = slow_client_policy
+
+        self.sent_messages = 0
+        self.sent_bytes = 0
+        self.dropped_messages = 0
+
+        metric_client_type = client_type if client_type else "unknown"
+        self.metric_sent_messages = METRIC_SENT_MESSAGES.format(client_type=metric_client_type)
+        self.metric_sent_bytes = METRIC_SENT_BYTES.format(client_type=metric_client_type)
+        self.metric_dropped_messages = METRIC_DROPPED_MESSAGES.format(client_type=metric_client_type)
+        self.metric_send_queue_depth = METRIC_SEND_QUEUE_DEPTH.format(client_type=metric_client_type)
+
+        self._outbound = asyncio.Queue(maxsize=max(1, max_queue_size))
+        self._is_closing = False
+        self._sender_task = None
+        self._close_task = None
+
+    def start(self):
+        self._sender_task = asyncio.create_task(self._send_outbound())
+        return self
+
+    def stop(self):
+        if self._sender_task:
+            self._sender_task.cancel()
+            self._sender_task = None
+
+    def enqueue(self, data):
+        '''
+        :param data: data to send, without waiting for the client
+        :return: True if the data is queued, False if the connection is closing
+        '''
+        if self._is_closing:
+            return False
+
+        if self._outbound.full():
+            if self.slow_client_policy == SLOW_CLIENT_POLICY_DISCONNECT:
+                self._disconnect_slow_client()
+                return False
+
+            self._outbound.get_nowait()
+            self.dropped_messages += 1
+            metrics_utility.increment_counter(self.metric_dropped_messages)
+
+        self._outbound.put_nowait(data)
+        metrics_utility.set_gauge(self.metric_send_queue_depth, self._outbound.qsize())
+        return True
+
+    def get_queue_depth(self):
+        return self._outbound.qsize()
+
+    def get_stats(self):
+        return {
+            WEBSOCKET_CLIENT_TYPE: self.client_type,
+            SESSION_ID_KEY: self.session_id,
+            "remote_address": self.websocket.remote_address,
+            "sent_messages": self.sent_messages,
+            "sent_bytes": self.sent_bytes,
+            "dropped_messages": self.dropped_messages,
+            "queue_depth": self.get_queue_depth(),
+        }
+
+    def _disconnect_slow_client(self):
+        self._is_closing = True
+
+        # the queued messages and the new message are dropped
+        dropped = 1
+        while not self._outbound.empty():
+            self._outbound.get_nowait()
+            dropped += 1
+        self.dropped_messages += dropped
+        metrics_utility.increment_counter(self.metric_dropped_messages, dropped)
+        metrics_utility.set_gauge(self.metric_send_queue_depth, 0)
+
+        _logger.warning("Disconnecting slow websocket client: {client_type}, {address}", client_type=self.client_type,
+                        address=self.websocket.remote_address)
+        self._close_task = asyncio.create_task(self.websocket.close(code=_SLOW_CLIENT_CLOSE_CODE, reason="slow client"))
+
+    async def _send_outbound(self):
+        while True:
+            data = await self._outbound.get()
+            try:
+                await self.websocket.send(data)
+            except websockets.ConnectionClosed:
+                return
+            except Exception:
+                _logger.exception("Error sending data to websocket")
+                return
+
+            self.sent_messages += 1
+            self.sent_bytes += len(data)
+            metrics_utility.increment_counter(self.metric_sent_messages)
+            metrics_utility.increment_counter(self.metric_sent_bytes, len(data))
+            metrics_utility.set_gauge(self.metric_send_queue_depth, self._outbound.qsize())
+            _logger.debug("{current_time}, sent, websocket_client_type: {client_type}",
+                          current_time=int(time.time() * 1000), client_type=self.client_type)
+
+
+def check_slow_client_policy(slow_client_policy):
+    '''
+    :raise ValueError: if the slow client policy is not one of SLOW_CLIENT_POLICIES
+    '''
+    if slow_client_policy not in SLOW_CLIENT_POLICIES:
+        raise ValueError(f"Invalid slow client policy: {slow_client_policy}, must be one of {SLOW_CLIENT_POLICIES}")
+
+
+def get_client_type(websocket):
+    '''
+    :return: the client type from the request headers, or from the query string of the path (e.g., for browsers)
+    '''
+    return _get_request_param(websocket, WEBSOCKET_CLIENT_TYPE)
+
+
+def get_session_id(websocket):
+    '''
+    :return: the session id from the request headers, or from the query string of the path, None if not given
+    '''
+    return _get_request_param(websocket, SESSION_ID_KEY)
+
+
+def _get_request_param(websocket, key):
+    value = websocket.request_headers.get(key)
+
+    if value is None:
+        query_params = parse_qs(urlparse(websocket.path).query)
+        value = query_params.get(key, [None])[0]
+
+    return value
+
+
+def get_client_stats():
+    '''
+    :return: list of the counters of each connection, i.e., client type, session id, remote address, sent messages,
+        sent bytes, dropped messages and queue depth
+    '''
+    return [connection.get_stats() for connections in list(_CONNECTIONS_BY_CLIENT_TYPE.values())
+            for connection in list(connections.values())]
+
+
+def _add_connection(websocket):
+    connection = ClientConnection(websocket, get_client_type(websocket), session_id=get_session_id(websocket)).start()
+
+    _CONNECTIONS.add(websocket)
+    _CONNECTIONS_BY_CLIENT_TYPE.setdefault(connection.client_type, {})[websocket] = connection
+
+    return connection
+
+
+def _remove_connection(connection):
+    connection.stop()
+
+    _CONNECTIONS.discard(connection.websocket)
+    connections = _CONNECTIONS_BY_CLIENT_TYPE.get(connection.client_type, {})
+    connections.pop(connection.websocket, None)
+    if not connections:
+        _CONNECTIONS_BY_CLIENT_TYPE.pop(connection.client_type, None)
+
+
 # references: https://websockets.readthedocs.io/en/stable/reference/server.html , https://pypi.org/project/websockets/
 async def receive_data_from_websocket(websocket):
-    global _rx_queue, _CONNECTIONS
+    global _rx_queue
 
-    _CONNECTIONS.add(websocket)
+    connection = _add_connection(websocket)
+    websocket_client_type = connection.client_type
     _logger.debug("New websocket connection:: total: {num_connections}", num_connections=len(_CONNECTIONS))
 
     try:
-        headers = websocket.request_headers
-        websocket_client_type = headers.get(WEBSOCKET_CLIENT_TYPE)
-
-        if websocket_client_type is None:
-            query_params = parse_qs(urlparse(websocket.path).query)
-            websocket_client_type = query_params.get("websocket_client_type", [None])[0]
-
         async for rx_data in websocket:
-            _rx_queue.put_nowait(rx_data)
+            _rx_queue.put_nowait((time.perf_counter(), rx_data, connection.session_id))
             current_time = int(time.time() * 1000)
             _logger.debug("{curr_time}, received, websocket_client_type: {type}", curr_time=current_time,
                           type=websocket_client_type)
@@ -41,7 +230,7 @@ async def receive_data_from_websocket(websocket):
     except Exception:
         _logger.exception("Error receiving data from websocket")
     finally:
-        _CONNECTIONS.remove(websocket)
+        _remove_connection(connection)
         _logger.warn("Websocket disconnection total: {num_connections}", num_connections=len(_CONNECTIONS))
 
 
@@ -66,6 +255,8 @@ async def main():
 
 
 def start_server():
+    # fail fast on a misconfigured policy, instead of failing each connection
+    check_slow_client_policy(_SLOW_CLIENT_POLICY)
     asyncio.run(main())
 
 
@@ -73,54 +264,73 @@ def stop_server():
     pass
 
 
-async def send_data_to_websockets(data, websocket_client_type=None):
-    global _CONNECTIONS
-
-    exclude_list = set()
-    for _websocket in _CONNECTIONS:
-        try:
-            headers = _websocket.request_headers
-            curr_client_type = headers.get(WEBSOCKET_CLIENT_TYPE)
+def _enqueue_data(data, websocket_client_type=None, session_id=None):
+    if websocket_client_type is None:
+        connections = [connection for connections in _CONNECTIONS_BY_CLIENT_TYPE.values()
+                       for connection in connections.values()]
+    else:
+        connections = list(_CONNECTIONS_BY_CLIENT_TYPE.get(websocket_client_type, {}).values())
 
-            if curr_client_type is None:
-                query_params = parse_qs(urlparse(_websocket.path).query)
-                curr_client_type = query_params.get("websocket_client_type", [None])[0]
+    if session_id is not None:
+        connections = [connection for connection in connections if connection.session_id == session_id]
 
-            if (websocket_client_type is not None) and (curr_client_type != websocket_client_type):
-                continue
+    for connection in connections:
+        connection.enqueue(data)
 
-            await _websocket.send(data)
-            current_time = int(time.time() * 1000)
-            _logger.debug("{current_time}, sent, websocket_client_type: {curr_client_type}", current_time=current_time,
-                          curr_client_type=curr_client_type)
-        except Exception:
-            _logger.exception("Error sending data to websocket")
-            exclude_list.add(_websocket)
     if isinstance(data, str):
-        _logger.debug("Sent data: {data}", data=data)
+        _logger.debug("Queued data: {data}", data=data)
     else:
-        _logger.debug("Sent data: {len} bytes", len=len(data))
-        _CONNECTIONS -= exclude_list
+        _logger.debug("Queued data: {len} bytes, connections: {count}", len=len(data), count=len(connections))
 
 
-def send_data(data, websocket_client_type=None):
+def send_data(data, websocket_client_type=None, session_id=None):
+    '''
+    Queue the data (from any thread) to the connections of the client type (all connections if None), which are sent
+    concurrently. If the session id is given, only to the connections of the session (e.g., the replies to a runner).
+    '''
     global loop
     if loop and loop.is_running():
-        _logger.debug("loop is running")
-        asyncio.run_coroutine_threadsafe(send_data_to_websockets(data, websocket_client_type), loop)
+        loop.call_soon_threadsafe(_enqueue_data, data, websocket_client_type, session_id)
     else:
-        asyncio.run(send_data_to_websockets(data, websocket_client_type))
         _logger.warning("loop is none or loop is not running")
 
 
-def receive_data():
+def receive_data(timeout=0):
+    '''
+    :param timeout: seconds to wait for data, 0 to return immediately, None to wait until data arrives
+    :return: the received data, None if no data is received within the timeout
+    '''
+    timed_data = receive_timed_data(timeout)
+    if timed_data is None:
+        return None
+
+    return timed_data[1]
+
+
+def receive_timed_data(timeout=0):
+    '''
+    Same as `receive_data`, but also returns the time when the data was received by the server and the session of the
+    connection. It returns as soon as data arrives, so the caller can keep calling it to drain a burst of messages
+    without delay.
+
+    :param timeout: seconds to wait for data, 0 to return immediately, None to wait until data arrives
+    :return: (received time in `time.perf_counter()` seconds, data, session id of the connection or None), None if no
+        data is received within the timeout
+    '''
     global _rx_queue
-    if _rx_queue.empty():
+    try:
+        if timeout == 0:
+            timed_data = _rx_queue.get_nowait()
+        else:
+            timed_data = _rx_queue.get(timeout=timeout)
+    except queue.Empty:
         return None
 
-    _logger.debug("rx_size: {queue_size}", queue_size=_rx_queue.qsize())
+    queue_size = _rx_queue.qsize()
+    metrics_utility.set_gauge(METRIC_RX_QUEUE_SIZE, queue_size)
+    _logger.debug("rx_size: {queue_size}", queue_size=queue_size)
 
-    return _rx_queue.get_nowait()
+    return timed_data
 
 
 server_thread = None
@@ -128,6 +338,7 @@ server_thread = None
 
 def start_server_threaded():
     global server_thread
+    check_slow_client_policy(_SLOW_CLIENT_POLICY)
     server_thread = threading.Thread(target=start_server, daemon=True)
     server_thread.start()
 
@@ -1,11 +1,10 @@
-import io
 from datetime import datetime, timedelta
-from multiprocessing import Queue
 
 import speech_recognition as sr
 
 import base_keys
-from Utilities import environment_utility, logging_utility, time_utility
+from Utilities import config_utility, environment_utility, logging_utility
+from Utilities.pcm_ring_buffer import PcmRingBuffer
 from base_component import BaseComponent
 
 _MIC = environment_utility.get_env_string("AUDIO_MIC")
@@ -18,14 +17,30 @@ _SPEECH_RECOGNITION_DYNAMIC_ENERGY_THRESHOLD = False
 
 _PAUSE_THRESHOLD = 3
 
+# audio kept when the processors cannot keep up, newer audio is dropped
+_RING_BUFFER_SECONDS = 30
+# maximum wait for new audio, to check if the widget is stopped
+_WAIT_TIMEOUT_SECONDS = 0.5
+
+# Options of the component in the configuration file, e.g.,
+#   options:
+#     chunk_seconds: 1  # send the audio at least every second while speaking, e.g., for the streaming transcription
+CONFIG_CHUNK_SECONDS_KEY = "chunk_seconds"
+
 _logger = logging_utility.setup_logger(__name__)
 
 
 class AudioWidget(BaseComponent):
     """
-    Sends the audio_data received through the microphone / input device to the next component
+    Sends the audio received through the microphone / input device to the next component
 
-    audio_data: Audio Data in wav format
+    audio_pcm: Raw PCM audio data in bytes
+    audio_pcm_sample_rate: Sample rate of audio_pcm
+    audio_pcm_sample_width: Bytes per sample of audio_pcm
+    audio_pcm_channels: Number of (interleaved) channels of audio_pcm
+
+    The recording callback writes the audio to a ring buffer, and the audio is sent as soon as it is written. The time
+    from the callback to sending is recorded as the "audio_widget.callback_to_send" latency metric.
     """
 
     def __init__(self, name) -> None:
@@ -33,14 +48,17 @@ class AudioWidget(BaseComponent):
         super().set_component_status(base_keys.COMPONENT_NOT_STARTED_STATUS)
 
         self.src = None  # Microphone source, initialized later
-        self.data_queue = Queue()
-        self.phrase_time = None  # timestamp of last retrieved from queue
-        self.last_sample = io.BytesIO()  # Efficient buffer to hold audio data
+        self.ring_buffer = None  # PCM frames of the recording callback, initialized with the source format
+        self.phrase_time = None  # timestamp of last retrieved from the ring buffer
         self.phrase_complete = True
         self.current_time = None
 
         # in sec
         self.recognition_window = _SPEECH_RECOGNITION_WINDOW
+        options = config_utility.get_channel_options(name)
+        if CONFIG_CHUNK_SECONDS_KEY in options:
+            # the phrases are cut into chunks, which are sent as soon as they are recorded
+            self.recognition_window = float(options[CONFIG_CHUNK_SECONDS_KEY])
         self.phrase_threshold = _SPEECH_RECOGNITION_PHRASE_THRESHOLD
 
         self.sample_rate = _MIC_SAMPLE_RATE
@@ -50,8 +68,6 @@ class AudioWidget(BaseComponent):
         # lowers energy threshold dramatically to a point where recording never stops
         self.recognizer.dynamic_energy_threshold = _SPEECH_RECOGNITION_DYNAMIC_ENERGY_THRESHOLD
         self.recognizer.pause_threshold = _PAUSE_THRESHOLD
-        # needed to ensure that the audio widget does not run into performance issues
-        self.listen_delay = 0.05
 
     def start(self):
         if super().get_component_status() != base_keys.COMPONENT_IS_RUNNING_STATUS:
@@ -76,41 +92,39 @@ class AudioWidget(BaseComponent):
                 super().set_component_status(base_keys.COMPONENT_IS_STOPPED_STATUS)
                 return
 
+        # the microphone is mono
+        self.ring_buffer = PcmRingBuffer(_RING_BUFFER_SECONDS * self.src.SAMPLE_RATE * self.src.SAMPLE_WIDTH,
+                                         frame_bytes=self.src.SAMPLE_WIDTH, name="audio_widget")
+
         # background thread to pass raw audio bytes
         self.recognizer.listen_in_background(self.src, self.record_callback, phrase_time_limit=self.recognition_window)
         _logger.debug("Listening to AudioWidget")
 
         while super().get_component_status() == base_keys.COMPONENT_IS_RUNNING_STATUS:
             try:
-                self._listen_and_send_audio()
-                time_utility.sleep_seconds(self.listen_delay)
+                # woken up by the recording callback
+                if self.ring_buffer.wait(_WAIT_TIMEOUT_SECONDS):
+                    self._send_audio()
             except Exception as e:
                 _logger.debug("An error occurred while listening and sending audio data: {e}", e=e)
 
-    def _listen_and_send_audio(self):
-        if not self.data_queue.empty():
-            self.phrase_complete = False
-
-            self.__check_phrase()
-
-            # when new data received
-            self.phrase_time = self.current_time
+    def _send_audio(self):
+        pcm_data = self.ring_buffer.read()
+        if not pcm_data:
+            return
 
-            # concat current data with latest
-            while not self.data_queue.empty():
-                data = self.data_queue.get()
-                self.last_sample.write(data)
+        self.phrase_complete = False
 
-            # Resetting pointer of BytesIO buffer to the beginning
-            self.last_sample.seek(0)
-            raw_data = sr.AudioData(self.last_sample.read(), self.src.SAMPLE_RATE, self.src.SAMPLE_WIDTH)
-            wav_data = io.BytesIO(raw_data.get_wav_data())
+        self.__check_phrase()
 
-            _logger.debug("\nSending audio data to processors")
-            super().send_to_component(audio_data=wav_data)
+        # when new data received
+        self.phrase_time = self.current_time
 
-            # Clear last_sample buffer for the next data
-            self.last_sample = io.BytesIO()
+        _logger.debug("\nSending audio data to processors")
+        super().send_to_component(audio_pcm=pcm_data,
+                                  audio_pcm_sample_rate=self.src.SAMPLE_RATE,
+                                  audio_pcm_sample_width=self.src.SAMPLE_WIDTH,
+                                  audio_pcm_channels=1)
 
     def record_callback(self, _, audio):
         '''
@@ -118,22 +132,19 @@ class AudioWidget(BaseComponent):
         audio: AudioData containing the recorded bytes
         '''
         try:
-            # get bytes and send to next component(s)
-            data = audio.get_raw_data()
-            self.data_queue.put(data)
+            self.ring_buffer.write(audio.get_raw_data())
         except Exception:
             _logger.exception("Failed to process audio in record_callback")
 
     def __check_phrase(self):
         '''
-        clear current working audio buffer
+        check if the previous phrase is complete
         '''
         self.current_time = datetime.utcnow()
 
         # check phrase complete threshold
         if self.phrase_time and self.current_time - self.phrase_time > timedelta(seconds=self.phrase_threshold):
-            _logger.debug("Phrase complete. Clearing the buffer.")
-            self.last_sample = io.BytesIO()
+            _logger.debug("Phrase complete.")
             self.phrase_complete = True
 
     def __check_source(self, mic_name):
@@ -165,4 +176,6 @@ class AudioWidget(BaseComponent):
         Gracefully stops the audio widget by setting the shutdown event
         '''
         super().set_component_status(base_keys.COMPONENT_IS_STOPPED_STATUS)
+        if self.ring_buffer:
+            self.ring_buffer.notify()
         _logger.info("AudioWidget shutdown event set. Stopping audio processing.")
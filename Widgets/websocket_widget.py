@@ -1,12 +1,14 @@
-from google.protobuf import json_format as protobuf_json_format
-
 import base_keys
 from base_component import BaseComponent
 from DataFormat import datatypes_helper
 from Websocket import socket_server
-from Utilities import time_utility, logging_utility
+from Utilities import logging_utility, metrics_utility
+
+# maximum time to block waiting for data, the widget wakes up immediately when data arrives
+_RECEIVE_TIMEOUT_SECONDS = 1
 
-_NO_DATA_SLEEP_SECONDS = 0.05
+METRIC_RECEIVE_TO_DISPATCH = "websocket.receive_to_dispatch"
+METRIC_DISPATCH = "websocket.dispatch"
 
 _logger = logging_utility.setup_logger(__name__)
 
@@ -15,9 +17,13 @@ class WebsocketWidget(BaseComponent):
     """
     Sends a message in the following format (only to components which have been indicated in DataFormat/datatypes.json):
     {
-        "websocket_message": "<protobuf message sent through websocket server, in dictionary format>",
-        "websocket_datatype": "<protobuf datatype key of the websocket_message>"
+        "websocket_message": "<protobuf message sent through websocket server, see datatypes_helper.WebsocketMessage>",
+        "websocket_datatype": "<protobuf datatype key of the websocket_message>",
+        "session_id": "<[Optional] session id of the websocket connection, see socket_server.get_session_id>"
     }
+
+    The payload of the websocket_message is decoded only when a subscriber reads it, use
+    `datatypes_helper.get_protobuf_message` to get the protobuf message (or read it as a dictionary).
     """
 
     def start(self):
@@ -26,21 +32,25 @@ class WebsocketWidget(BaseComponent):
         super().set_component_status(base_keys.COMPONENT_IS_RUNNING_STATUS)
 
         while True:
-            data = socket_server.receive_data()
+            timed_data = socket_server.receive_timed_data(timeout=_RECEIVE_TIMEOUT_SECONDS)
+            if timed_data is None:
+                continue
+
+            received_time, data, session_id = timed_data
             if not data:
-                time_utility.sleep_seconds(_NO_DATA_SLEEP_SECONDS)
                 continue
 
-            data_type_key, data = datatypes_helper.decode_websocket_data(data)
+            message = datatypes_helper.decode_websocket_message(data)
 
-            # If error while decoding, decoder.decode returns (None, None)
-            if not data_type_key:
+            # If error while decoding, decode_websocket_message returns None
+            if message is None:
                 continue
 
-            # To check for which service requires the specific message type, we convert the protobuf message to dict
-            data = protobuf_json_format.MessageToDict(data, preserving_proto_field_name=True)
-
-            super().send_to_component(websocket_message=data, websocket_datatype=data_type_key)
+            metrics_utility.record_latency_ms(METRIC_RECEIVE_TO_DISPATCH, metrics_utility.get_elapsed_ms(received_time))
 
-            # HACK: Allow other threads to run
-            time_utility.sleep_seconds(_NO_DATA_SLEEP_SECONDS)
+            with metrics_utility.measure_latency(METRIC_DISPATCH):
+                if session_id is None:
+                    super().send_to_component(websocket_message=message, websocket_datatype=message.data_type)
+                else:
+                    super().send_to_component(websocket_message=message, websocket_datatype=message.data_type,
+                                              session_id=session_id)
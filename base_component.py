@@ -1,15 +1,18 @@
 import os
+import threading
+
 import base_keys
 from Database import database, tables
-from DataFormat import datatypes_helper
-from Utilities import time_utility, endpoint_utility, config_utility, logging_utility
+from Utilities import time_utility, logging_utility, routing_utility
 from Memory.Memory import update_shared_memory_item, get_shared_memory_item
+from Memory import frame_store
 
-CONFIG_CHANNEL_PIPES = "channel-pipes"
 VALID_COMPONENT_STATUS = [base_keys.COMPONENT_NOT_STARTED_STATUS, base_keys.COMPONENT_IS_RUNNING_STATUS,
                           base_keys.COMPONENT_IS_STOPPED_STATUS]
 
 _logger = logging_utility.setup_logger(__name__)
+# the statuses of all the components are in one shared memory item, which is updated by read-modify-write
+_component_status_lock = threading.Lock()
 
 
 class BaseComponent:
@@ -19,7 +22,8 @@ class BaseComponent:
 
     Key functionalities include:
     - **Component Status Management**: Initialize, set, and get the status of a component.
-    - **Shared Memory Operations**: Provides interfaces for reading and writing data to shared memory.
+    - **Shared Memory Operations**: Provides interfaces for reading and writing data (and camera frames) to shared
+      memory.
     - **Database Operations**: Simplifies inserting and querying data from the database.
     - **Message Sending**: Implements communication and data transfer between components.
     - **Logging**: Provides detailed logs for debugging and monitoring component behavior.
@@ -41,6 +45,9 @@ class BaseComponent:
         self.component_status_name = f"{self.name}_STATUS"
         self.set_component_status(base_keys.COMPONENT_NOT_STARTED_STATUS)  # Default Status
 
+        # compiled on the first message, see `routing_utility.compile_routes`
+        self.routes = None
+
     def send_to_component(self, **kwargs):
         if len(kwargs) <= 0:
             _logger.warning("No data found to be sent to component")
@@ -51,12 +58,31 @@ class BaseComponent:
         else:
             message = self.__build_message(kwargs)
 
-        all_subscribers = config_utility.get_config()[CONFIG_CHANNEL_PIPES][self.name]
-        for subscriber in all_subscribers:
-            entry_func = self.__get_subscriber_func(subscriber, message)
+        for route in self.get_routes():
+            if not route.accepts(message):
+                # Subscriber not interested in messages of this datatype
+                continue
+
+            if route.dispatch_queue:
+                # each queued subscriber gets its own copy, as subscribers may update the message (e.g., base_data)
+                route.dispatch_queue.put(dict(message))
+            else:
+                route.entry_func(message)
+
+    def get_routes(self) -> tuple:
+        """
+        :return: compiled routes to the subscribers of the component (see `routing_utility.Route`)
+        """
+        if self.routes is None:
+            self.routes = routing_utility.compile_routes(self.name)
+
+        return self.routes
 
-            if entry_func:
-                entry_func(message)
+    def get_dispatch_queues(self) -> dict:
+        """
+        :return: {subscriber: DispatchQueue} of the subscribers, None for the subscribers called inline
+        """
+        return {route.subscriber: route.dispatch_queue for route in self.get_routes()}
 
     def is_supported_datatype(self, datatype) -> bool:
         """
@@ -83,20 +109,50 @@ class BaseComponent:
     def get_memory_data(self, key_name):
         return get_shared_memory_item(key_name)
 
+    def set_latest_frame(self, frame):
+        frame_store.publish_frame(frame)
+
+    def get_latest_frame(self, copy=False):
+        '''
+        Get the latest camera frame from the shared frame store
+
+        :param copy: set True to keep the frame for longer, otherwise a view is returned, which is valid only until the
+            frame store slot is reused by newer frames
+        :return: the latest frame (numpy array), None if no frame is available
+        '''
+        return frame_store.get_latest_frame(copy)
+
     def get_component_status(self):
-        return self.get_memory_data(base_keys.MEMORY_COMPONENT_STATUS_KEY)[self.component_status_name]
+        # a removed status (see remove_component_status) is stopped, so the threads of the component can exit
+        return self.get_memory_data(base_keys.MEMORY_COMPONENT_STATUS_KEY).get(self.component_status_name,
+                                                                               base_keys.COMPONENT_IS_STOPPED_STATUS)
 
     def set_component_status(self, new_status):
-        all_component_status_keys = self.get_memory_data(base_keys.MEMORY_COMPONENT_STATUS_KEY)
-        if all_component_status_keys is None:
-            all_component_status_keys = {}  # Initialise with an empty dictionary
+        if new_status not in VALID_COMPONENT_STATUS:
+            _logger.error("Invalid Component Status 'set_component_status()': {new_status}", new_status=new_status)
+            return
+
+        with _component_status_lock:
+            all_component_status_keys = self.get_memory_data(base_keys.MEMORY_COMPONENT_STATUS_KEY)
+            if all_component_status_keys is None:
+                all_component_status_keys = {}  # Initialise with an empty dictionary
 
-        if new_status in VALID_COMPONENT_STATUS:
             all_component_status_keys[self.component_status_name] = new_status
 
             self.set_memory_data(base_keys.MEMORY_COMPONENT_STATUS_KEY, all_component_status_keys)
-        else:
-            _logger.error("Invalid Component Status 'set_component_status()': {new_status}", new_status=new_status)
+
+    def remove_component_status(self):
+        '''
+        Remove the status of the component, e.g., of a component created per session when the session ends
+        '''
+        with _component_status_lock:
+            all_component_status_keys = self.get_memory_data(base_keys.MEMORY_COMPONENT_STATUS_KEY)
+            if all_component_status_keys is None or self.component_status_name not in all_component_status_keys:
+                return
+
+            del all_component_status_keys[self.component_status_name]
+
+            self.set_memory_data(base_keys.MEMORY_COMPONENT_STATUS_KEY, all_component_status_keys)
 
     def __build_message(self, args):
         message = {}
@@ -121,18 +177,3 @@ class BaseComponent:
                 new_message[key] = val
 
         return new_message
-
-    def __get_subscriber_func(self, subscriber, message):
-        instance = endpoint_utility.get_component_instance(subscriber)
-
-        # Send websocket data only if the subscriber is interested in the datatype
-        if self.name == base_keys.WEBSOCKET_WIDGET:
-            datatype = datatypes_helper.get_name_by_key(message[base_keys.WEBSOCKET_DATATYPE])
-            if not instance.is_supported_datatype(datatype):
-                # Subscriber not interested in messages of this datatype
-                return None
-
-        entry_func = endpoint_utility.get_entry_func_of(subscriber)
-        entry_func = getattr(instance, entry_func)
-
-        return entry_func
@@ -48,12 +48,24 @@ COMPONENT_NOT_STARTED_STATUS = "COMPONENT_NOT_STARTED_STATUS"
 BASE_DATA_KEY = "base_data"
 ORIGIN_KEY = "origin"
 TIMESTAMP_KEY = "timestamp"
+# id of the session of the client (e.g., a watch of a runner), optional
+SESSION_ID_KEY = "session_id"
 
 # NOTE: Audio
 AUDIO_DATA = "audio_data"
+# raw PCM bytes of the audio widget (instead of a WAV in audio_data) and their format
+AUDIO_PCM_DATA = "audio_pcm"
+AUDIO_PCM_SAMPLE_RATE = "audio_pcm_sample_rate"
+AUDIO_PCM_SAMPLE_WIDTH = "audio_pcm_sample_width"
+AUDIO_PCM_CHANNELS = "audio_pcm_channels"
+# float32 mono samples of the utterance in [-1, 1], decoded once by the audio frontend, and their sample rate
+AUDIO_SAMPLES_DATA = "audio_samples"
+AUDIO_SAMPLE_RATE_DATA = "audio_sample_rate"
 
 # NOTE: Transcriber (Speech to Text)
 AUDIO_TRANSCRIPTION_DATA = "audio_transcript"
+# hypothesis of the current segment in the streaming mode, sent without AUDIO_TRANSCRIPTION_DATA (i.e., not final)
+AUDIO_TRANSCRIPTION_PARTIAL_DATA = "audio_transcript_partial"
 
 # NOTE: Emotion Classifier
 EMOTION_SCORES = "emotion_scores"
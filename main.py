@@ -1,7 +1,7 @@
 import multiprocessing
 from dotenv import load_dotenv
 import base_keys
-from Memory import Memory
+from Memory import Memory, frame_store
 from Utilities import config_utility, endpoint_utility, environment_utility, time_utility, logging_utility, file_utility
 
 
@@ -41,6 +41,7 @@ def start_processing():
     config_utility.get_config()
     # NOTE: Set up and start memory
     Memory.init()
+    frame_store.init()
     # NOTE: Start widgets
     entrypoints = config_utility.get_channel_entrypoints()
     camera_required = None
@@ -69,6 +70,7 @@ def start_processing():
 
     # NOTE: close the shared memory
     Memory.close()
+    frame_store.close()
 
 
 if __name__ == "__main__":